@@ -1,6 +1,6 @@
 """설정 모듈"""
-from .settings import settings
+from .settings import settings, get_settings, Settings
 from .database import get_db, create_tables, close_db_connection, Base
 
-__all__ = ["settings", "get_db", "create_tables", "close_db_connection", "Base"]
+__all__ = ["settings", "get_settings", "Settings", "get_db", "create_tables", "close_db_connection", "Base"]
 
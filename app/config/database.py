@@ -1,4 +1,5 @@
-from sqlalchemy import create_engine
+import orjson
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
@@ -6,15 +7,42 @@ from typing import Generator
 
 from app.config.settings import settings
 
+
+def _json_serializer(obj) -> str:
+    """JSON 컬럼 직렬화 (orjson 사용)"""
+    return orjson.dumps(obj).decode()
+
+
 # SQLAlchemy 엔진 생성
-engine = create_engine(
-    settings.database_url,
-    echo=settings.database_echo,
-    poolclass=StaticPool,
-    connect_args={
-        "check_same_thread": False,  # SQLite용 (PostgreSQL에서는 무시됨)
-    } if "sqlite" in settings.database_url else {},
-)
+if "sqlite" in settings.database_url:
+    # SQLite: 단일 커넥션 공유
+    engine = create_engine(
+        settings.database_url,
+        echo=settings.database_echo,
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+        json_serializer=_json_serializer,
+        json_deserializer=orjson.loads,
+    )
+else:
+    # PostgreSQL: QueuePool로 요청별 독립 커넥션 사용
+    engine = create_engine(
+        settings.database_url,
+        echo=settings.database_echo,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_recycle=settings.db_pool_recycle,
+        pool_timeout=settings.db_pool_timeout,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        json_serializer=_json_serializer,
+        json_deserializer=orjson.loads,
+    )
+
+# 테이블 생성 완료 여부 (프로세스당 1회만 수행)
+_tables_created = False
+
+# 다중 워커 환경에서 테이블 생성을 한 워커로 제한하기 위한 advisory lock 키
+_CREATE_TABLES_LOCK_KEY = 20250918
 
 # 세션 로컬 클래스
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -37,8 +65,33 @@ def get_db() -> Generator[Session, None, None]:
 
 
 async def create_tables():
-    """테이블 생성 (애플리케이션 시작 시 호출)"""
-    Base.metadata.create_all(bind=engine)
+    """테이블 생성 (애플리케이션 시작 시 호출, 프로세스당 1회)"""
+    global _tables_created
+    
+    if _tables_created:
+        return
+    
+    if "sqlite" in settings.database_url:
+        Base.metadata.create_all(bind=engine)
+    else:
+        with engine.connect() as conn:
+            # 다른 워커가 생성 중이면 끝날 때까지 대기 후, 이미 있는 테이블은 건너뛰며 확인
+            conn.execute(
+                text("SELECT pg_advisory_lock(:key)"),
+                {"key": _CREATE_TABLES_LOCK_KEY}
+            )
+            
+            try:
+                Base.metadata.create_all(bind=conn)
+                conn.commit()
+            finally:
+                conn.execute(
+                    text("SELECT pg_advisory_unlock(:key)"),
+                    {"key": _CREATE_TABLES_LOCK_KEY}
+                )
+                conn.commit()
+    
+    _tables_created = True
 
 
 async def close_db_connection():
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings
@@ -22,16 +23,29 @@ class Settings(BaseSettings):
     )
     database_echo: bool = False  # SQLAlchemy 로깅
     
+    # 데이터베이스 커넥션 풀 설정 (PostgreSQL 전용, SQLite는 StaticPool 사용)
+    db_pool_size: int = 20          # 상시 유지 커넥션 수
+    db_max_overflow: int = 30       # pool_size 초과 시 추가 허용 커넥션 수
+    db_pool_recycle: int = 3600     # 커넥션 재생성 주기 (초)
+    db_pool_timeout: int = 30       # 커넥션 대기 타임아웃 (초)
+    db_pool_pre_ping: bool = False  # PgBouncer 사용 시 False 권장
+    auto_create_tables: bool = False  # 시작 시 테이블 자동 생성 (운영 환경은 마이그레이션 사용)
+    
     # ML 모델 설정
     model_path: str = "app/ml_models/"
+    model_cache_dir: str = ""  # 워커 간 공유할 모델 파일 복사 위치 (예: /dev/shm/neulbo), 빈 값이면 사용 안 함
     max_recording_duration: int = 43200  # 12시간 (초)
     min_recording_duration: int = 3600   # 1시간 (초)
     sensor_sampling_rate: float = 1.0    # Hz
     stage_interval_seconds: int = 30
+    preprocess_workers: int = 0  # 특성 추출 전용 프로세스 수 (0이면 프로세스 풀 없이 스레드에서 처리)
+    fft_workers: int = 0  # 윈도우 FFT 병렬 스레드 수 (0이면 CPU 코어 수를 전처리 프로세스 수로 나눈 값)
     
     # 모델 추론 설정
     model_confidence_threshold: float = 0.7
     enable_model_caching: bool = True
+    model_inference_workers: int = 0  # 예측 전용 스레드 수 (0이면 CPU 코어 수)
+    eager_model_load: bool = False  # True면 서버 시작 시 모델 로딩, False면 첫 분석 요청 시 로딩
     
     # LLM 설정
     ollama_url: str = Field(
@@ -46,6 +60,18 @@ class Settings(BaseSettings):
         default=30.0,
         description="LLM API 타임아웃(초)"
     )
+    llm_health_check_interval: float = Field(
+        default=30.0,
+        description="LLM 가용성 백그라운드 확인 주기(초)"
+    )
+    llm_cache_path: str = Field(
+        default="llm_cache.db",
+        description="LLM 응답 캐시 SQLite 파일 경로 (빈 값이면 캐시 비활성화)"
+    )
+    llm_cache_ttl: float = Field(
+        default=86400.0,
+        description="LLM 응답 캐시 유효 시간(초)"
+    )
     
     # 보안 설정
     secret_key: str = Field(
@@ -64,6 +90,12 @@ class Settings(BaseSettings):
         case_sensitive = False
 
 
-# 전역 설정 인스턴스
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """설정 인스턴스 반환 (.env 파싱은 최초 1회만 수행)"""
+    return Settings()
+
+
+# 전역 설정 인스턴스 (하위 호환용)
+settings = get_settings()
 
@@ -1,11 +1,46 @@
 """의존성 주입 모듈"""
 
+import asyncio
+from functools import lru_cache
+
 from app.services.model_service import ModelService
+from app.services.llm_service import LLMService
+from app.services.preprocessor import PreprocessorService
+from app.services.postprocessor import PostprocessorService
 
-# 전역 모델 서비스 인스턴스
-model_service = ModelService()
+# 모델 지연 로딩 동시 실행 방지용 락
+_model_load_lock = asyncio.Lock()
 
 
+@lru_cache(maxsize=1)
 def get_model_service() -> ModelService:
-    """모델 서비스 의존성 반환"""
+    """모델 서비스 의존성 반환 (최초 호출 시 생성)"""
+    return ModelService()
+
+
+async def get_loaded_model_service() -> ModelService:
+    """모델 로딩이 완료된 모델 서비스 반환 (첫 요청 시 지연 로딩)"""
+    model_service = get_model_service()
+    if not model_service.is_ready():
+        async with _model_load_lock:
+            if not model_service.is_ready():
+                await model_service.load_models()
     return model_service
+
+
+@lru_cache(maxsize=1)
+def get_llm_service() -> LLMService:
+    """LLM 서비스 의존성 반환 (HTTP 클라이언트를 공유하는 단일 인스턴스)"""
+    return LLMService()
+
+
+@lru_cache(maxsize=1)
+def get_preprocessor() -> PreprocessorService:
+    """전처리 서비스 의존성 반환 (요청 간 공유되는 단일 인스턴스)"""
+    return PreprocessorService()
+
+
+@lru_cache(maxsize=1)
+def get_postprocessor() -> PostprocessorService:
+    """후처리 서비스 의존성 반환 (요청 간 공유되는 단일 인스턴스)"""
+    return PostprocessorService()
@@ -1,22 +1,39 @@
 import asyncio
+import contextlib
 import logging
+import time
+import uuid
 from contextlib import asynccontextmanager
-from datetime import datetime
+from datetime import datetime, timezone
 
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 import structlog
 
-from app.config import settings, create_tables, close_db_connection
+from app.config import get_settings, create_tables, close_db_connection
 from app.routers import sleep_analysis, health, llm_feedback
-from app.dependencies import model_service
+from app.dependencies import get_model_service, get_llm_service, get_preprocessor
 from app.models.response_models import ErrorResponse
 
+settings = get_settings()
+
 # 로깅 설정
 logging.basicConfig(level=getattr(logging, settings.log_level.upper()))
 logger = structlog.get_logger()
 
+_UTC = timezone.utc
+
+# ErrorResponse 기본값 템플릿 (예외 경로에서 Pydantic 검증/직렬화 생략)
+_ERROR_RESPONSE_TEMPLATE = {
+    name: field.get_default(call_default_factory=True)
+    for name, field in ErrorResponse.model_fields.items()
+    if not field.is_required()
+}
+
+# 요청 로깅을 생략하는 경로 (헬스체크 프로브 등 고빈도 요청)
+_UNLOGGED_PATHS = frozenset({"/", "/api/v1/health/check"})
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -24,13 +41,39 @@ async def lifespan(app: FastAPI):
     logger.info("🚀 NEULBO ML Server 시작 중...")
     
     try:
-        # 데이터베이스 테이블 생성
-        await create_tables()
-        logger.info("✅ 데이터베이스 테이블 초기화 완료")
+        # 데이터베이스 테이블 생성 (AUTO_CREATE_TABLES 설정 시에만)
+        if settings.auto_create_tables:
+            await create_tables()
+            logger.info("✅ 데이터베이스 테이블 초기화 완료")
+        
+        # ML 모델 로딩 (EAGER_MODEL_LOAD 미설정 시 첫 분석 요청까지 지연)
+        if settings.eager_model_load:
+            await get_model_service().load_models()
+            logger.info("✅ ML 모델 로딩 완료")
+        else:
+            # 가중치 로딩은 미루되, 모델 파일 누락은 시작 단계에서 실패 처리
+            get_model_service().check_model_files()
+            logger.info("⏳ ML 모델은 첫 분석 요청 시 로딩됩니다")
+        
+        # 전처리 프로세스 풀 시작 (PREPROCESS_WORKERS 설정 시에만)
+        get_preprocessor().start_process_pool()
         
-        # ML 모델 로딩
-        await model_service.load_models()
-        logger.info("✅ ML 모델 로딩 완료")
+        # LLM 서버 가용성 확인 (요청 경로에서 타임아웃 대기를 피하기 위해 시작 시 확인)
+        llm_service = get_llm_service()
+        try:
+            is_llm_available = await asyncio.wait_for(
+                llm_service.refresh_availability(), timeout=2.0
+            )
+            logger.info(f"✅ LLM 가용성 확인 완료: {is_llm_available}")
+        except asyncio.TimeoutError:
+            logger.warning("⚠️ LLM 가용성 확인 시간 초과, 백그라운드에서 재확인합니다")
+        
+        llm_monitor = asyncio.create_task(
+            llm_service.monitor_availability(settings.llm_health_check_interval)
+        )
+        
+        # 시스템 메트릭스 일괄 저장 태스크 시작
+        metrics_flusher = asyncio.create_task(health.run_metrics_flusher())
         
         logger.info("🎉 서버 초기화 완료")
         
@@ -44,13 +87,30 @@ async def lifespan(app: FastAPI):
     logger.info("🔄 서버 종료 중...")
     
     try:
+        # 플러셔 종료(진행 중인 저장 완료까지 대기) 후 남은 메트릭스 저장
+        metrics_flusher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await metrics_flusher
+        await health.flush_metrics()
+        logger.info("✅ 메트릭스 버퍼 저장 완료")
+        
         await close_db_connection()
         logger.info("✅ 데이터베이스 연결 종료")
         
         # 모델 정리 (필요한 경우)
-        await model_service.cleanup()
+        await get_model_service().cleanup()
         logger.info("✅ 모델 서비스 정리 완료")
         
+        # 전처리 프로세스 풀 종료
+        get_preprocessor().shutdown()
+        
+        # LLM 가용성 확인 중단 및 HTTP 클라이언트 종료
+        llm_monitor.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await llm_monitor
+        await get_llm_service().close()
+        logger.info("✅ LLM 서비스 정리 완료")
+        
     except Exception as e:
         logger.error(f"❌ 서버 종료 중 오류: {str(e)}")
     
@@ -64,6 +124,7 @@ app = FastAPI(
     description="수면 분석을 위한 ML 백엔드 서버",
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -77,19 +138,26 @@ if not settings.debug:
     )
 
 
+def _build_error_content(error_code: str, error_message, request: Request) -> dict:
+    """ErrorResponse 형식의 오류 응답 본문 생성"""
+    return {
+        **_ERROR_RESPONSE_TEMPLATE,
+        "error_code": error_code,
+        "error_message": error_message,
+        "timestamp": datetime.now(_UTC),
+        "request_id": getattr(request.state, "request_id", None)
+    }
+
+
 # 전역 예외 처리기
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     """HTTP 예외 처리"""
-    error_response = ErrorResponse(
-        error_code=f"HTTP_{exc.status_code}",
-        error_message=exc.detail,
-        timestamp=datetime.utcnow(),
-        request_id=getattr(request.state, "request_id", None)
-    )
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
-        content=error_response.model_dump(mode='json')
+        content=_build_error_content(
+            f"HTTP_{exc.status_code}", exc.detail, request
+        )
     )
 
 
@@ -98,15 +166,11 @@ async def general_exception_handler(request: Request, exc: Exception):
     """일반 예외 처리"""
     logger.error(f"예상치 못한 오류 발생: {str(exc)}", exc_info=True)
     
-    error_response = ErrorResponse(
-        error_code="INTERNAL_SERVER_ERROR",
-        error_message="내부 서버 오류가 발생했습니다",
-        timestamp=datetime.utcnow(),
-        request_id=getattr(request.state, "request_id", None)
-    )
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
-        content=error_response.model_dump(mode='json')
+        content=_build_error_content(
+            "INTERNAL_SERVER_ERROR", "내부 서버 오류가 발생했습니다", request
+        )
     )
 
 
@@ -114,15 +178,16 @@ async def general_exception_handler(request: Request, exc: Exception):
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     """요청 로깅 및 처리 시간 측정"""
-    import time
-    import uuid
+    # 헬스체크 프로브 등은 로깅 없이 바로 처리
+    if request.url.path in _UNLOGGED_PATHS:
+        return await call_next(request)
     
     # 요청 ID 생성
-    request_id = str(uuid.uuid4())
+    request_id = uuid.uuid4().hex
     request.state.request_id = request_id
     
     # 처리 시작 시간
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     
     # 요청 로깅
     logger.info(
@@ -137,7 +202,7 @@ async def log_requests(request: Request, call_next):
     response = await call_next(request)
     
     # 처리 시간 계산
-    process_time = time.time() - start_time
+    process_time = (time.perf_counter_ns() - start_time) / 1e9
     
     # 응답 로깅
     logger.info(
@@ -174,16 +239,19 @@ app.include_router(
 )
 
 
-# 루트 엔드포인트
+# 루트 엔드포인트 (고정 응답)
+_ROOT_RESPONSE = {
+    "message": "NEULBO ML Server에 오신 것을 환영합니다!",
+    "version": settings.app_version,
+    "docs": "/docs",
+    "health": "/api/v1/health/check"
+}
+
+
 @app.get("/", include_in_schema=False)
 async def root():
     """루트 엔드포인트"""
-    return {
-        "message": "NEULBO ML Server에 오신 것을 환영합니다!",
-        "version": settings.app_version,
-        "docs": "/docs",
-        "health": "/api/v1/health/check"
-    }
+    return _ROOT_RESPONSE
 
 
 
@@ -1,10 +1,14 @@
+import asyncio
+import time
 from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import text, func
 import structlog
 
-from app.config import get_db, settings
+from app.config import get_db, get_settings, Settings
+from app.config.database import SessionLocal
 from app.models.response_models import HealthCheckResponse
 from app.models.database_models import SystemHealth, User
 from app.dependencies import get_model_service
@@ -13,33 +17,68 @@ from app.services.model_service import ModelService
 router = APIRouter()
 logger = structlog.get_logger()
 
+# 메트릭스 기록 버퍼 (run_metrics_flusher가 주기적으로 일괄 저장)
+METRICS_FLUSH_INTERVAL_SECONDS = 1.0
+METRICS_FLUSH_BATCH_SIZE = 500
+_metrics_queue: asyncio.Queue = asyncio.Queue()
+
+# 헬스체크 결과 캐시 (monotonic 시각, 응답)
+HEALTH_CHECK_CACHE_TTL_SECONDS = 1.0
+_health_cache: Optional[Tuple[float, HealthCheckResponse]] = None
+_health_cache_lock = asyncio.Lock()
+
 
 @router.get("/check", response_model=HealthCheckResponse)
 async def health_check(
     db: Session = Depends(get_db),
-    model_service: ModelService = Depends(get_model_service)
+    model_service: ModelService = Depends(get_model_service),
+    settings: Settings = Depends(get_settings)
 ):
     """
     시스템 헬스체크
     
     데이터베이스, ML 모델 등 주요 구성요소의 상태를 확인합니다.
+    고빈도 프로브 대응을 위해 결과를 짧은 시간 동안 캐시합니다.
     """
+    global _health_cache
+    
+    if _health_cache and time.monotonic() - _health_cache[0] < HEALTH_CHECK_CACHE_TTL_SECONDS:
+        return _health_cache[1]
+    
+    # 동시 요청 중 하나만 실제 점검 수행
+    async with _health_cache_lock:
+        if _health_cache and time.monotonic() - _health_cache[0] < HEALTH_CHECK_CACHE_TTL_SECONDS:
+            return _health_cache[1]
+        
+        response = await _run_health_check(db, model_service, settings)
+        _health_cache = (time.monotonic(), response)
+        return response
+
+
+async def _run_health_check(
+    db: Session,
+    model_service: ModelService,
+    settings: Settings
+) -> HealthCheckResponse:
+    """헬스체크 실제 수행"""
     try:
         # 데이터베이스 상태 확인
         db_status = "healthy"
         try:
             # 간단한 쿼리로 데이터베이스 연결 확인
-            db.execute(text("SELECT 1"))
-            db.commit()
+            # (읽기 전용 프로브이므로 커밋 없이 세션 종료 시 롤백)
+            await asyncio.to_thread(lambda: db.execute(text("SELECT 1")).scalar())
         except Exception as e:
             logger.error(f"데이터베이스 헬스체크 실패: {str(e)}")
             db_status = "unhealthy"
         
-        # 모델 상태 확인
+        # 모델 상태 확인 (지연 로딩으로 아직 로딩하지 않은 경우는 not_loaded)
         model_status = "healthy"
         try:
-            if not model_service.is_ready():
+            if model_service.is_loading():
                 model_status = "loading"
+            elif not model_service.is_ready():
+                model_status = "not_loaded"
         except Exception as e:
             logger.error(f"모델 헬스체크 실패: {str(e)}")
             model_status = "unhealthy"
@@ -67,7 +106,8 @@ async def health_check(
 @router.get("/detailed")
 async def detailed_health_check(
     db: Session = Depends(get_db),
-    model_service: ModelService = Depends(get_model_service)
+    model_service: ModelService = Depends(get_model_service),
+    settings: Settings = Depends(get_settings)
 ):
     """
     상세 헬스체크 정보
@@ -78,23 +118,38 @@ async def detailed_health_check(
         # 데이터베이스 상세 정보
         db_info = {}
         try:
-            # 활성 사용자 수
-            user_count = db.query(User).filter(User.is_active == True).count()
-            db_info["active_users"] = user_count
+            # 활성 사용자 수 (스칼라 서브쿼리)
+            active_users = db.query(func.count()).select_from(User).filter(
+                User.is_active == True
+            ).scalar_subquery()
             
-            # 최근 시스템 헬스 데이터
-            recent_health = db.query(SystemHealth).order_by(
+            # 최근 시스템 헬스 데이터와 활성 사용자 수를 한 번에 조회
+            recent_health_query = db.query(
+                active_users.label("active_users"),
+                SystemHealth.cpu_usage,
+                SystemHealth.memory_usage,
+                SystemHealth.disk_usage,
+                SystemHealth.active_analysis_count,
+                SystemHealth.timestamp
+            ).order_by(
                 SystemHealth.timestamp.desc()
-            ).first()
+            )
+            recent_health = await asyncio.to_thread(recent_health_query.first)
             
             if recent_health:
                 db_info.update({
+                    "active_users": recent_health.active_users,
                     "cpu_usage": recent_health.cpu_usage,
                     "memory_usage": recent_health.memory_usage,
                     "disk_usage": recent_health.disk_usage,
                     "active_analysis_count": recent_health.active_analysis_count,
                     "last_health_check": recent_health.timestamp
                 })
+            else:
+                # 헬스 기록이 없는 경우 활성 사용자 수만 조회
+                db_info["active_users"] = await asyncio.to_thread(
+                    db.query(active_users).scalar
+                )
                 
         except Exception as e:
             logger.error(f"데이터베이스 상세 정보 조회 실패: {str(e)}")
@@ -141,38 +196,52 @@ async def get_system_metrics(db: Session = Depends(get_db)):
         
         twenty_four_hours_ago = datetime.utcnow() - timedelta(hours=24)
         
-        recent_metrics = db.query(SystemHealth).filter(
+        # 평균 계산 (DB에서 집계, NULL 값은 AVG에서 제외됨)
+        averages_query = db.query(
+            func.avg(SystemHealth.cpu_usage),
+            func.avg(SystemHealth.memory_usage),
+            func.avg(SystemHealth.disk_usage),
+            func.count()
+        ).filter(
             SystemHealth.timestamp >= twenty_four_hours_ago
-        ).order_by(desc(SystemHealth.timestamp)).limit(100).all()
+        )
+        avg_cpu, avg_memory, avg_disk, total_data_points = await asyncio.to_thread(
+            averages_query.one
+        )
         
-        if not recent_metrics:
+        if not total_data_points:
             return {
                 "message": "최근 메트릭스 데이터가 없습니다",
                 "timestamp": datetime.utcnow()
             }
         
-        # 평균 계산
-        avg_cpu = sum(m.cpu_usage for m in recent_metrics if m.cpu_usage) / len(recent_metrics)
-        avg_memory = sum(m.memory_usage for m in recent_metrics if m.memory_usage) / len(recent_metrics)
-        avg_disk = sum(m.disk_usage for m in recent_metrics if m.disk_usage) / len(recent_metrics)
+        # 현재 값 (가장 최근 기록)
+        current_query = db.query(
+            SystemHealth.cpu_usage,
+            SystemHealth.memory_usage,
+            SystemHealth.disk_usage
+        ).filter(
+            SystemHealth.timestamp >= twenty_four_hours_ago
+        ).order_by(desc(SystemHealth.timestamp))
+        current = await asyncio.to_thread(current_query.first)
         
         return {
             "timestamp": datetime.utcnow(),
             "period": "24hours",
             "metrics": {
                 "cpu_usage": {
-                    "average": round(avg_cpu, 2),
-                    "current": recent_metrics[0].cpu_usage if recent_metrics else None
+                    "average": round(float(avg_cpu or 0.0), 2),
+                    "current": current.cpu_usage
                 },
                 "memory_usage": {
-                    "average": round(avg_memory, 2),
-                    "current": recent_metrics[0].memory_usage if recent_metrics else None
+                    "average": round(float(avg_memory or 0.0), 2),
+                    "current": current.memory_usage
                 },
                 "disk_usage": {
-                    "average": round(avg_disk, 2),
-                    "current": recent_metrics[0].disk_usage if recent_metrics else None
+                    "average": round(float(avg_disk or 0.0), 2),
+                    "current": current.disk_usage
                 },
-                "total_data_points": len(recent_metrics)
+                "total_data_points": total_data_points
             }
         }
         
@@ -185,32 +254,68 @@ async def get_system_metrics(db: Session = Depends(get_db)):
 async def record_system_metrics(
     cpu_usage: float = None,
     memory_usage: float = None,
-    disk_usage: float = None,
-    db: Session = Depends(get_db)
+    disk_usage: float = None
 ):
     """
     시스템 메트릭스 기록
     
     외부 모니터링 시스템에서 메트릭스를 기록할 때 사용합니다.
+    기록은 버퍼에 쌓였다가 백그라운드 태스크에서 일괄 저장됩니다.
     """
     try:
-        health_record = SystemHealth(
-            cpu_usage=cpu_usage,
-            memory_usage=memory_usage,
-            disk_usage=disk_usage,
-            timestamp=datetime.utcnow()
-        )
+        timestamp = datetime.utcnow()
         
-        db.add(health_record)
-        db.commit()
+        _metrics_queue.put_nowait({
+            "cpu_usage": cpu_usage,
+            "memory_usage": memory_usage,
+            "disk_usage": disk_usage,
+            "timestamp": timestamp
+        })
         
         return {
             "message": "메트릭스 기록 완료",
-            "timestamp": datetime.utcnow()
+            "timestamp": timestamp
         }
         
     except Exception as e:
         logger.error(f"메트릭스 기록 중 오류: {str(e)}")
-        db.rollback()
         raise HTTPException(status_code=500, detail="메트릭스 기록 실패")
 
+
+def _save_metrics_batch(batch: List[Dict[str, Any]]):
+    """메트릭스 일괄 저장 (단일 트랜잭션)"""
+    db = SessionLocal()
+    try:
+        db.bulk_insert_mappings(SystemHealth, batch)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def flush_metrics():
+    """버퍼에 쌓인 메트릭스를 일괄 저장"""
+    while not _metrics_queue.empty():
+        batch = []
+        while len(batch) < METRICS_FLUSH_BATCH_SIZE and not _metrics_queue.empty():
+            batch.append(_metrics_queue.get_nowait())
+        
+        try:
+            # 취소되더라도 이미 꺼낸 배치의 저장(스레드 작업)이 끝난 뒤 취소를 전파
+            save = asyncio.ensure_future(asyncio.to_thread(_save_metrics_batch, batch))
+            try:
+                await asyncio.shield(save)
+            except asyncio.CancelledError:
+                await save
+                raise
+        except Exception as e:
+            logger.error(f"메트릭스 일괄 저장 중 오류: {str(e)}", count=len(batch))
+
+
+async def run_metrics_flusher():
+    """메트릭스 버퍼 주기적 저장 루프 (애플리케이션 시작 시 백그라운드 실행)"""
+    while True:
+        await asyncio.sleep(METRICS_FLUSH_INTERVAL_SECONDS)
+        await flush_metrics()
@@ -1,27 +1,28 @@
 """LLM 피드백 API 라우터"""
 
+import asyncio
 import uuid
+import orjson
 import structlog
-from typing import List
+from functools import lru_cache
+from typing import AsyncIterator, Dict, Any, List, Tuple
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.config import get_db
+from app.config.database import SessionLocal
 from app.models.request_models import LLMFeedbackRequest
 from app.models.response_models import LLMFeedbackResponse
 from app.models.database_models import LLMFeedback, SleepAnalysis, User
 from app.services.llm_service import LLMService
+from app.dependencies import get_llm_service
 
 router = APIRouter()
 logger = structlog.get_logger()
 
 
-def get_llm_service() -> LLMService:
-    """LLM 서비스 의존성"""
-    return LLMService()
-
-
 @router.post("/feedback", response_model=LLMFeedbackResponse)
 async def generate_llm_feedback(
     request: LLMFeedbackRequest,
@@ -41,40 +42,15 @@ async def generate_llm_feedback(
                    user_id=request.user_id,
                    analysis_id=request.analysis_id)
         
-        # 사용자 검증
-        user = db.query(User).filter(User.id == int(request.user_id)).first()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="사용자를 찾을 수 없습니다"
-            )
-        
-        # 수면 분석 데이터 조회
-        sleep_analysis = db.query(SleepAnalysis).filter(
-            SleepAnalysis.analysis_id == request.analysis_id,
-            SleepAnalysis.user_id == int(request.user_id)
-        ).first()
-        
-        if not sleep_analysis:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="해당하는 수면 분석 데이터를 찾을 수 없습니다"
-            )
+        # LLM 가용성, 사용자, 수면 분석 데이터 확인
+        user_id, sleep_analysis, sleep_data = await _load_feedback_context(
+            db, llm_service, request
+        )
         
         logger.info("수면 분석 데이터 조회 완료", 
                    feedback_id=feedback_id,
                    analysis_id=request.analysis_id)
         
-        # 수면 데이터 구조화
-        sleep_data = {
-            "analysis_id": sleep_analysis.analysis_id,
-            "summary_statistics": sleep_analysis.summary_statistics,
-            "data_quality_score": sleep_analysis.data_quality_score,
-            "model_version": sleep_analysis.model_version,
-            "recording_start": sleep_analysis.recording_start,
-            "recording_end": sleep_analysis.recording_end
-        }
-        
         # LLM 피드백 생성
         llm_result = await llm_service.generate_sleep_feedback(
             user_prompt=request.user_prompt,
@@ -82,29 +58,31 @@ async def generate_llm_feedback(
             analysis_id=request.analysis_id
         )
         
+        # 분석 요약 생성 (커밋으로 속성이 만료되기 전에 계산)
+        analysis_summary = _create_analysis_summary(sleep_analysis)
+        
         # 데이터베이스에 피드백 저장
+        # (커밋 후 만료된 속성 재조회를 피하기 위해 생성 시각을 직접 지정)
+        created_at = datetime.utcnow()
         llm_feedback = LLMFeedback(
             feedback_id=llm_result["feedback_id"],
-            user_id=int(request.user_id),
+            user_id=user_id,
             analysis_id=request.analysis_id,
             user_prompt=request.user_prompt,
             llm_model=llm_result["llm_model"],
             llm_response=llm_result["llm_response"],
-            response_time_ms=llm_result["response_time_ms"]
+            response_time_ms=llm_result["response_time_ms"],
+            created_at=created_at
         )
         
         db.add(llm_feedback)
-        db.commit()
-        db.refresh(llm_feedback)
+        await asyncio.to_thread(db.commit)
         
         logger.info("LLM 피드백 생성 완료", 
                    feedback_id=feedback_id,
                    user_id=request.user_id,
                    response_time_ms=llm_result["response_time_ms"])
         
-        # 분석 요약 생성
-        analysis_summary = _create_analysis_summary(sleep_analysis)
-        
         # 응답 생성
         return LLMFeedbackResponse(
             feedback_id=llm_result["feedback_id"],
@@ -112,7 +90,7 @@ async def generate_llm_feedback(
             llm_response=llm_result["llm_response"],
             llm_model=llm_result["llm_model"],
             response_time_ms=llm_result["response_time_ms"],
-            timestamp=llm_feedback.created_at,
+            timestamp=created_at,
             analysis_summary=analysis_summary
         )
         
@@ -129,9 +107,158 @@ async def generate_llm_feedback(
         )
 
 
+@router.post("/feedback/stream")
+async def stream_llm_feedback(
+    request: LLMFeedbackRequest,
+    db: Session = Depends(get_db),
+    llm_service: LLMService = Depends(get_llm_service)
+):
+    """
+    수면 분석 기반 LLM 피드백 스트리밍 생성
+    
+    생성되는 응답을 Server-Sent Events로 전달하며, 완료 후 피드백을 저장합니다.
+    """
+    user_id, _, sleep_data = await _load_feedback_context(db, llm_service, request)
+    
+    return StreamingResponse(
+        _stream_feedback_events(llm_service, request, user_id, sleep_data),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
+async def _load_feedback_context(
+    db: Session,
+    llm_service: LLMService,
+    request: LLMFeedbackRequest
+) -> Tuple[int, SleepAnalysis, Dict[str, Any]]:
+    """
+    피드백 생성 전 공통 확인 (일반/스트리밍 엔드포인트 공용)
+    
+    LLM 가용성, 사용자, 수면 분석 데이터를 확인하고
+    (사용자 ID, 수면 분석 기록, LLM 입력용 수면 데이터)를 반환합니다.
+    """
+    # LLM 서버가 사용 불가로 확인된 경우 즉시 실패 처리
+    if llm_service.is_available is False:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="LLM 서비스를 일시적으로 사용할 수 없습니다"
+        )
+    
+    # 사용자 ID 변환 (1회만 수행)
+    user_id = int(request.user_id)
+    
+    # 사용자 검증
+    user = await asyncio.to_thread(
+        db.query(User).filter(User.id == user_id).first
+    )
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="사용자를 찾을 수 없습니다"
+        )
+    
+    # 수면 분석 데이터 조회
+    sleep_analysis = await asyncio.to_thread(
+        db.query(SleepAnalysis).filter(
+            SleepAnalysis.analysis_id == request.analysis_id,
+            SleepAnalysis.user_id == user_id
+        ).first
+    )
+    if not sleep_analysis:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="해당하는 수면 분석 데이터를 찾을 수 없습니다"
+        )
+    
+    # 수면 데이터 구조화
+    sleep_data = {
+        "analysis_id": sleep_analysis.analysis_id,
+        "summary_statistics": sleep_analysis.summary_statistics,
+        "data_quality_score": sleep_analysis.data_quality_score,
+        "model_version": sleep_analysis.model_version,
+        "recording_start": sleep_analysis.recording_start,
+        "recording_end": sleep_analysis.recording_end
+    }
+    
+    return user_id, sleep_analysis, sleep_data
+
+
+async def _stream_feedback_events(
+    llm_service: LLMService,
+    request: LLMFeedbackRequest,
+    user_id: int,
+    sleep_data: Dict[str, Any]
+) -> AsyncIterator[bytes]:
+    """LLM 응답 조각을 SSE 이벤트로 변환하고 완료 시 피드백 저장"""
+    feedback_id = str(uuid.uuid4())
+    start_time = datetime.utcnow()
+    chunks = []
+    
+    try:
+        async for chunk in llm_service.stream_sleep_feedback(
+            user_prompt=request.user_prompt,
+            sleep_data=sleep_data,
+            analysis_id=request.analysis_id
+        ):
+            chunks.append(chunk)
+            yield b"data: " + orjson.dumps({"content": chunk}) + b"\n\n"
+        
+        created_at = datetime.utcnow()
+        response_time_ms = (created_at - start_time).total_seconds() * 1000
+        
+        # 스트리밍 중에는 요청 세션 수명이 보장되지 않으므로 별도 세션으로 저장
+        await asyncio.to_thread(
+            _save_feedback_record,
+            LLMFeedback(
+                feedback_id=feedback_id,
+                user_id=user_id,
+                analysis_id=request.analysis_id,
+                user_prompt=request.user_prompt,
+                llm_model=llm_service.model_name,
+                llm_response="".join(chunks),
+                response_time_ms=response_time_ms,
+                created_at=created_at
+            )
+        )
+        
+        logger.info("LLM 스트리밍 피드백 완료", 
+                   feedback_id=feedback_id,
+                   user_id=user_id,
+                   response_time_ms=response_time_ms)
+        
+        yield b"event: done\ndata: " + orjson.dumps({
+            "feedback_id": feedback_id,
+            "llm_model": llm_service.model_name,
+            "response_time_ms": response_time_ms,
+            "timestamp": created_at
+        }) + b"\n\n"
+        
+    except Exception as e:
+        logger.error("LLM 스트리밍 피드백 실패", 
+                    feedback_id=feedback_id,
+                    error=str(e))
+        yield b"event: error\ndata: " + orjson.dumps({
+            "error_message": "피드백 생성 중 오류가 발생했습니다"
+        }) + b"\n\n"
+
+
+def _save_feedback_record(llm_feedback: LLMFeedback):
+    """피드백 저장 (전용 세션 사용)"""
+    db = SessionLocal()
+    try:
+        db.add(llm_feedback)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
 @router.get("/feedback/history/{user_id}", response_model=List[LLMFeedbackResponse])
 async def get_feedback_history(
-    user_id: str,
+    user_id: int,
     limit: int = 10,
     db: Session = Depends(get_db)
 ):
@@ -140,28 +267,29 @@ async def get_feedback_history(
     """
     try:
         # 사용자 검증
-        user = db.query(User).filter(User.id == int(user_id)).first()
+        user = await asyncio.to_thread(
+            db.query(User).filter(User.id == user_id).first
+        )
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="사용자를 찾을 수 없습니다"
             )
         
-        # 피드백 기록 조회
-        feedbacks = db.query(LLMFeedback).filter(
-            LLMFeedback.user_id == int(user_id)
-        ).order_by(
-            LLMFeedback.created_at.desc()
-        ).limit(limit).all()
+        # 피드백 기록과 관련 수면 분석 데이터를 한 번의 쿼리로 조회
+        rows = await asyncio.to_thread(
+            db.query(LLMFeedback, SleepAnalysis).outerjoin(
+                SleepAnalysis, SleepAnalysis.analysis_id == LLMFeedback.analysis_id
+            ).filter(
+                LLMFeedback.user_id == user_id
+            ).order_by(
+                LLMFeedback.created_at.desc()
+            ).limit(limit).all
+        )
         
         # 응답 생성
         result = []
-        for feedback in feedbacks:
-            # 관련 수면 분석 데이터 조회
-            sleep_analysis = db.query(SleepAnalysis).filter(
-                SleepAnalysis.analysis_id == feedback.analysis_id
-            ).first()
-            
+        for feedback, sleep_analysis in rows:
             analysis_summary = _create_analysis_summary(sleep_analysis) if sleep_analysis else "분석 데이터 없음"
             
             result.append(LLMFeedbackResponse(
@@ -201,9 +329,11 @@ async def get_feedback_detail(
     특정 LLM 피드백 상세 조회
     """
     try:
-        feedback = db.query(LLMFeedback).filter(
-            LLMFeedback.feedback_id == feedback_id
-        ).first()
+        feedback = await asyncio.to_thread(
+            db.query(LLMFeedback).filter(
+                LLMFeedback.feedback_id == feedback_id
+            ).first
+        )
         
         if not feedback:
             raise HTTPException(
@@ -212,9 +342,11 @@ async def get_feedback_detail(
             )
         
         # 관련 수면 분석 데이터 조회
-        sleep_analysis = db.query(SleepAnalysis).filter(
-            SleepAnalysis.analysis_id == feedback.analysis_id
-        ).first()
+        sleep_analysis = await asyncio.to_thread(
+            db.query(SleepAnalysis).filter(
+                SleepAnalysis.analysis_id == feedback.analysis_id
+            ).first
+        )
         
         analysis_summary = _create_analysis_summary(sleep_analysis) if sleep_analysis else "분석 데이터 없음"
         
@@ -244,15 +376,21 @@ async def get_feedback_detail(
 async def check_llm_health(llm_service: LLMService = Depends(get_llm_service)):
     """
     LLM 서비스 상태 확인
+    
+    백그라운드에서 주기적으로 갱신되는 가용성 결과를 반환합니다.
     """
     try:
-        is_available = await llm_service.validate_model_availability()
+        is_available = llm_service.is_available
+        if is_available is None:
+            # 아직 확인된 결과가 없는 경우에만 직접 확인
+            is_available = await llm_service.refresh_availability()
         
         return {
             "status": "healthy" if is_available else "unhealthy",
             "model": llm_service.model_name,
             "ollama_url": llm_service.ollama_url,
             "available": is_available,
+            "last_checked": llm_service.availability_checked_at,
             "timestamp": datetime.utcnow()
         }
         
@@ -272,11 +410,30 @@ def _create_analysis_summary(sleep_analysis) -> str:
         return "분석 데이터 없음"
     
     try:
-        stats = sleep_analysis.summary_statistics
-        duration = (sleep_analysis.recording_end - sleep_analysis.recording_start).total_seconds() / 3600
+        stats = sleep_analysis.summary_statistics or {}
         
-        return (f"총 {duration:.1f}시간 수면 분석 "
-                f"(수면효율: {stats.get('sleep_efficiency', 0)*100:.1f}%, "
-                f"총 수면시간: {stats.get('total_sleep_time', 0)}분)")
+        return _format_analysis_summary(
+            sleep_analysis.analysis_id,
+            sleep_analysis.recording_start,
+            sleep_analysis.recording_end,
+            stats.get('sleep_efficiency', 0),
+            stats.get('total_sleep_time', 0)
+        )
     except:
         return "분석 요약 생성 실패"
+
+
+@lru_cache(maxsize=4096)
+def _format_analysis_summary(
+    analysis_id: str,
+    recording_start: datetime,
+    recording_end: datetime,
+    sleep_efficiency: float,
+    total_sleep_time: int
+) -> str:
+    """수면 분석 요약 문자열 생성 (분석별 캐시)"""
+    duration = (recording_end - recording_start).total_seconds() / 3600
+    
+    return (f"총 {duration:.1f}시간 수면 분석 "
+            f"(수면효율: {sleep_efficiency*100:.1f}%, "
+            f"총 수면시간: {total_sleep_time}분)")
@@ -1,13 +1,17 @@
 import asyncio
+import base64
+import time
 import uuid
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Request, Response
+from sqlalchemy import tuple_, update
 from sqlalchemy.orm import Session
 import structlog
 
 from app.config import get_db
+from app.config.database import SessionLocal
 from app.models.request_models import SleepAnalysisRequest
 from app.models.response_models import (
     SleepAnalysisResponse, 
@@ -18,58 +22,159 @@ from app.models.database_models import SleepAnalysis, User, ModelInfo
 from app.services.model_service import ModelService
 from app.services.preprocessor import PreprocessorService
 from app.services.postprocessor import PostprocessorService
-from app.dependencies import get_model_service
-from app.utils.validation_utils import validate_sensor_data
-from app.utils.time_series_utils import check_data_quality
+from app.dependencies import get_loaded_model_service, get_preprocessor, get_postprocessor
+from app.utils.validation_utils import validate_sensor_data_sync
+from app.utils.time_series_utils import check_data_quality_sync
+from app.utils.sensor_utils import SensorArrays
 
 router = APIRouter()
 logger = structlog.get_logger()
 
+# 사용자별 분석 이력 개수 캐시 (user_id -> (monotonic 시각, 개수))
+HISTORY_COUNT_CACHE_TTL_SECONDS = 60.0
+HISTORY_COUNT_CACHE_MAX_SIZE = 10000
+_history_count_cache: Dict[str, Tuple[float, int]] = {}
 
-@router.post("/analyze", response_model=SleepAnalysisResponse)
+# 이력 목록에 필요한 컬럼 (summary_statistics는 include_stats일 때만 조회)
+HISTORY_COLUMNS = (
+    SleepAnalysis.analysis_id,
+    SleepAnalysis.recording_start,
+    SleepAnalysis.recording_end,
+    SleepAnalysis.analysis_timestamp,
+    SleepAnalysis.status,
+    SleepAnalysis.data_quality_score,
+    SleepAnalysis.model_version,
+)
+
+
+@router.post("/analyze", response_model=SleepAnalysisResponse, deprecated=True)
 async def analyze_sleep_data(
     request: SleepAnalysisRequest,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    model_service: ModelService = Depends(get_model_service)
+    model_service: ModelService = Depends(get_loaded_model_service),
+    preprocessor: PreprocessorService = Depends(get_preprocessor),
+    postprocessor: PostprocessorService = Depends(get_postprocessor)
 ):
     """
     수면 데이터 분석
     
     가속도계와 오디오 센서 데이터를 분석하여 수면 단계를 예측합니다.
+    (하위 호환용 JSON 엔드포인트, 신규 클라이언트는 /analyze/binary 사용)
     """
+    # 측정값을 열 단위 배열로 한 번만 변환하여 검증/품질 평가/전처리에서 공유
+    sensor_arrays = await asyncio.to_thread(
+        SensorArrays.from_readings,
+        request.accelerometer_data,
+        request.audio_data
+    )
+    
+    return await _analyze_sensor_arrays(
+        request.user_id,
+        request.recording_start,
+        request.recording_end,
+        sensor_arrays,
+        background_tasks,
+        db,
+        model_service,
+        preprocessor,
+        postprocessor
+    )
+
+
+@router.post("/analyze/binary", response_model=SleepAnalysisResponse)
+async def analyze_sleep_data_binary(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    user_id: str = Query(..., description="사용자 ID"),
+    recording_start: datetime = Query(..., description="기록 시작 시각 (경과 초의 기준 시각)"),
+    recording_end: datetime = Query(..., description="기록 종료 시각"),
+    accel_count: int = Query(..., ge=0, description="가속도계 측정값 개수"),
+    audio_count: int = Query(..., ge=0, description="오디오 측정값 개수"),
+    band_count: int = Query(8, ge=0, description="오디오 측정값당 주파수 밴드 개수"),
+    db: Session = Depends(get_db),
+    model_service: ModelService = Depends(get_loaded_model_service),
+    preprocessor: PreprocessorService = Depends(get_preprocessor),
+    postprocessor: PostprocessorService = Depends(get_postprocessor)
+):
+    """
+    수면 데이터 분석 (바이너리 본문)
+    
+    application/octet-stream 본문을 파싱 없이 NumPy 배열로 읽어 분석합니다.
+    본문 형식은 SensorArrays.from_binary를 참고하세요.
+    """
+    body = await request.body()
+    
+    try:
+        sensor_arrays = SensorArrays.from_binary(
+            body, recording_start, accel_count, audio_count, band_count
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return await _analyze_sensor_arrays(
+        user_id,
+        recording_start,
+        recording_end,
+        sensor_arrays,
+        background_tasks,
+        db,
+        model_service,
+        preprocessor,
+        postprocessor
+    )
+
+
+async def _analyze_sensor_arrays(
+    user_id: str,
+    recording_start: datetime,
+    recording_end: datetime,
+    sensor_arrays: SensorArrays,
+    background_tasks: BackgroundTasks,
+    db: Session,
+    model_service: ModelService,
+    preprocessor: PreprocessorService,
+    postprocessor: PostprocessorService
+) -> SleepAnalysisResponse:
+    """센서 배열 기반 수면 분석 (JSON/바이너리 엔드포인트 공용)"""
+    # 분석 ID 및 분석 시각 생성 (DB 기록과 응답에서 공유)
+    analysis_id = str(uuid.uuid4())
+    analysis_timestamp = datetime.utcnow()
+    analysis_saved = False
+    
     try:
-        # 분석 ID 생성
-        analysis_id = str(uuid.uuid4())
-        
         logger.info(
             "수면 분석 시작",
             analysis_id=analysis_id,
-            user_id=request.user_id,
-            recording_duration=(request.recording_end - request.recording_start).total_seconds()
+            user_id=user_id,
+            recording_duration=(recording_end - recording_start).total_seconds()
         )
         
-        # 1. 센서 데이터 유효성 검사
-        logger.info("센서 데이터 유효성 검사 중...", analysis_id=analysis_id)
+        # 1~2. 센서 데이터 유효성 검사 및 품질 확인
+        # (서로 독립적이므로 각각 워커 스레드에서 동시에 실행)
+        logger.info("센서 데이터 유효성 검사 및 품질 확인 중...", analysis_id=analysis_id)
         
-        validation_result = await validate_sensor_data(
-            request.accelerometer_data,
-            request.audio_data
-        )
+        # (검증 실패 시 품질 확인 결과는 버려지며, 이미 시작된 스레드 작업은 끝까지 실행됨)
+        quality_task = asyncio.create_task(asyncio.to_thread(
+            check_data_quality_sync, None, None, sensor_arrays
+        ))
+        
+        try:
+            validation_result = await asyncio.to_thread(
+                validate_sensor_data_sync, None, None, sensor_arrays
+            )
+        except BaseException:
+            quality_task.cancel()
+            raise
         
         if not validation_result.is_valid:
+            quality_task.cancel()
             raise HTTPException(
                 status_code=422,
                 detail=f"센서 데이터 유효성 검사 실패: {', '.join(validation_result.validation_errors)}"
             )
         
-        # 2. 데이터 품질 확인
-        logger.info("데이터 품질 확인 중...", analysis_id=analysis_id)
-        
-        quality_report = await check_data_quality(
-            request.accelerometer_data,
-            request.audio_data
-        )
+        quality_report = await quality_task
         
         if quality_report.overall_score < 0.5:
             logger.warning(
@@ -81,52 +186,54 @@ async def analyze_sleep_data(
         # 3. 데이터베이스에 분석 기록 생성
         sleep_analysis = SleepAnalysis(
             analysis_id=analysis_id,
-            user_id=request.user_id,
-            recording_start=request.recording_start,
-            recording_end=request.recording_end,
+            user_id=user_id,
+            analysis_timestamp=analysis_timestamp,
+            recording_start=recording_start,
+            recording_end=recording_end,
             model_version=model_service.get_model_version(),
             data_quality_score=quality_report.overall_score,
             status="processing",
             summary_statistics={}  # 나중에 업데이트
         )
         
-        db.add(sleep_analysis)
-        db.commit()
-        
-        # 4. 전처리 서비스 초기화
-        preprocessor = PreprocessorService()
-        postprocessor = PostprocessorService()
-        
-        # 5. 데이터 전처리
+        # 4. 데이터 전처리 (분석 기록 저장과 동시에 진행)
         logger.info("데이터 전처리 중...", analysis_id=analysis_id)
         
-        processed_data = await preprocessor.process_sensor_data(
-            request.accelerometer_data,
-            request.audio_data
+        insert_task = asyncio.create_task(
+            asyncio.to_thread(_save_analysis_record, db, sleep_analysis)
         )
+        try:
+            processed_data = await preprocessor.process_sensor_data(
+                None, None, sensor_arrays
+            )
+        finally:
+            # 전처리 실패 시에도 저장 완료를 기다려 세션이 동시에 사용되지 않도록 함
+            await insert_task
+            analysis_saved = True
+            _history_count_cache.pop(str(user_id), None)
         
-        # 6. ML 모델 추론
+        # 5. ML 모델 추론
         logger.info("ML 모델 추론 중...", analysis_id=analysis_id)
         
         predictions = await model_service.predict_sleep_stages(processed_data)
         
-        # 7. 후처리 및 응답 형식화
+        # 6. 후처리 및 응답 형식화
         logger.info("결과 후처리 중...", analysis_id=analysis_id)
         
         response = await postprocessor.format_analysis_response(
             analysis_id=analysis_id,
-            user_id=request.user_id,
-            recording_start=request.recording_start,
-            recording_end=request.recording_end,
+            user_id=user_id,
+            recording_start=recording_start,
+            recording_end=recording_end,
             predictions=predictions,
             model_version=model_service.get_model_version(),
-            data_quality_score=quality_report.overall_score
+            data_quality_score=quality_report.overall_score,
+            analysis_timestamp=analysis_timestamp
         )
         
-        # 8. 데이터베이스 업데이트 (백그라운드 태스크)
+        # 7. 데이터베이스 업데이트 (백그라운드 태스크)
         background_tasks.add_task(
             update_analysis_results,
-            db,
             analysis_id,
             response,
             "completed"
@@ -135,7 +242,7 @@ async def analyze_sleep_data(
         logger.info(
             "수면 분석 완료",
             analysis_id=analysis_id,
-            user_id=request.user_id,
+            user_id=user_id,
             total_sleep_time=response.summary_statistics.total_sleep_time
         )
         
@@ -147,17 +254,16 @@ async def analyze_sleep_data(
     except Exception as e:
         logger.error(
             "수면 분석 중 오류 발생",
-            analysis_id=getattr(locals().get('sleep_analysis'), 'analysis_id', 'unknown'),
+            analysis_id=analysis_id,
             error=str(e),
             exc_info=True
         )
         
         # 데이터베이스 상태 업데이트
-        if 'sleep_analysis' in locals():
+        if analysis_saved:
             background_tasks.add_task(
                 update_analysis_results,
-                db,
-                sleep_analysis.analysis_id,
+                analysis_id,
                 None,
                 "failed",
                 str(e)
@@ -172,38 +278,67 @@ async def analyze_sleep_data(
 @router.get("/history/{user_id}", response_model=SleepAnalysisHistoryResponse)
 async def get_sleep_analysis_history(
     user_id: str,
-    page: int = Query(1, ge=1, description="페이지 번호"),
+    response: Response,
+    page: int = Query(1, ge=1, description="페이지 번호 (cursor 미사용 시)"),
     page_size: int = Query(10, ge=1, le=100, description="페이지 크기"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 X-Next-Cursor 헤더)"),
+    include_stats: bool = Query(True, description="요약 통계(summary_statistics) 포함 여부"),
     db: Session = Depends(get_db)
 ):
     """
     사용자의 수면 분석 이력 조회
+    
+    cursor를 전달하면 해당 위치 이후부터 조회합니다 (keyset 페이지네이션).
+    다음 페이지 커서는 X-Next-Cursor 응답 헤더로 반환됩니다.
+    include_stats=false이면 요약 통계 JSON을 조회하지 않습니다.
     """
     try:
-        # 전체 개수 조회
-        total_count = db.query(SleepAnalysis).filter(
-            SleepAnalysis.user_id == user_id
-        ).count()
+        # ORM 엔티티 대신 목록에 필요한 컬럼만 조회
+        columns = HISTORY_COLUMNS
+        if include_stats:
+            columns += (SleepAnalysis.summary_statistics,)
         
-        # 페이지네이션된 결과 조회
-        offset = (page - 1) * page_size
-        analyses = db.query(SleepAnalysis).filter(
+        query = db.query(*columns).filter(
             SleepAnalysis.user_id == user_id
-        ).order_by(SleepAnalysis.analysis_timestamp.desc()).offset(offset).limit(page_size).all()
+        ).order_by(
+            SleepAnalysis.analysis_timestamp.desc(),
+            SleepAnalysis.analysis_id.desc()
+        )
         
-        # 결과 형식화
+        if cursor:
+            # 커서 이후 구간만 조회 (앞 페이지 행을 건너뛰지 않음)
+            cursor_timestamp, cursor_analysis_id = _decode_history_cursor(cursor)
+            query = query.filter(
+                tuple_(SleepAnalysis.analysis_timestamp, SleepAnalysis.analysis_id)
+                < tuple_(cursor_timestamp, cursor_analysis_id)
+            )
+        else:
+            # 페이지 번호 기반 조회 (하위 호환)
+            query = query.offset((page - 1) * page_size)
+        
+        # 다음 페이지 존재 여부 확인을 위해 1건 더 조회
+        analyses = query.limit(page_size + 1).all()
+        has_next = len(analyses) > page_size
+        analyses = analyses[:page_size]
+        
+        # 전체 개수 (첫 페이지에서 다음 페이지가 없으면 COUNT 생략)
+        if not cursor and page == 1 and not has_next:
+            total_count = len(analyses)
+        else:
+            total_count = _get_history_count(db, user_id)
+        
+        # 결과 형식화 (요약 통계 미포함 시 None)
         analyses_data = []
         for analysis in analyses:
-            analyses_data.append({
-                "analysis_id": analysis.analysis_id,
-                "recording_start": analysis.recording_start,
-                "recording_end": analysis.recording_end,
-                "analysis_timestamp": analysis.analysis_timestamp,
-                "status": analysis.status,
-                "data_quality_score": analysis.data_quality_score,
-                "model_version": analysis.model_version,
-                "summary_statistics": analysis.summary_statistics
-            })
+            analysis_data = analysis._asdict()
+            analysis_data.setdefault("summary_statistics", None)
+            analyses_data.append(analysis_data)
+        
+        response.headers["X-Has-Next"] = "true" if has_next else "false"
+        if has_next:
+            response.headers["X-Next-Cursor"] = _encode_history_cursor(
+                analyses[-1].analysis_timestamp, analyses[-1].analysis_id
+            )
         
         return SleepAnalysisHistoryResponse(
             analyses=analyses_data,
@@ -212,15 +347,52 @@ async def get_sleep_analysis_history(
             page_size=page_size
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"수면 분석 이력 조회 중 오류: {str(e)}")
         raise HTTPException(status_code=500, detail="분석 이력 조회 실패")
 
 
+def _get_history_count(db: Session, user_id: str) -> int:
+    """사용자별 분석 이력 개수 조회 (짧은 TTL 캐시)"""
+    now = time.monotonic()
+    cached = _history_count_cache.get(user_id)
+    if cached and now - cached[0] < HISTORY_COUNT_CACHE_TTL_SECONDS:
+        return cached[1]
+    
+    count = db.query(SleepAnalysis).filter(
+        SleepAnalysis.user_id == user_id
+    ).count()
+    
+    if len(_history_count_cache) >= HISTORY_COUNT_CACHE_MAX_SIZE:
+        _history_count_cache.clear()
+    _history_count_cache[user_id] = (now, count)
+    
+    return count
+
+
+def _encode_history_cursor(analysis_timestamp: datetime, analysis_id: str) -> str:
+    """이력 조회 커서 생성 (마지막 행의 정렬 키)"""
+    raw = f"{analysis_timestamp.isoformat()}|{analysis_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_history_cursor(cursor: str) -> Tuple[datetime, str]:
+    """이력 조회 커서 해석"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        timestamp_str, analysis_id = raw.split("|", 1)
+        return datetime.fromisoformat(timestamp_str), analysis_id
+    except Exception:
+        raise HTTPException(status_code=400, detail="유효하지 않은 커서입니다")
+
+
 @router.get("/result/{analysis_id}", response_model=SleepAnalysisResponse)
 async def get_analysis_result(
     analysis_id: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    postprocessor: PostprocessorService = Depends(get_postprocessor)
 ):
     """
     특정 분석 결과 상세 조회
@@ -241,9 +413,9 @@ async def get_analysis_result(
             )
         
         # 상세 데이터 조회 (stage_intervals, stage_probabilities)
-        postprocessor = PostprocessorService()
+        # 위에서 조회한 분석 레코드를 재사용하여 중복 조회 방지
         detailed_response = await postprocessor.get_detailed_analysis_result(
-            db, analysis_id
+            db, analysis_id, analysis
         )
         
         return detailed_response
@@ -299,8 +471,10 @@ async def delete_analysis(
             raise HTTPException(status_code=404, detail="분석 결과를 찾을 수 없습니다")
         
         # 관련 데이터도 함께 삭제 (CASCADE 설정으로 자동 삭제됨)
+        user_id = str(analysis.user_id)
         db.delete(analysis)
         db.commit()
+        _history_count_cache.pop(user_id, None)
         
         logger.info(f"분석 결과 삭제 완료: {analysis_id}")
         
@@ -314,8 +488,13 @@ async def delete_analysis(
         raise HTTPException(status_code=500, detail="분석 결과 삭제 실패")
 
 
-async def update_analysis_results(
-    db: Session,
+def _save_analysis_record(db: Session, sleep_analysis: SleepAnalysis):
+    """분석 기록 저장 (이벤트 루프 밖 스레드에서 실행)"""
+    db.add(sleep_analysis)
+    db.commit()
+
+
+def update_analysis_results(
     analysis_id: str,
     response: Optional[SleepAnalysisResponse],
     status: str,
@@ -323,26 +502,29 @@ async def update_analysis_results(
 ):
     """
     분석 결과를 데이터베이스에 업데이트하는 백그라운드 태스크
+    
+    요청 세션과 분리된 별도 세션을 사용하며, 동기 함수이므로 스레드풀에서 실행됩니다.
     """
-    try:
-        analysis = db.query(SleepAnalysis).filter(
-            SleepAnalysis.analysis_id == analysis_id
-        ).first()
+    values = {"status": status, "error_message": error_message}
+    if response and status == "completed":
+        values["summary_statistics"] = response.summary_statistics.model_dump()
         
-        if analysis:
-            analysis.status = status
-            analysis.error_message = error_message
-            
-            if response and status == "completed":
-                analysis.summary_statistics = response.summary_statistics.dict()
-                
-                # stage_intervals와 stage_probabilities도 저장
-                # (이 부분은 postprocessor에서 처리하거나 별도 구현 필요)
-            
-            db.commit()
-            logger.info(f"분석 결과 업데이트 완료: {analysis_id}, 상태: {status}")
+        # stage_intervals와 stage_probabilities도 저장
+        # (이 부분은 postprocessor에서 처리하거나 별도 구현 필요)
+    
+    db = SessionLocal()
+    try:
+        # 행을 조회하지 않고 UPDATE 한 번으로 갱신
+        db.execute(
+            update(SleepAnalysis)
+            .where(SleepAnalysis.analysis_id == analysis_id)
+            .values(**values)
+        )
+        db.commit()
+        logger.info(f"분석 결과 업데이트 완료: {analysis_id}, 상태: {status}")
         
     except Exception as e:
         logger.error(f"분석 결과 업데이트 중 오류: {str(e)}")
         db.rollback()
-
+    finally:
+        db.close()
@@ -1,11 +1,14 @@
 """LLM 서비스 모듈"""
 
-import json
+import asyncio
+import hashlib
+import sqlite3
 import time
 import uuid
 import httpx
+import orjson
 import structlog
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, Optional
 from datetime import datetime
 
 from app.config.settings import settings
@@ -16,10 +19,71 @@ logger = structlog.get_logger()
 class LLMService:
     """OLLAMA LLM 서비스 클래스"""
     
-    def __init__(self):
+    # 시스템 프롬프트 (고정 문자열)
+    _SYSTEM_PROMPT = """
+당신은 수면 전문 AI 어시스턴트입니다. 
+사용자의 수면 분석 데이터를 바탕으로 개인화된 수면 개선 조언을 제공합니다.
+
+역할:
+- 수면 데이터 해석 및 패턴 분석
+- 과학적 근거에 기반한 수면 개선 제안
+- 친근하고 이해하기 쉬운 언어로 설명
+- 의료 진단은 하지 않으며, 필요시 전문의 상담 권유
+
+응답 가이드라인:
+1. 사용자의 질문에 직접적으로 답변
+2. 제공된 수면 데이터 활용
+3. 구체적이고 실행 가능한 조언 제공
+4. 한국어로 친근하게 응답
+5. 500자 이내로 간결하게 작성
+"""
+    
+    # 사용자 프롬프트 템플릿 (summary, user_prompt 치환)
+    _PROMPT_TEMPLATE = """
+수면 분석 데이터:
+{summary}
+
+사용자 질문: {user_prompt}
+
+위의 수면 데이터를 바탕으로 사용자의 질문에 답변해주세요.
+"""
+    
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
         self.ollama_url = getattr(settings, 'ollama_url', 'http://localhost:11434')
         self.model_name = getattr(settings, 'llm_model', 'gpt-oss:20b')
         self.timeout = getattr(settings, 'llm_timeout', 30.0)
+        
+        # 마지막 가용성 확인 결과 (None: 아직 확인하지 않음)
+        self.is_available: Optional[bool] = None
+        self.availability_checked_at: Optional[datetime] = None
+        
+        # 요청 간 재사용되는 HTTP 클라이언트 (keep-alive 커넥션 유지)
+        # 스트리밍 응답은 생성이 끝날 때까지 커넥션을 점유하므로 최대 커넥션 수를 여유 있게 설정
+        self.client = client or httpx.AsyncClient(
+            base_url=self.ollama_url,
+            timeout=self.timeout,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+        )
+        
+        # LLM 응답 캐시 (동일 프롬프트 재요청 시 LLM 호출 생략)
+        self.cache_ttl = getattr(settings, 'llm_cache_ttl', 86400.0)
+        self._cache: Optional[sqlite3.Connection] = None
+        cache_path = getattr(settings, 'llm_cache_path', '')
+        if cache_path:
+            self._cache = sqlite3.connect(cache_path, check_same_thread=False)
+            self._cache.execute(
+                "CREATE TABLE IF NOT EXISTS cache("
+                "key TEXT PRIMARY KEY, response TEXT, created_at REAL)"
+            )
+            self._cache.commit()
+        self._cache_lock = asyncio.Lock()
+    
+    async def close(self):
+        """HTTP 클라이언트 및 응답 캐시 종료"""
+        await self.client.aclose()
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
     
     async def generate_sleep_feedback(
         self,
@@ -46,7 +110,7 @@ class LLMService:
                        model=self.model_name)
             
             # 프롬프트 구성
-            system_prompt = self._build_system_prompt()
+            system_prompt = self._SYSTEM_PROMPT
             formatted_prompt = self._format_prompt(user_prompt, sleep_data)
             
             # OLLAMA API 호출
@@ -73,25 +137,55 @@ class LLMService:
                         error=str(e))
             raise
     
-    def _build_system_prompt(self) -> str:
-        """시스템 프롬프트 구성"""
-        return """
-당신은 수면 전문 AI 어시스턴트입니다. 
-사용자의 수면 분석 데이터를 바탕으로 개인화된 수면 개선 조언을 제공합니다.
-
-역할:
-- 수면 데이터 해석 및 패턴 분석
-- 과학적 근거에 기반한 수면 개선 제안
-- 친근하고 이해하기 쉬운 언어로 설명
-- 의료 진단은 하지 않으며, 필요시 전문의 상담 권유
-
-응답 가이드라인:
-1. 사용자의 질문에 직접적으로 답변
-2. 제공된 수면 데이터 활용
-3. 구체적이고 실행 가능한 조언 제공
-4. 한국어로 친근하게 응답
-5. 500자 이내로 간결하게 작성
-"""
+    async def stream_sleep_feedback(
+        self,
+        user_prompt: str,
+        sleep_data: Dict[str, Any],
+        analysis_id: str
+    ) -> AsyncIterator[str]:
+        """
+        수면 데이터 기반 LLM 피드백 스트리밍 생성
+        
+        생성되는 토큰을 순서대로 반환하며, 캐시 적중 시 전체 응답을 한 번에 반환합니다.
+        
+        Args:
+            user_prompt: 사용자 질문
+            sleep_data: 수면 분석 데이터
+            analysis_id: 분석 ID
+            
+        Yields:
+            LLM 응답 텍스트 조각
+        """
+        logger.info("LLM 스트리밍 피드백 생성 시작", 
+                   analysis_id=analysis_id, 
+                   model=self.model_name)
+        
+        system_prompt = self._SYSTEM_PROMPT
+        formatted_prompt = self._format_prompt(user_prompt, sleep_data)
+        
+        key = None
+        if self._cache is not None:
+            key = self._cache_key(system_prompt, formatted_prompt)
+            cached = await self._load_cached_response(key)
+            if cached:
+                logger.info("LLM 응답 캐시 적중", cache_key=key[:16])
+                yield cached
+                return
+        
+        chunks = []
+        stream_state = {"done": False}
+        async for chunk in self._stream_ollama_api(system_prompt, formatted_prompt, stream_state):
+            chunks.append(chunk)
+            yield chunk
+        
+        # 완료 신호(done)까지 받은 비어 있지 않은 응답만 캐시 (잘린 응답 재사용 방지)
+        response = "".join(chunks)
+        if key is not None and stream_state["done"] and response:
+            await self._store_cached_response(key, response)
+        elif not stream_state["done"]:
+            logger.warning("LLM 스트리밍 응답이 완료 신호 없이 종료됨", analysis_id=analysis_id)
+        
+        logger.info("LLM 스트리밍 피드백 생성 완료", analysis_id=analysis_id)
     
     def _format_prompt(self, user_prompt: str, sleep_data: Dict[str, Any]) -> str:
         """사용자 프롬프트와 수면 데이터를 결합"""
@@ -99,15 +193,7 @@ class LLMService:
         # 수면 데이터 요약 생성
         summary = self._create_sleep_summary(sleep_data)
         
-        formatted_prompt = f"""
-수면 분석 데이터:
-{summary}
-
-사용자 질문: {user_prompt}
-
-위의 수면 데이터를 바탕으로 사용자의 질문에 답변해주세요.
-"""
-        return formatted_prompt
+        return self._PROMPT_TEMPLATE.format(summary=summary, user_prompt=user_prompt)
     
     def _create_sleep_summary(self, sleep_data: Dict[str, Any]) -> str:
         """수면 데이터 요약 생성"""
@@ -131,27 +217,132 @@ class LLMService:
             logger.warning("수면 데이터 요약 생성 실패", error=str(e))
             return "수면 데이터 요약을 생성할 수 없습니다."
     
+    def _cache_key(self, system_prompt: str, user_prompt: str) -> str:
+        """모델명과 프롬프트 기반 캐시 키 생성"""
+        return hashlib.sha256(
+            "\0".join((self.model_name, system_prompt, user_prompt)).encode()
+        ).hexdigest()
+    
+    def _get_cached_response(self, key: str) -> Optional[str]:
+        """캐시된 LLM 응답 조회 (만료된 항목은 무시)"""
+        row = self._cache.execute(
+            "SELECT response FROM cache WHERE key = ? AND created_at >= ?",
+            (key, time.time() - self.cache_ttl)
+        ).fetchone()
+        return row[0] if row else None
+    
+    def _set_cached_response(self, key: str, response: str):
+        """LLM 응답 캐시 저장"""
+        self._cache.execute(
+            "INSERT OR REPLACE INTO cache(key, response, created_at) VALUES (?, ?, ?)",
+            (key, response, time.time())
+        )
+        self._cache.commit()
+    
+    async def _load_cached_response(self, key: str) -> Optional[str]:
+        """캐시된 LLM 응답 조회 (캐시 오류 시 None)"""
+        try:
+            async with self._cache_lock:
+                return await asyncio.to_thread(self._get_cached_response, key)
+        except sqlite3.Error as e:
+            logger.warning("LLM 응답 캐시 조회 실패", error=str(e))
+            return None
+    
+    async def _store_cached_response(self, key: str, response: str):
+        """LLM 응답 캐시 저장 (캐시 오류는 무시)"""
+        try:
+            async with self._cache_lock:
+                await asyncio.to_thread(self._set_cached_response, key, response)
+        except sqlite3.Error as e:
+            logger.warning("LLM 응답 캐시 저장 실패", error=str(e))
+    
     async def _call_ollama_api(self, system_prompt: str, user_prompt: str) -> str:
-        """OLLAMA API 호출"""
+        """OLLAMA API 호출 (응답 캐시 우선 조회)"""
+        if self._cache is None:
+            return await self._request_ollama_api(system_prompt, user_prompt)
+        
+        key = self._cache_key(system_prompt, user_prompt)
+        cached = await self._load_cached_response(key)
+        if cached:
+            logger.info("LLM 응답 캐시 적중", cache_key=key[:16])
+            return cached
+        
+        response = await self._request_ollama_api(system_prompt, user_prompt)
+        await self._store_cached_response(key, response)
+        
+        return response
+    
+    async def _request_ollama_api(self, system_prompt: str, user_prompt: str) -> str:
+        """OLLAMA API 요청"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                payload = {
-                    "model": self.model_name,
-                    "messages": [
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    "stream": False
-                }
+            payload = {
+                "model": self.model_name,
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                "stream": False
+            }
+            
+            response = await self.client.post("/api/chat", json=payload)
+            response.raise_for_status()
+            
+            result = response.json()
                 
-                response = await client.post(
-                    f"{self.ollama_url}/api/chat",
-                    json=payload
-                )
+        except httpx.TimeoutException:
+            logger.error("OLLAMA API 타임아웃")
+            raise Exception("LLM 응답 시간이 초과되었습니다. 잠시 후 다시 시도해주세요.")
+        except httpx.HTTPStatusError as e:
+            logger.error("OLLAMA API HTTP 오류", status_code=e.response.status_code)
+            raise Exception("LLM 서비스에 일시적인 문제가 발생했습니다.")
+        except Exception as e:
+            logger.error("OLLAMA API 호출 실패", error=str(e))
+            raise Exception("LLM 서비스 연결에 실패했습니다.")
+        
+        # 응답 본문이 없으면 오류로 처리 (대체 문구가 캐시되어 재사용되지 않도록)
+        content = (result.get('message') or {}).get('content')
+        if not content:
+            logger.error("OLLAMA API 응답 내용 없음")
+            raise Exception("LLM이 응답을 생성하지 못했습니다. 잠시 후 다시 시도해주세요.")
+        
+        return content
+
+    async def _stream_ollama_api(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        stream_state: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """
+        OLLAMA API 스트리밍 호출 (NDJSON 응답을 토큰 단위로 반환)
+        
+        stream_state가 주어지면 완료 신호 수신 여부를 "done" 키에 기록합니다.
+        """
+        payload = {
+            "model": self.model_name,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            "stream": True
+        }
+        
+        try:
+            async with self.client.stream("POST", "/api/chat", json=payload) as response:
                 response.raise_for_status()
                 
-                result = response.json()
-                return result.get('message', {}).get('content', '응답을 생성할 수 없습니다.')
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    
+                    data = orjson.loads(line)
+                    content = data.get('message', {}).get('content')
+                    if content:
+                        yield content
+                    if data.get('done'):
+                        if stream_state is not None:
+                            stream_state["done"] = True
+                        break
                 
         except httpx.TimeoutException:
             logger.error("OLLAMA API 타임아웃")
@@ -160,26 +351,40 @@ class LLMService:
             logger.error("OLLAMA API HTTP 오류", status_code=e.response.status_code)
             raise Exception("LLM 서비스에 일시적인 문제가 발생했습니다.")
         except Exception as e:
-            logger.error("OLLAMA API 호출 실패", error=str(e))
+            logger.error("OLLAMA API 스트리밍 호출 실패", error=str(e))
             raise Exception("LLM 서비스 연결에 실패했습니다.")
 
     async def validate_model_availability(self) -> bool:
         """LLM 모델 사용 가능 여부 확인"""
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self.ollama_url}/api/tags")
-                response.raise_for_status()
-                
-                models = response.json().get('models', [])
-                available_models = [model.get('name') for model in models]
-                
-                is_available = self.model_name in available_models
-                logger.info("LLM 모델 가용성 확인", 
-                           model=self.model_name, 
-                           available=is_available)
-                
-                return is_available
+            response = await self.client.get("/api/tags", timeout=5.0)
+            response.raise_for_status()
+            
+            models = response.json().get('models', [])
+            available_models = [model.get('name') for model in models]
+            
+            is_available = self.model_name in available_models
+            logger.info("LLM 모델 가용성 확인", 
+                       model=self.model_name, 
+                       available=is_available)
+            
+            return is_available
                 
         except Exception as e:
             logger.error("LLM 모델 가용성 확인 실패", error=str(e))
             return False
+    
+    async def refresh_availability(self) -> bool:
+        """LLM 모델 가용성을 확인하고 결과를 캐시"""
+        is_available = await self.validate_model_availability()
+        
+        self.is_available = is_available
+        self.availability_checked_at = datetime.utcnow()
+        
+        return is_available
+    
+    async def monitor_availability(self, interval_seconds: float):
+        """LLM 모델 가용성 주기적 갱신 루프 (애플리케이션 시작 시 백그라운드 실행)"""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            await self.refresh_availability()
@@ -1,10 +1,17 @@
 import os
 import asyncio
+import hashlib
+import shutil
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Tuple
 import joblib
 import numpy as np
+import orjson
 import structlog
+import xgboost as xgb
 
 from app.config.settings import settings
 from app.models.internal_models import (
@@ -15,40 +22,123 @@ from app.models.internal_models import (
 
 logger = structlog.get_logger()
 
+# 프로세스 단위 Booster 캐시 (서비스 재생성/재로딩 시 모델 파일 재파싱 방지)
+_BOOSTER_CACHE: Dict[str, xgb.Booster] = {}
+_BOOSTER_LOCK = threading.Lock()
+
+# 동시 예측 요청 마이크로 배치 설정
+PREDICT_BATCH_WINDOW_SECONDS = 0.005  # 첫 요청 이후 추가 요청을 모으는 시간
+PREDICT_MAX_BATCH_SIZE = 32           # 한 번에 묶는 최대 요청 수
+PREDICT_MIN_CHUNK_ROWS = 64           # 배치를 예측 스레드에 나눌 때 청크당 최소 행 수
+
+# 모델 버전 (양자화 재학습 모델은 예측 결과가 다르므로 접미사로 구분)
+MODEL_VERSION = "xgb_gpu_single_v1.0"
+QUANTIZED_MODEL_VERSION_SUFFIX = "_q64"  # max_bin=64 재학습 모델 (final_xgb_gpu_single_int8.ubj)
+
+# 동일 특성 재분석 시 예측 결과 재사용 (LRU)
+PREDICTION_CACHE_MAX_SIZE = 1024
+
+
+def _stage_model_file(path: str) -> str:
+    """
+    모델 파일을 공유 메모리 디렉터리(/dev/shm 등)로 복사하여 경로 반환
+    
+    여러 워커가 디스크 대신 페이지 캐시에 올라간 동일 파일에서 로딩하도록 합니다.
+    """
+    cache_dir = settings.model_cache_dir
+    if not cache_dir:
+        return path
+    
+    staged_path = os.path.join(cache_dir, os.path.basename(path))
+    try:
+        if not os.path.exists(staged_path):
+            os.makedirs(cache_dir, exist_ok=True)
+            # 다른 워커가 복사 중인 파일을 읽지 않도록 임시 파일에 쓴 뒤 원자적으로 교체
+            tmp_path = f"{staged_path}.{os.getpid()}.tmp"
+            shutil.copyfile(path, tmp_path)
+            os.replace(tmp_path, staged_path)
+        return staged_path
+    except OSError as e:
+        logger.warning(f"모델 파일 공유 메모리 복사 실패, 원본 경로 사용: {str(e)}")
+        return path
+
+
+def _read_json_file(path: str) -> Any:
+    """JSON 파일 읽기 (orjson 사용)"""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
 
 class ModelService:
     """ML 모델 서비스"""
     
     def __init__(self):
         self.sleep_stage_model = None
+        self._booster: Optional[xgb.Booster] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._predict_workers = 1
+        self._predict_queue: Optional[asyncio.Queue] = None
+        self._batch_task: Optional[asyncio.Task] = None
+        self._running_batches: set = set()
+        self._prediction_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
         self.preprocessing_params = None
         self.model_metadata = {}
         self._is_ready = False
+        self._is_loading = False
+    
+    @staticmethod
+    def _model_file_paths() -> Tuple[str, str, str]:
+        """모델 파일 후보 경로 반환 (joblib 원본, UBJSON 변환본, 양자화 재학습 UBJSON)"""
+        model_path = os.path.join(settings.model_path, "final_xgb_gpu_single.joblib")
+        ubj_path = os.path.join(settings.model_path, "final_xgb_gpu_single.ubj")
+        quantized_path = os.path.join(settings.model_path, "final_xgb_gpu_single_int8.ubj")
+        return model_path, ubj_path, quantized_path
+    
+    def check_model_files(self):
+        """모델 파일 존재 확인 (가중치 로딩 없이, 지연 로딩 시 시작 단계 검증용)"""
+        model_path, ubj_path, quantized_path = self._model_file_paths()
+        if not any(os.path.exists(path) for path in (quantized_path, ubj_path, model_path)):
+            raise FileNotFoundError(f"모델 파일을 찾을 수 없습니다: {model_path}")
         
     async def load_models(self):
         """모델 로딩"""
+        self._is_loading = True
         try:
             logger.info("ML 모델 로딩 시작...")
             
-            # 실제 모델 파일 경로
-            model_path = os.path.join(settings.model_path, "final_xgb_gpu_single.joblib")
+            # 실제 모델 파일 경로 (변환된 UBJSON 모델, 양자화 재학습 모델 우선)
+            model_path, ubj_path, quantized_path = self._model_file_paths()
             feature_meta_path = os.path.join(settings.model_path, "feature_meta_single.json")
-            model_config_path = os.path.join(settings.model_path, "final_xgb_gpu_single.json")
             
             # 모델 파일 존재 확인
-            if not os.path.exists(model_path):
-                raise FileNotFoundError(f"모델 파일을 찾을 수 없습니다: {model_path}")
+            self.check_model_files()
             
             # XGBoost 모델 로딩 (비동기적으로 실행)
-            self.sleep_stage_model = await asyncio.get_event_loop().run_in_executor(
-                None, joblib.load, model_path
+            # sklearn 래퍼 대신 내부 Booster로 직접 예측 (DMatrix 1회 생성, 트리 1회 순회)
+            self._booster, loaded_path = await asyncio.get_event_loop().run_in_executor(
+                None, self._load_booster, model_path, ubj_path, quantized_path
             )
+            self.sleep_stage_model = self._booster
+            model_path = loaded_path
+            
+            # 예측 전용 스레드풀 (기본 executor를 쓰는 DB/IO 작업과 대기열 분리)
+            # 배치를 행 청크로 나눠 스레드 단위로 병렬화하므로 청크 예측 1건은 단일 스레드로 실행
+            self._booster.set_param({"nthread": 1})
+            if self._executor is None:
+                self._predict_workers = settings.model_inference_workers or os.cpu_count() or 1
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._predict_workers,
+                    thread_name_prefix="xgb-predict"
+                )
+            
+            # 동시 예측 요청을 묶어 처리하는 배치 루프 시작
+            if self._batch_task is None:
+                self._predict_queue = asyncio.Queue()
+                self._batch_task = asyncio.create_task(self._batch_loop())
             
             # 특성 메타데이터 로딩
             if os.path.exists(feature_meta_path):
-                import json
-                with open(feature_meta_path, 'r', encoding='utf-8') as f:
-                    feature_meta = json.load(f)
+                feature_meta = await asyncio.to_thread(_read_json_file, feature_meta_path)
                 self.preprocessing_params = {
                     "feature_meta": feature_meta,
                     "scaler": None  # 필요시 별도 로딩
@@ -59,28 +149,71 @@ class ModelService:
                 self.preprocessing_params = self._get_default_preprocessing_params()
             
             # 모델 설정 로딩
-            if os.path.exists(model_config_path):
-                import json
-                with open(model_config_path, 'r', encoding='utf-8') as f:
-                    model_config = json.load(f)
-                self.model_metadata = {
-                    "model_version": "xgb_gpu_single_v1.0",
-                    "class_names": ["Wake", "N1", "N2", "N3", "REM"],
-                    "training_date": model_config.get("training_date", "unknown"),
-                    "model_config": model_config,
-                    "model_type": "XGBoost"
-                }
-                logger.info("모델 설정 로딩 완료")
-            else:
-                self.model_metadata = self._get_default_metadata()
+            # (final_xgb_gpu_single.json은 수십 MB의 전체 트리 덤프이므로 파싱하지 않고
+            #  로딩된 Booster의 학습 설정만 사용)
+            model_config = orjson.loads(self._booster.save_config())
+            
+            # 실제로 로딩한 모델 파일 기준 버전 (분석 기록/모델 정보에서 모델 구분)
+            model_version = MODEL_VERSION
+            if loaded_path == quantized_path:
+                model_version += QUANTIZED_MODEL_VERSION_SUFFIX
+            
+            self.model_metadata = {
+                "model_version": model_version,
+                "model_path": loaded_path,
+                "class_names": ["Wake", "N1", "N2", "N3", "REM"],
+                "training_date": self._booster.attr("training_date") or "unknown",
+                "model_config": model_config,
+                "model_type": "XGBoost"
+            }
+            logger.info("모델 설정 로딩 완료")
             
             self._is_ready = True
-            logger.info(f"XGBoost 모델 로딩 완료: {model_path}")
+            logger.info(
+                "XGBoost 모델 로딩 완료",
+                model_path=loaded_path,
+                model_version=model_version
+            )
             
         except Exception as e:
             logger.error(f"모델 로딩 중 오류: {str(e)}")
             self._is_ready = False
             raise
+        finally:
+            self._is_loading = False
+    
+    def _load_booster(
+        self,
+        model_path: str,
+        ubj_path: str,
+        quantized_path: str
+    ) -> Tuple[xgb.Booster, str]:
+        """UBJSON 모델 우선 로딩, 없으면 joblib 모델을 로딩하여 UBJSON으로 변환 저장"""
+        with _BOOSTER_LOCK:
+            for path in (quantized_path, ubj_path):
+                if not os.path.exists(path):
+                    continue
+                
+                booster = _BOOSTER_CACHE.get(path) if settings.enable_model_caching else None
+                if booster is None:
+                    booster = xgb.Booster()
+                    booster.load_model(_stage_model_file(path))
+                    if settings.enable_model_caching:
+                        _BOOSTER_CACHE[path] = booster
+                return booster, path
+            
+            booster = joblib.load(model_path).get_booster()
+            
+            # 다음 시작부터는 피클 역직렬화 없이 UBJSON으로 로딩
+            try:
+                booster.save_model(ubj_path)
+                logger.info(f"UBJSON 모델 저장 완료: {ubj_path}")
+                if settings.enable_model_caching:
+                    _BOOSTER_CACHE[ubj_path] = booster
+            except Exception as e:
+                logger.warning(f"UBJSON 모델 저장 실패: {str(e)}")
+            
+            return booster, model_path
     
     async def predict_sleep_stages(
         self, 
@@ -96,36 +229,16 @@ class ModelService:
             # 특성 데이터 준비
             features = self._prepare_features(processed_data)
             
-            # 모델 예측 (비동기적으로 실행)
-            predictions = await asyncio.get_event_loop().run_in_executor(
-                None, self.sleep_stage_model.predict, features
-            )
+            # 모델 예측 (동일 특성은 캐시 재사용, 그 외에는 동시 요청과 묶어 한 번에 계산)
+            cache_key = self._prediction_cache_key(features)
+            probabilities = self._get_cached_prediction(cache_key)
+            if probabilities is None:
+                probabilities = await self._predict_batched(features)
+                self._set_cached_prediction(cache_key, probabilities)
+            else:
+                logger.info("예측 결과 캐시 적중")
             
-            # 확률 예측 (XGBoost의 경우 predict_proba 확인)
-            try:
-                if hasattr(self.sleep_stage_model, 'predict_proba'):
-                    probabilities = await asyncio.get_event_loop().run_in_executor(
-                        None, self.sleep_stage_model.predict_proba, features
-                    )
-                else:
-                    # XGBoost classifier의 경우 predict_proba 대신 predict 사용하여 확률 얻기
-                    probabilities = await asyncio.get_event_loop().run_in_executor(
-                        None, lambda x: self.sleep_stage_model.predict(x, output_margin=False), features
-                    )
-                    # 단일 값인 경우 더미 확률 생성
-                    if probabilities.ndim == 1:
-                        n_classes = len(self.model_metadata.get("class_names", ["Wake", "N1", "N2", "N3", "REM"]))
-                        dummy_probs = np.zeros((len(predictions), n_classes))
-                        for i, pred in enumerate(predictions):
-                            dummy_probs[i, int(pred)] = 1.0  # 예측된 클래스에 100% 확률
-                        probabilities = dummy_probs
-            except Exception as prob_error:
-                logger.warning(f"확률 예측 실패, 더미 확률 사용: {str(prob_error)}")
-                # 더미 확률 생성
-                n_classes = len(self.model_metadata.get("class_names", ["Wake", "N1", "N2", "N3", "REM"]))
-                probabilities = np.zeros((len(predictions), n_classes))
-                for i, pred in enumerate(predictions):
-                    probabilities[i, int(pred)] = 1.0
+            predictions = np.argmax(probabilities, axis=1)
             
             # 신뢰도 점수 계산
             confidence_scores = np.max(probabilities, axis=1).tolist()
@@ -148,17 +261,119 @@ class ModelService:
             logger.error(f"수면 단계 예측 중 오류: {str(e)}")
             raise
     
+    @staticmethod
+    def _prediction_cache_key(features: np.ndarray) -> str:
+        """특성 행렬 내용 기반 캐시 키 생성"""
+        digest = hashlib.sha256(features.tobytes())
+        digest.update(str(features.shape).encode())
+        return digest.hexdigest()
+    
+    def _get_cached_prediction(self, key: str) -> Optional[np.ndarray]:
+        """캐시된 예측 확률 조회"""
+        if not settings.enable_model_caching:
+            return None
+        
+        probabilities = self._prediction_cache.get(key)
+        if probabilities is not None:
+            self._prediction_cache.move_to_end(key)
+        return probabilities
+    
+    def _set_cached_prediction(self, key: str, probabilities: np.ndarray):
+        """예측 확률 캐시 저장 (가장 오래된 항목부터 제거)"""
+        if not settings.enable_model_caching:
+            return
+        
+        # 배치 결과 전체를 참조하는 뷰 대신 복사본을 읽기 전용으로 저장
+        cached = probabilities.copy()
+        cached.setflags(write=False)
+        self._prediction_cache[key] = cached
+        if len(self._prediction_cache) > PREDICTION_CACHE_MAX_SIZE:
+            self._prediction_cache.popitem(last=False)
+    
+    async def _predict_batched(self, features: np.ndarray) -> np.ndarray:
+        """배치 루프에 예측을 요청하고 해당 요청분의 확률 행렬을 반환"""
+        future = asyncio.get_running_loop().create_future()
+        await self._predict_queue.put((features, future))
+        return await future
+    
+    async def _batch_loop(self):
+        """대기 중인 예측 요청을 짧은 시간 창 단위로 모아 한 번의 Booster 예측으로 처리"""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            items = [await self._predict_queue.get()]
+            deadline = loop.time() + PREDICT_BATCH_WINDOW_SECONDS
+            
+            while len(items) < PREDICT_MAX_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(
+                        await asyncio.wait_for(self._predict_queue.get(), timeout)
+                    )
+                except asyncio.TimeoutError:
+                    break
+            
+            # 배치 예측은 executor에서 병렬로 진행되도록 완료를 기다리지 않고 다음 배치 수집
+            task = asyncio.create_task(self._run_batch(items))
+            self._running_batches.add(task)
+            task.add_done_callback(self._running_batches.discard)
+    
+    async def _run_batch(self, items: List[Tuple[np.ndarray, asyncio.Future]]):
+        """
+        묶인 특성 행렬을 예측하고 요청별로 결과 분배
+        
+        Booster는 단일 스레드로 설정되어 있으므로, 행렬을 행 청크로 나눠
+        예측 스레드풀 전체에서 동시에 예측한 뒤 이어 붙입니다.
+        """
+        features_list = [features for features, _ in items]
+        loop = asyncio.get_running_loop()
+        
+        try:
+            stacked = np.vstack(features_list)
+            n_chunks = max(1, min(self._predict_workers, len(stacked) // PREDICT_MIN_CHUNK_ROWS))
+            chunk_probabilities = await asyncio.gather(*(
+                loop.run_in_executor(self._executor, self._predict_probabilities, chunk)
+                for chunk in np.array_split(stacked, n_chunks)
+            ))
+            probabilities = np.concatenate(chunk_probabilities)
+        except Exception as e:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        split_indices = np.cumsum([len(features) for features in features_list])[:-1]
+        for (_, future), request_probabilities in zip(items, np.split(probabilities, split_indices)):
+            if not future.done():
+                future.set_result(request_probabilities)
+    
+    def _predict_probabilities(self, features: np.ndarray) -> np.ndarray:
+        """Booster 예측으로 클래스별 확률 행렬 반환"""
+        probabilities = self._booster.predict(xgb.DMatrix(features))
+        
+        # multi:softmax 목적함수 모델은 클래스 인덱스를 반환하므로 원-핫 확률로 변환
+        if probabilities.ndim == 1:
+            n_classes = len(self.model_metadata.get("class_names", ["Wake", "N1", "N2", "N3", "REM"]))
+            probabilities = np.eye(n_classes)[probabilities.astype(int)]
+        
+        return probabilities
+    
     def _prepare_features(self, processed_data: ProcessedSensorData) -> np.ndarray:
         """특성 데이터 준비"""
         try:
             # 이미 전처리에서 모델에 맞는 6개 특성으로 변환됨
-            features = np.array(processed_data.accelerometer_features)
+            # (XGBoost 내부 표현과 같은 float32 연속 배열로 변환하여 추가 복사 방지)
+            features = np.ascontiguousarray(
+                processed_data.accelerometer_features, dtype=np.float32
+            )
             
             logger.debug(f"준비된 특성 형태: {features.shape}")
             
-            # 특성 수 확인 (6개여야 함)
-            if features.shape[1] != 6:
-                logger.warning(f"예상과 다른 특성 수: {features.shape[1]} (예상: 6)")
+            # 특성 형태 확인 (구간 수 x 6개 특성)
+            if features.ndim != 2 or features.shape[1] != 6:
+                raise ValueError(f"예상과 다른 특성 형태: {features.shape} (예상: (N, 6))")
             
             return features
             
@@ -176,16 +391,6 @@ class ModelService:
             "normalization": "z-score"
         }
     
-    def _get_default_metadata(self) -> Dict[str, Any]:
-        """기본 메타데이터"""
-        return {
-            "model_version": "xgb_gpu_single_v1.0",
-            "class_names": ["Wake", "N1", "N2", "N3", "REM"],
-            "training_date": "unknown",
-            "model_type": "XGBoost",
-            "accuracy": 0.0
-        }
-    
     def get_model_version(self) -> str:
         """모델 버전 반환"""
         return self.model_metadata.get("model_version", "unknown")
@@ -194,6 +399,10 @@ class ModelService:
         """모델 준비 상태 확인"""
         return self._is_ready
     
+    def is_loading(self) -> bool:
+        """모델 로딩 진행 중 여부 확인"""
+        return self._is_loading
+    
     async def get_model_info(self) -> Dict[str, Any]:
         """모델 정보 반환"""
         return {
@@ -208,6 +417,15 @@ class ModelService:
         logger.info("모델 서비스 정리 중...")
         
         self.sleep_stage_model = None
+        self._booster = None
+        if self._batch_task is not None:
+            self._batch_task.cancel()
+            self._batch_task = None
+            self._predict_queue = None
+        self._prediction_cache.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
         self.preprocessing_params = None
         self.model_metadata = {}
         self._is_ready = False
@@ -221,13 +439,13 @@ class ModelService:
                 return False
             
             # 간단한 더미 데이터로 예측 테스트 (6개 특성)
-            dummy_features = np.random.randn(1, 6)
+            dummy_features = np.random.randn(1, 6).astype(np.float32)
             
-            prediction = await asyncio.get_event_loop().run_in_executor(
-                None, self.sleep_stage_model.predict, dummy_features
+            probabilities = await asyncio.get_running_loop().run_in_executor(
+                self._executor, self._predict_probabilities, dummy_features
             )
             
-            return len(prediction) == 1
+            return len(probabilities) == 1
             
         except Exception as e:
             logger.error(f"모델 헬스체크 실패: {str(e)}")
@@ -1,7 +1,9 @@
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import uuid
+import numpy as np
 import structlog
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app.models.internal_models import ModelPrediction
@@ -19,12 +21,21 @@ from app.config.settings import settings
 
 logger = structlog.get_logger()
 
+# 단계 값 <-> SleepStage (구간마다 Enum 조회/.value 접근을 반복하지 않도록 미리 구성)
+_STAGE_BY_VALUE = {stage.value: stage for stage in SleepStage}
+_VALUE_BY_STAGE = {stage: stage.value for stage in SleepStage}
+
+# 요약 통계의 단계 순서 (단계 값 -> 배열 인덱스)
+_STAGE_INDEX = {"Wake": 0, "N1": 1, "N2": 2, "N3": 3, "REM": 4}
+
 
 class PostprocessorService:
     """수면 분석 결과 후처리 서비스"""
     
     def __init__(self):
         self.stage_interval_seconds = settings.stage_interval_seconds
+        # 구간 길이 (시각 계산 시 매번 timedelta를 생성하지 않도록 캐시)
+        self._interval_td = timedelta(seconds=self.stage_interval_seconds)
     
     async def format_analysis_response(
         self,
@@ -34,232 +45,218 @@ class PostprocessorService:
         recording_end: datetime,
         predictions: ModelPrediction,
         model_version: str,
-        data_quality_score: float
+        data_quality_score: float,
+        analysis_timestamp: Optional[datetime] = None
     ) -> SleepAnalysisResponse:
-        """분석 결과를 응답 형식으로 변환"""
+        """
+        분석 결과를 응답 형식으로 변환
+        
+        analysis_timestamp를 전달하면 DB 기록과 같은 분석 시각을 사용합니다 (없으면 현재 시각).
+        """
         try:
             logger.info("분석 결과 후처리 시작", analysis_id=analysis_id)
             
+            # 구간 경계 시각 (구간 생성과 확률 생성에서 공유)
+            epoch_count = max(
+                len(predictions.predictions or ()), len(predictions.probabilities or ())
+            )
+            boundaries = self._epoch_boundaries(recording_start, epoch_count)
+            
             # 수면 단계 구간 생성
-            stage_intervals = await self._create_stage_intervals(
-                recording_start, predictions
+            stage_intervals = self._create_stage_intervals(
+                boundaries, predictions
             )
             
             # 시간대별 확률 생성
-            stage_probabilities = await self._create_stage_probabilities(
-                recording_start, predictions
+            stage_probabilities = self._create_stage_probabilities(
+                boundaries, predictions
             )
             
             # 요약 통계 계산
-            summary_statistics = await self._calculate_summary_statistics(
-                stage_intervals, recording_start, recording_end
+            summary_statistics = self._calculate_summary_statistics(
+                predictions, recording_start, recording_end
             )
             
-            response = SleepAnalysisResponse(
-                user_id=user_id,
+            # 하위 모델이 이미 구성되어 있으므로 구간/확률 목록 전체에 대한 재검증 생략
+            response = SleepAnalysisResponse.model_construct(
+                user_id=str(user_id),
                 analysis_id=analysis_id,
-                analysis_timestamp=datetime.utcnow(),
+                analysis_timestamp=analysis_timestamp or datetime.utcnow(),
                 recording_start=recording_start,
                 recording_end=recording_end,
                 stage_intervals=stage_intervals,
                 stage_probabilities=stage_probabilities,
                 summary_statistics=summary_statistics,
                 model_version=model_version,
-                data_quality_score=data_quality_score
+                data_quality_score=float(data_quality_score)
             )
             
             logger.info("분석 결과 후처리 완료", analysis_id=analysis_id)
             return response
             
         except Exception as e:
-            logger.error(f"분석 결과 후처리 중 오류: {str(e)}")
+            logger.error("분석 결과 후처리 중 오류", analysis_id=analysis_id, error=str(e))
             raise
     
-    async def _create_stage_intervals(
+    def _epoch_boundaries(self, recording_start: datetime, epoch_count: int) -> List[datetime]:
+        """구간 경계 시각 목록 (i번째 값은 i번째 구간의 시작 시각, 길이 epoch_count + 1)"""
+        return [recording_start + self._interval_td * i for i in range(epoch_count + 1)]
+    
+    def _create_stage_intervals(
         self,
-        recording_start: datetime,
+        boundaries: List[datetime],
         predictions: ModelPrediction
     ) -> List[SleepStageInterval]:
-        """수면 단계 구간 생성"""
-        try:
-            intervals = []
-            
-            if not predictions.predictions:
-                return intervals
-            
-            current_stage = predictions.predictions[0]
-            current_start = recording_start
-            current_confidence_sum = predictions.confidence_scores[0]
-            current_count = 1
-            
-            for i in range(1, len(predictions.predictions)):
-                stage = predictions.predictions[i]
-                confidence = predictions.confidence_scores[i]
-                
-                if stage == current_stage:
-                    # 같은 단계 계속
-                    current_confidence_sum += confidence
-                    current_count += 1
-                else:
-                    # 단계 변경 -> 이전 구간 완료
-                    interval_end = recording_start + timedelta(
-                        seconds=i * self.stage_interval_seconds
-                    )
-                    
-                    avg_confidence = current_confidence_sum / current_count
-                    
-                    intervals.append(SleepStageInterval(
-                        start_time=current_start,
-                        end_time=interval_end,
-                        stage=SleepStage(current_stage),
-                        confidence=avg_confidence
-                    ))
-                    
-                    # 새 구간 시작
-                    current_stage = stage
-                    current_start = interval_end
-                    current_confidence_sum = confidence
-                    current_count = 1
-            
-            # 마지막 구간 처리
-            if current_count > 0:
-                interval_end = recording_start + timedelta(
-                    seconds=len(predictions.predictions) * self.stage_interval_seconds
-                )
-                
-                avg_confidence = current_confidence_sum / current_count
-                
-                intervals.append(SleepStageInterval(
-                    start_time=current_start,
-                    end_time=interval_end,
-                    stage=SleepStage(current_stage),
-                    confidence=avg_confidence
-                ))
-            
-            logger.debug(f"수면 단계 구간 생성 완료: {len(intervals)}개 구간")
-            return intervals
-            
-        except Exception as e:
-            logger.error(f"수면 단계 구간 생성 중 오류: {str(e)}")
-            raise
+        """수면 단계 구간 생성 (boundaries: _epoch_boundaries 결과)"""
+        if not predictions.predictions:
+            return []
+        
+        # 연속된 같은 단계를 하나의 구간으로 묶음 (run-length encoding)
+        _, starts, ends = self._stage_runs(predictions.predictions)
+        confidences = np.asarray(predictions.confidence_scores, dtype=np.float64)
+        
+        # 구간별 평균 신뢰도
+        avg_confidences = np.add.reduceat(confidences, starts) / (ends - starts)
+        
+        # 직접 계산한 값이므로 Pydantic 검증 생략
+        intervals = [
+            SleepStageInterval.model_construct(
+                start_time=boundaries[start],
+                end_time=boundaries[end],
+                stage=_STAGE_BY_VALUE[predictions.predictions[start]],
+                confidence=confidence
+            )
+            for start, end, confidence in zip(
+                starts.tolist(), ends.tolist(), avg_confidences.tolist()
+            )
+        ]
+        
+        logger.debug("수면 단계 구간 생성 완료", interval_count=len(intervals))
+        return intervals
     
-    async def _create_stage_probabilities(
+    @staticmethod
+    def _stage_runs(stage_values: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """연속된 같은 단계 구간 계산 (단계 배열, 구간 시작 인덱스, 구간 끝 인덱스)"""
+        stages = np.asarray(stage_values)
+        if stages.size == 0:
+            empty = np.empty(0, dtype=np.intp)
+            return stages, empty, empty
+        
+        change_idx = np.flatnonzero(stages[1:] != stages[:-1]) + 1
+        starts = np.concatenate(([0], change_idx))
+        ends = np.concatenate((change_idx, [len(stages)]))
+        return stages, starts, ends
+    
+    def _create_stage_probabilities(
         self,
-        recording_start: datetime,
+        boundaries: List[datetime],
         predictions: ModelPrediction
     ) -> List[StageProbabilities]:
-        """시간대별 수면 단계 확률 생성"""
-        try:
-            probabilities = []
-            
-            class_names = ["Wake", "N1", "N2", "N3", "REM"]
-            
-            for i, probs in enumerate(predictions.probabilities):
-                timestamp = recording_start + timedelta(
-                    seconds=i * self.stage_interval_seconds
-                )
-                
-                # 확률을 클래스 이름에 매핑
-                prob_dict = {}
-                for j, class_name in enumerate(class_names):
-                    prob_dict[class_name.lower()] = probs[j] if j < len(probs) else 0.0
-                
-                probabilities.append(StageProbabilities(
-                    timestamp=timestamp,
-                    wake=prob_dict.get('wake', 0.0),
-                    n1=prob_dict.get('n1', 0.0),
-                    n2=prob_dict.get('n2', 0.0),
-                    n3=prob_dict.get('n3', 0.0),
-                    rem=prob_dict.get('rem', 0.0)
-                ))
-            
-            logger.debug(f"시간대별 확률 생성 완료: {len(probabilities)}개 시점")
-            return probabilities
-            
-        except Exception as e:
-            logger.error(f"시간대별 확률 생성 중 오류: {str(e)}")
-            raise
+        """시간대별 수면 단계 확률 생성 (boundaries: _epoch_boundaries 결과)"""
+        if not predictions.probabilities:
+            return []
+        
+        # (구간 수 x 5) 행렬로 맞춘 뒤 열 단위로 한 번에 파이썬 float로 변환
+        # 열 순서: Wake, N1, N2, N3, REM (모자란 클래스는 0.0)
+        probs = np.asarray(predictions.probabilities, dtype=np.float64)
+        if probs.shape[1] < 5:
+            probs = np.pad(probs, ((0, 0), (0, 5 - probs.shape[1])))
+        wake, n1, n2, n3, rem = probs[:, :5].T.tolist()
+        
+        # 직접 계산한 값이므로 Pydantic 검증 생략
+        probabilities = [
+            StageProbabilities.model_construct(
+                timestamp=timestamp,
+                wake=wake_prob,
+                n1=n1_prob,
+                n2=n2_prob,
+                n3=n3_prob,
+                rem=rem_prob
+            )
+            for timestamp, wake_prob, n1_prob, n2_prob, n3_prob, rem_prob in zip(
+                boundaries, wake, n1, n2, n3, rem
+            )
+        ]
+        
+        logger.debug("시간대별 확률 생성 완료", probability_count=len(probabilities))
+        return probabilities
     
-    async def _calculate_summary_statistics(
+    def _calculate_summary_statistics(
         self,
-        stage_intervals: List[SleepStageInterval],
+        predictions: ModelPrediction,
         recording_start: datetime,
         recording_end: datetime
     ) -> SleepSummaryStatistics:
-        """수면 요약 통계 계산"""
-        try:
-            # 각 단계별 시간 계산 (분 단위)
-            stage_durations = {
-                "Wake": 0,
-                "N1": 0,
-                "N2": 0,
-                "N3": 0,
-                "REM": 0
-            }
-            
-            for interval in stage_intervals:
-                duration_seconds = (interval.end_time - interval.start_time).total_seconds()
-                duration_minutes = int(duration_seconds / 60)
-                stage_durations[interval.stage.value] += duration_minutes
-            
-            # 총 기록 시간
-            total_recording_time = int((recording_end - recording_start).total_seconds() / 60)
-            
-            # 총 수면 시간 (각성 제외)
-            total_sleep_time = sum(
-                duration for stage, duration in stage_durations.items() 
-                if stage != "Wake"
+        """수면 요약 통계 계산 (구간 객체 대신 예측 배열의 구간 길이로 계산)"""
+        stages, starts, ends = self._stage_runs(predictions.predictions)
+        run_stages = stages[starts]
+        is_wake = run_stages == "Wake"
+        
+        # 구간별 시간 (분 단위, 구간마다 버림, 정수 연산)
+        run_minutes = (ends - starts) * self.stage_interval_seconds // 60
+        
+        # 각 단계별 시간 계산 (분 단위, _STAGE_INDEX 순서)
+        run_codes = np.fromiter(
+            (_STAGE_INDEX[stage] for stage in run_stages.tolist()),
+            dtype=np.intp,
+            count=len(run_stages)
+        )
+        stage_durations = np.bincount(
+            run_codes, weights=run_minutes, minlength=len(_STAGE_INDEX)
+        ).astype(np.int64).tolist()
+        wake_time, n1_time, n2_time, n3_time, rem_time = stage_durations
+        
+        # 총 기록 시간
+        total_recording_time = int((recording_end - recording_start).total_seconds() / 60)
+        
+        # 총 수면 시간 (각성 제외)
+        total_sleep_time = int(run_minutes.sum()) - wake_time
+        
+        # 수면 효율성
+        sleep_efficiency = total_sleep_time / total_recording_time if total_recording_time > 0 else 0.0
+        
+        # 수면 개시 잠복기 (첫 번째 수면 단계까지의 시간)
+        # 수면 중 각성 시간 (첫 수면 이후의 각성 시간)
+        sleep_runs = np.flatnonzero(~is_wake)
+        if sleep_runs.size:
+            first_sleep_run = sleep_runs[0]
+            sleep_onset_latency = int(starts[first_sleep_run] * self.stage_interval_seconds // 60)
+            wake_after_sleep_onset = int(
+                run_minutes[first_sleep_run:][is_wake[first_sleep_run:]].sum()
             )
-            
-            # 수면 효율성
-            sleep_efficiency = total_sleep_time / total_recording_time if total_recording_time > 0 else 0.0
-            
-            # 수면 개시 잠복기 (첫 번째 수면 단계까지의 시간)
+        else:
             sleep_onset_latency = 0
-            for interval in stage_intervals:
-                if interval.stage.value != "Wake":
-                    sleep_onset_latency = int((interval.start_time - recording_start).total_seconds() / 60)
-                    break
-            
-            # 수면 중 각성 시간 (첫 수면 이후의 각성 시간)
             wake_after_sleep_onset = 0
-            sleep_started = False
-            
-            for interval in stage_intervals:
-                if interval.stage.value != "Wake":
-                    sleep_started = True
-                elif sleep_started and interval.stage.value == "Wake":
-                    duration_minutes = int((interval.end_time - interval.start_time).total_seconds() / 60)
-                    wake_after_sleep_onset += duration_minutes
-            
-            # 각 단계별 비율 계산
-            stage_percentages = {}
-            for stage, duration in stage_durations.items():
-                percentage = (duration / total_recording_time * 100) if total_recording_time > 0 else 0.0
-                stage_percentages[stage] = round(percentage, 1)
-            
-            return SleepSummaryStatistics(
-                total_sleep_time=total_sleep_time,
-                sleep_efficiency=round(sleep_efficiency, 3),
-                sleep_onset_latency=sleep_onset_latency,
-                wake_after_sleep_onset=wake_after_sleep_onset,
-                
-                wake_time=stage_durations["Wake"],
-                n1_time=stage_durations["N1"],
-                n2_time=stage_durations["N2"],
-                n3_time=stage_durations["N3"],
-                rem_time=stage_durations["REM"],
-                
-                wake_percentage=stage_percentages["Wake"],
-                n1_percentage=stage_percentages["N1"],
-                n2_percentage=stage_percentages["N2"],
-                n3_percentage=stage_percentages["N3"],
-                rem_percentage=stage_percentages["REM"]
-            )
-            
-        except Exception as e:
-            logger.error(f"요약 통계 계산 중 오류: {str(e)}")
-            raise
+        
+        # 각 단계별 비율 계산
+        if total_recording_time > 0:
+            stage_percentages = [
+                round(duration / total_recording_time * 100, 1)
+                for duration in stage_durations
+            ]
+        else:
+            stage_percentages = [0.0] * len(stage_durations)
+        wake_percentage, n1_percentage, n2_percentage, n3_percentage, rem_percentage = stage_percentages
+        
+        # 직접 계산한 값이므로 Pydantic 검증 생략
+        return SleepSummaryStatistics.model_construct(
+            total_sleep_time=total_sleep_time,
+            sleep_efficiency=round(sleep_efficiency, 3),
+            sleep_onset_latency=sleep_onset_latency,
+            wake_after_sleep_onset=wake_after_sleep_onset,
+            
+            wake_time=wake_time,
+            n1_time=n1_time,
+            n2_time=n2_time,
+            n3_time=n3_time,
+            rem_time=rem_time,
+            
+            wake_percentage=wake_percentage,
+            n1_percentage=n1_percentage,
+            n2_percentage=n2_percentage,
+            n3_percentage=n3_percentage,
+            rem_percentage=rem_percentage
+        )
     
     async def save_detailed_results(
         self,
@@ -279,29 +276,39 @@ class PostprocessorService:
             if not analysis:
                 raise ValueError(f"분석 레코드를 찾을 수 없습니다: {analysis_id}")
             
-            # 수면 단계 구간 저장
-            for interval in response.stage_intervals:
-                db_interval = DBSleepStageInterval(
-                    analysis_id=analysis.id,
-                    start_time=interval.start_time,
-                    end_time=interval.end_time,
-                    stage=interval.stage.value,
-                    confidence=interval.confidence
+            # 수면 단계 구간 저장 (ORM 객체 생성 없이 일괄 INSERT)
+            if response.stage_intervals:
+                db.execute(
+                    insert(DBSleepStageInterval),
+                    [
+                        {
+                            "analysis_id": analysis.id,
+                            "start_time": interval.start_time,
+                            "end_time": interval.end_time,
+                            "stage": _VALUE_BY_STAGE[interval.stage],
+                            "confidence": interval.confidence
+                        }
+                        for interval in response.stage_intervals
+                    ]
                 )
-                db.add(db_interval)
             
-            # 시간대별 확률 저장
-            for prob in response.stage_probabilities:
-                db_prob = DBStageProbability(
-                    analysis_id=analysis.id,
-                    timestamp=prob.timestamp,
-                    wake=prob.wake,
-                    n1=prob.n1,
-                    n2=prob.n2,
-                    n3=prob.n3,
-                    rem=prob.rem
+            # 시간대별 확률 저장 (ORM 객체 생성 없이 일괄 INSERT)
+            if response.stage_probabilities:
+                db.execute(
+                    insert(DBStageProbability),
+                    [
+                        {
+                            "analysis_id": analysis.id,
+                            "timestamp": prob.timestamp,
+                            "wake": prob.wake,
+                            "n1": prob.n1,
+                            "n2": prob.n2,
+                            "n3": prob.n3,
+                            "rem": prob.rem
+                        }
+                        for prob in response.stage_probabilities
+                    ]
                 )
-                db.add(db_prob)
             
             # 요약 통계 업데이트
             analysis.summary_statistics = response.summary_statistics.dict()
@@ -311,55 +318,73 @@ class PostprocessorService:
             logger.info("상세 분석 결과 저장 완료", analysis_id=analysis_id)
             
         except Exception as e:
-            logger.error(f"상세 분석 결과 저장 중 오류: {str(e)}")
+            logger.error("상세 분석 결과 저장 중 오류", analysis_id=analysis_id, error=str(e))
             db.rollback()
             raise
     
     async def get_detailed_analysis_result(
         self,
         db: Session,
-        analysis_id: str
+        analysis_id: str,
+        analysis: Optional[SleepAnalysis] = None
     ) -> SleepAnalysisResponse:
-        """데이터베이스에서 상세 분석 결과 조회"""
+        """
+        데이터베이스에서 상세 분석 결과 조회
+        
+        호출 측에서 이미 조회한 analysis를 전달하면 분석 레코드를 다시 조회하지 않습니다.
+        """
         try:
             # 기본 분석 정보 조회
-            analysis = db.query(SleepAnalysis).filter(
-                SleepAnalysis.analysis_id == analysis_id
-            ).first()
+            if analysis is None:
+                analysis = db.query(SleepAnalysis).filter(
+                    SleepAnalysis.analysis_id == analysis_id
+                ).first()
             
             if not analysis:
                 raise ValueError(f"분석 결과를 찾을 수 없습니다: {analysis_id}")
             
-            # 수면 단계 구간 조회
-            db_intervals = db.query(DBSleepStageInterval).filter(
+            # 수면 단계 구간 조회 (ORM 엔티티 대신 필요한 컬럼만 튜플로 조회)
+            db_intervals = db.query(
+                DBSleepStageInterval.start_time,
+                DBSleepStageInterval.end_time,
+                DBSleepStageInterval.stage,
+                DBSleepStageInterval.confidence
+            ).filter(
                 DBSleepStageInterval.analysis_id == analysis.id
             ).order_by(DBSleepStageInterval.start_time).all()
             
             stage_intervals = [
                 SleepStageInterval(
-                    start_time=interval.start_time,
-                    end_time=interval.end_time,
-                    stage=SleepStage(interval.stage),
-                    confidence=interval.confidence
+                    start_time=start_time,
+                    end_time=end_time,
+                    stage=_STAGE_BY_VALUE[stage],
+                    confidence=confidence
                 )
-                for interval in db_intervals
+                for start_time, end_time, stage, confidence in db_intervals
             ]
             
-            # 시간대별 확률 조회
-            db_probs = db.query(DBStageProbability).filter(
+            # 시간대별 확률 조회 (ORM 엔티티 대신 필요한 컬럼만 튜플로 조회)
+            db_probs = db.query(
+                DBStageProbability.timestamp,
+                DBStageProbability.wake,
+                DBStageProbability.n1,
+                DBStageProbability.n2,
+                DBStageProbability.n3,
+                DBStageProbability.rem
+            ).filter(
                 DBStageProbability.analysis_id == analysis.id
             ).order_by(DBStageProbability.timestamp).all()
             
             stage_probabilities = [
                 StageProbabilities(
-                    timestamp=prob.timestamp,
-                    wake=prob.wake,
-                    n1=prob.n1,
-                    n2=prob.n2,
-                    n3=prob.n3,
-                    rem=prob.rem
+                    timestamp=timestamp,
+                    wake=wake,
+                    n1=n1,
+                    n2=n2,
+                    n3=n3,
+                    rem=rem
                 )
-                for prob in db_probs
+                for timestamp, wake, n1, n2, n3, rem in db_probs
             ]
             
             # 요약 통계 복원
@@ -379,10 +404,10 @@ class PostprocessorService:
             )
             
         except Exception as e:
-            logger.error(f"상세 분석 결과 조회 중 오류: {str(e)}")
+            logger.error("상세 분석 결과 조회 중 오류", analysis_id=analysis_id, error=str(e))
             raise
     
-    async def apply_smoothing(
+    def apply_smoothing(
         self,
         predictions: List[str],
         window_size: int = 3
@@ -392,23 +417,35 @@ class PostprocessorService:
             if len(predictions) < window_size:
                 return predictions
             
-            smoothed = predictions.copy()
+            # 중심 기준 좌우 half개씩 포함하는 윈도우 (길이 2 * half + 1)
+            half = window_size // 2
+            window_length = 2 * half + 1
+            if len(predictions) < window_length:
+                return predictions.copy()
+            
+            # 라벨을 등장 순서대로 정수 코드로 변환
+            labels = list(dict.fromkeys(predictions))
+            label_index = {label: code for code, label in enumerate(labels)}
+            codes = np.fromiter(
+                (label_index[label] for label in predictions),
+                dtype=np.intp,
+                count=len(predictions)
+            )
+            
+            # (윈도우 수, 윈도우 길이, 라벨 수) 일치 여부로 윈도우별 최빈값 계산
+            windows = np.lib.stride_tricks.sliding_window_view(codes, window_length)
+            matches = windows[:, :, None] == np.arange(len(labels))
+            counts = matches.sum(axis=1)
             
-            for i in range(window_size // 2, len(predictions) - window_size // 2):
-                window_start = i - window_size // 2
-                window_end = i + window_size // 2 + 1
-                window_predictions = predictions[window_start:window_end]
-                
-                # 윈도우 내에서 가장 빈번한 예측값 선택
-                from collections import Counter
-                most_common = Counter(window_predictions).most_common(1)
-                
-                if most_common:
-                    smoothed[i] = most_common[0][0]
+            # 동률이면 윈도우 내에서 먼저 등장한 라벨 선택 (Counter.most_common과 동일)
+            first_positions = np.where(matches.any(axis=1), matches.argmax(axis=1), window_length)
+            majority = (counts * (window_length + 1) - first_positions).argmax(axis=1)
             
-            return smoothed
+            # 양 끝 half개는 원본 유지, 내부는 최빈값 코드를 라벨 배열에서 한 번에 조회
+            smoothed_interior = np.array(labels, dtype=object)[majority].tolist()
+            return predictions[:half] + smoothed_interior + predictions[len(predictions) - half:]
             
         except Exception as e:
-            logger.error(f"예측 결과 스무딩 중 오류: {str(e)}")
+            logger.error("예측 결과 스무딩 중 오류", error=str(e))
             return predictions  # 원본 반환
 
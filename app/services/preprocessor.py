@@ -1,15 +1,18 @@
 import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Tuple
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple, Union
 import numpy as np
-import pandas as pd
-from scipy import signal
-from scipy.stats import skew, kurtosis
+from scipy import fft, signal
 import structlog
 
 from app.models.request_models import AccelerometerReading, AudioReading
 from app.models.internal_models import ProcessedSensorData, PreprocessingParams
 from app.config.settings import settings
+from app.utils.sensor_utils import SensorArrays, chronological_order
 
 logger = structlog.get_logger()
 
@@ -19,26 +22,113 @@ class PreprocessorService:
     
     def __init__(self):
         self.params = PreprocessingParams()
-        
+        # 필터 계수는 설정값에만 의존하므로 SOS 형식으로 1회만 설계 (비활성 시 None)
+        self._sos_low = self._design_sos(self.params.lowpass_freq, 'low')
+        self._sos_high = self._design_sos(self.params.highpass_freq, 'high')
+        # 윈도우 길이는 설정값으로 고정되므로 주파수 대역 가중치도 1회만 계산
+        self._window_samples = int(self.params.window_size * settings.sensor_sampling_rate)
+        self._band_weights = self._design_band_weights(self._window_samples)
+        # 배치 FFT 스레드 수 (프로세스 풀 사용 시 프로세스끼리 코어를 나눠 과다 구독 방지)
+        self._fft_workers = settings.fft_workers or max(
+            1, (os.cpu_count() or 1) // max(1, settings.preprocess_workers)
+        )
+        # 입력 컬럼당 특성 수 (통계 12개 + 주파수 대역 8개)
+        self._features_per_column = (
+            12 * self.params.extract_statistical_features
+            + 8 * self.params.extract_frequency_features
+        )
+        # 모델은 가속도계 특성의 앞 5개(x 컬럼 특성)와 오디오 특성의 마지막 1개
+        # (freq_band_7 컬럼 특성)만 사용하므로 해당 입력 컬럼만 특성을 추출
+        self._accel_model_columns = slice(0, 1)
+        self._audio_model_columns = slice(8, 9)
+        self._audio_z_col = self._features_per_column - 1 if self._features_per_column else None
+        # 특성 추출 전용 프로세스 풀 (start_process_pool 호출 전에는 워커 스레드에서 처리)
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+    
+    def start_process_pool(self):
+        """특성 추출 프로세스 풀 시작 (settings.preprocess_workers가 0이면 사용 안 함)"""
+        if settings.preprocess_workers > 0 and self._process_pool is None:
+            # 예측 스레드풀 등 스레드가 이미 실행 중인 프로세스를 fork하면 교착될 수 있으므로
+            # forkserver(미지원 플랫폼은 spawn)로 워커 생성
+            start_method = (
+                "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            )
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=settings.preprocess_workers,
+                mp_context=multiprocessing.get_context(start_method)
+            )
+            logger.info("전처리 프로세스 풀 시작", workers=settings.preprocess_workers)
+    
+    def shutdown(self):
+        """특성 추출 프로세스 풀 종료"""
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+    
+    async def _run_extraction(
+        self,
+        method_name: str,
+        sensor_arrays: SensorArrays,
+        columns: slice = slice(None)
+    ) -> np.ndarray:
+        """특성 추출 메서드를 프로세스 풀(설정 시) 또는 워커 스레드에서 실행"""
+        if self._process_pool is not None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._process_pool, _run_feature_extraction, method_name,
+                self._worker_arrays(method_name, sensor_arrays), columns
+            )
+        return await asyncio.to_thread(getattr(self, method_name), sensor_arrays, columns)
+    
+    @staticmethod
+    def _worker_arrays(method_name: str, sensor_arrays: SensorArrays) -> SensorArrays:
+        """프로세스 워커로 보낼 배열 (처리 메서드가 쓰지 않는 센서 배열은 비워 pickle 크기 축소)"""
+        if method_name == "_process_accelerometer_data":
+            return sensor_arrays._replace(
+                audio_amplitudes=np.empty(0, dtype=np.float32),
+                audio_seconds=np.empty(0, dtype=np.float64),
+                audio_frequency_bands=None
+            )
+        if method_name == "_process_audio_data":
+            bands = sensor_arrays.audio_frequency_bands
+            return sensor_arrays._replace(
+                accel_xyz=np.empty((0, 3), dtype=np.float32),
+                accel_seconds=np.empty(0, dtype=np.float64),
+                # 오디오 처리는 앞 8개 밴드만 사용
+                audio_frequency_bands=bands[:, :8] if bands is not None and bands.ndim == 2 else bands
+            )
+        return sensor_arrays
+    
     async def process_sensor_data(
         self,
-        accelerometer_data: List[AccelerometerReading],
-        audio_data: List[AudioReading]
+        accelerometer_data: Optional[List[AccelerometerReading]],
+        audio_data: Optional[List[AudioReading]],
+        sensor_arrays: Optional[SensorArrays] = None
     ) -> ProcessedSensorData:
-        """센서 데이터 전처리"""
+        """
+        센서 데이터 전처리
+        
+        sensor_arrays가 주어지면 측정값 재변환 없이 해당 배열을 사용합니다
+        (이 경우 측정값 목록은 None일 수 있습니다).
+        """
         try:
             logger.info("센서 데이터 전처리 시작")
             
-            # 병렬로 가속도계와 오디오 데이터 처리
-            accel_task = asyncio.create_task(
-                self._process_accelerometer_data(accelerometer_data)
-            )
-            audio_task = asyncio.create_task(
-                self._process_audio_data(audio_data)
-            )
+            if sensor_arrays is None:
+                sensor_arrays = await asyncio.to_thread(
+                    SensorArrays.from_readings, accelerometer_data, audio_data
+                )
             
+            # 가속도계와 오디오 데이터를 워커 스레드(또는 프로세스)에서 병렬 처리
+            # (CPU 연산이 이벤트 루프를 막지 않도록 하며, NumPy 연산 중에는 GIL이 해제됨)
+            # 모델이 사용하는 입력 컬럼의 특성만 추출
             accel_features, audio_features = await asyncio.gather(
-                accel_task, audio_task
+                self._run_extraction(
+                    "_process_accelerometer_data", sensor_arrays, self._accel_model_columns
+                ),
+                self._run_extraction(
+                    "_process_audio_data", sensor_arrays, self._audio_model_columns
+                )
             )
             
             # 모델에 맞는 특성 추출 (6개 특성)
@@ -52,12 +142,20 @@ class PreprocessorService:
                 "acc_std_total", "acc_energy_total", "audio_z"
             ]
             
+            # 첫/마지막 가속도계 측정 시각 (수신 순서 기준)
+            accel_seconds = sensor_arrays.accel_seconds
+            if len(accel_seconds) and sensor_arrays.reference_time is not None:
+                first_timestamp = sensor_arrays.reference_time + timedelta(seconds=float(accel_seconds[0]))
+                last_timestamp = sensor_arrays.reference_time + timedelta(seconds=float(accel_seconds[-1]))
+            else:
+                first_timestamp = last_timestamp = None
+            
             # 결과 반환
             result = ProcessedSensorData(
-                user_id=accelerometer_data[0].timestamp.isoformat() if accelerometer_data else "unknown",
-                recording_start=accelerometer_data[0].timestamp if accelerometer_data else datetime.utcnow(),
-                recording_end=accelerometer_data[-1].timestamp if accelerometer_data else datetime.utcnow(),
-                accelerometer_features=combined_features,
+                user_id=first_timestamp.isoformat() if first_timestamp else "unknown",
+                recording_start=first_timestamp or datetime.utcnow(),
+                recording_end=last_timestamp or datetime.utcnow(),
+                accelerometer_features=combined_features.tolist(),
                 audio_features=[],  # 이미 combined_features에 포함됨
                 sampling_rate=self.params.window_size,
                 feature_names=feature_names,
@@ -76,31 +174,22 @@ class PreprocessorService:
             logger.error(f"센서 데이터 전처리 중 오류: {str(e)}")
             raise
     
-    async def _process_accelerometer_data(
+    def _process_accelerometer_data(
         self, 
-        accelerometer_data: List[AccelerometerReading]
-    ) -> List[List[float]]:
-        """가속도계 데이터 처리"""
+        sensor_arrays: SensorArrays,
+        columns: slice = slice(None)
+    ) -> np.ndarray:
+        """가속도계 데이터 처리 (columns로 특성을 추출할 입력 컬럼 선택)"""
         try:
             logger.debug("가속도계 데이터 처리 시작")
             
-            # DataFrame으로 변환
-            df = pd.DataFrame([
-                {
-                    'timestamp': reading.timestamp,
-                    'x': reading.x,
-                    'y': reading.y,
-                    'z': reading.z
-                }
-                for reading in accelerometer_data
-            ])
-            
-            # 시간순 정렬
-            df = df.sort_values('timestamp').reset_index(drop=True)
+            # 시간순 정렬 (열 순서 x, y, z, 모델 입력과 같은 float32로 계산)
+            order = chronological_order(sensor_arrays.accel_seconds)
+            values = np.asarray(sensor_arrays.accel_xyz[order, columns], dtype=np.float32)
             
             # 윈도우 기반 특성 추출
-            features = await self._extract_windowed_features(
-                df, ['x', 'y', 'z'], self.params.window_size, self.params.overlap
+            features = self._extract_windowed_features(
+                values, self.params.window_size, self.params.overlap
             )
             
             logger.debug(f"가속도계 특성 추출 완료: {len(features)}개 윈도우")
@@ -111,33 +200,29 @@ class PreprocessorService:
             logger.error(f"가속도계 데이터 처리 중 오류: {str(e)}")
             raise
     
-    async def _process_audio_data(
+    def _process_audio_data(
         self, 
-        audio_data: List[AudioReading]
-    ) -> List[List[float]]:
-        """오디오 데이터 처리"""
+        sensor_arrays: SensorArrays,
+        columns: slice = slice(None)
+    ) -> np.ndarray:
+        """오디오 데이터 처리 (columns로 특성을 추출할 입력 컬럼 선택)"""
         try:
             logger.debug("오디오 데이터 처리 시작")
             
-            # DataFrame으로 변환
-            df = pd.DataFrame([
-                {
-                    'timestamp': reading.timestamp,
-                    'amplitude': reading.amplitude,
-                    **{f'freq_band_{i}': band for i, band in enumerate(reading.frequency_bands)}
-                }
-                for reading in audio_data
-            ])
+            frequency_bands = sensor_arrays.audio_frequency_bands
+            if frequency_bands is None or frequency_bands.shape[1] < 8:
+                raise ValueError("오디오 주파수 밴드는 8개 이상이어야 합니다")
             
-            # 시간순 정렬
-            df = df.sort_values('timestamp').reset_index(drop=True)
-            
-            # 특성 컬럼 정의
-            feature_columns = ['amplitude'] + [f'freq_band_{i}' for i in range(8)]
+            # 시간순 정렬 (열 순서 amplitude, freq_band_0 ~ freq_band_7, float32로 계산)
+            order = chronological_order(sensor_arrays.audio_seconds)
+            values = np.column_stack([
+                sensor_arrays.audio_amplitudes[order],
+                frequency_bands[order, :8]
+            ])[:, columns].astype(np.float32, copy=False)
             
             # 윈도우 기반 특성 추출
-            features = await self._extract_windowed_features(
-                df, feature_columns, self.params.window_size, self.params.overlap
+            features = self._extract_windowed_features(
+                values, self.params.window_size, self.params.overlap
             )
             
             logger.debug(f"오디오 특성 추출 완료: {len(features)}개 윈도우")
@@ -148,137 +233,183 @@ class PreprocessorService:
             logger.error(f"오디오 데이터 처리 중 오류: {str(e)}")
             raise
     
-    async def _extract_windowed_features(
+    def _extract_windowed_features(
         self,
-        df: pd.DataFrame,
-        feature_columns: List[str],
+        values: np.ndarray,
         window_size: int,
         overlap: float
-    ) -> List[List[float]]:
-        """윈도우 기반 특성 추출"""
+    ) -> np.ndarray:
+        """
+        윈도우 기반 특성 추출 (values: 시간순 정렬된 (샘플 수, 컬럼 수) 배열)
+        
+        반환 특성 순서는 컬럼별로 [통계적 특성, 주파수 도메인 특성]입니다.
+        """
         try:
-            features = []
-            
             # 윈도우 크기를 초 단위에서 데이터 포인트 수로 변환
             window_samples = int(window_size * settings.sensor_sampling_rate)
             step_size = int(window_samples * (1 - overlap))
             
-            for start_idx in range(0, len(df) - window_samples + 1, step_size):
-                end_idx = start_idx + window_samples
-                window_data = df.iloc[start_idx:end_idx]
-                
-                # 각 컬럼에 대해 특성 추출
-                window_features = []
-                
-                for column in feature_columns:
-                    values = window_data[column].values
-                    
-                    # 통계적 특성
-                    if self.params.extract_statistical_features:
-                        window_features.extend(self._extract_statistical_features(values))
-                    
-                    # 주파수 도메인 특성
-                    if self.params.extract_frequency_features:
-                        window_features.extend(self._extract_frequency_features(values))
-                
-                features.append(window_features)
+            if len(values) < window_samples:
+                return np.empty((0, 0), dtype=np.float32)
             
-            return features
-            
-        except Exception as e:
-            logger.error(f"윈도우 특성 추출 중 오류: {str(e)}")
-            raise
-    
-    def _extract_statistical_features(self, values: np.ndarray) -> List[float]:
-        """통계적 특성 추출"""
-        try:
-            features = []
-            
-            # 기본 통계량
-            features.extend([
-                np.mean(values),           # 평균
-                np.std(values),            # 표준편차
-                np.min(values),            # 최솟값
-                np.max(values),            # 최댓값
-                np.median(values),         # 중앙값
-                np.percentile(values, 25), # 25분위수
-                np.percentile(values, 75), # 75분위수
-            ])
+            # 전체 윈도우를 복사 없이 (윈도우 수, 컬럼 수, 윈도우 길이) 뷰로 구성
+            windows = np.lib.stride_tricks.sliding_window_view(
+                values, window_samples, axis=0
+            )[::step_size]
             
-            # 형태 특성
-            features.extend([
-                skew(values),              # 왜도
-                kurtosis(values),          # 첨도
-            ])
-            
-            # 변화량 특성
-            if len(values) > 1:
-                diff = np.diff(values)
-                features.extend([
-                    np.mean(np.abs(diff)),     # 평균 절댓값 변화
-                    np.sum(np.abs(diff)),      # 총 변화량
-                    np.std(diff),              # 변화량 표준편차
-                ])
-            else:
-                features.extend([0.0, 0.0, 0.0])
+            # 각 컬럼에 대해 특성 추출 (윈도우 전체를 한 번에 계산)
+            feature_blocks = []
             
-            # NaN 값 처리
-            features = [float(f) if not np.isnan(f) and not np.isinf(f) else 0.0 for f in features]
-            
-            return features
-            
-        except Exception as e:
-            logger.error(f"통계적 특성 추출 중 오류: {str(e)}")
-            return [0.0] * 12  # 기본값 반환
-    
-    def _extract_frequency_features(self, values: np.ndarray) -> List[float]:
-        """주파수 도메인 특성 추출"""
-        try:
-            features = []
-            
-            if len(values) < 4:  # FFT를 위한 최소 데이터 포인트
-                return [0.0] * 8  # 기본값 반환
-            
-            # FFT 계산
-            fft = np.fft.fft(values)
-            power_spectrum = np.abs(fft) ** 2
-            freqs = np.fft.fftfreq(len(values), 1/settings.sensor_sampling_rate)
-            
-            # 양의 주파수만 사용
-            positive_freqs_idx = freqs > 0
-            positive_freqs = freqs[positive_freqs_idx]
-            positive_power = power_spectrum[positive_freqs_idx]
-            
-            if len(positive_power) == 0:
-                return [0.0] * 8
+            # 통계적 특성
+            if self.params.extract_statistical_features:
+                feature_blocks.append(self._extract_statistical_features(windows))
             
-            # 주파수 대역 특성
-            total_power = np.sum(positive_power)
+            # 주파수 도메인 특성
+            if self.params.extract_frequency_features:
+                feature_blocks.append(self._extract_frequency_features(windows))
             
-            # 대역별 파워 (0-0.1Hz, 0.1-0.2Hz, ..., 0.7-0.8Hz)
-            num_bands = 8
-            max_freq = min(0.8, np.max(positive_freqs))
-            band_width = max_freq / num_bands
+            if not feature_blocks:
+                return np.empty((len(windows), 0), dtype=np.float32)
             
-            for i in range(num_bands):
-                band_start = i * band_width
-                band_end = (i + 1) * band_width
-                
-                band_mask = (positive_freqs >= band_start) & (positive_freqs < band_end)
-                band_power = np.sum(positive_power[band_mask])
-                
-                # 상대적 파워 비율
-                band_ratio = band_power / total_power if total_power > 0 else 0.0
-                features.append(float(band_ratio))
+            # (윈도우 수, 컬럼 수, 특성 수) -> (윈도우 수, 컬럼 수 * 특성 수)
+            features = np.concatenate(
+                feature_blocks, axis=-1, dtype=np.float32
+            ).reshape(len(windows), -1)
             
-            # NaN 값 처리
-            features = [f if not np.isnan(f) and not np.isinf(f) else 0.0 for f in features]
+            # NaN/inf 값 처리 (concatenate 결과는 새 배열이므로 제자리에서 치환)
+            np.nan_to_num(features, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
             
             return features
             
         except Exception as e:
-            logger.error(f"주파수 특성 추출 중 오류: {str(e)}")
-            return [0.0] * 8  # 기본값 반환
+            logger.error(f"윈도우 특성 추출 중 오류: {str(e)}")
+            raise
+    
+    def _extract_statistical_features(self, windows: np.ndarray) -> np.ndarray:
+        """통계적 특성 추출 (windows: (..., 윈도우 길이) -> (..., 12), NaN 처리는 호출 측에서 수행)"""
+        # 중앙값과 분위수를 한 번의 partition으로 계산
+        q25, median, q75 = np.percentile(windows, [25, 50, 75], axis=-1)
+        mean, std, skewness, kurt = self._moments(windows)
+        
+        # 변화량 특성
+        if windows.shape[-1] > 1:
+            diff = windows[..., 1:] - windows[..., :-1]
+            total_change = np.abs(diff).sum(axis=-1)
+            diff_features = [
+                total_change / diff.shape[-1],  # 평균 절댓값 변화
+                total_change,                   # 총 변화량
+                diff.std(axis=-1),              # 변화량 표준편차
+            ]
+        else:
+            diff_features = [np.zeros(windows.shape[:-1])] * 3
+        
+        return np.stack([
+            # 기본 통계량
+            mean,                          # 평균
+            std,                           # 표준편차
+            windows.min(axis=-1),          # 최솟값
+            windows.max(axis=-1),          # 최댓값
+            median,                        # 중앙값
+            q25,                           # 25분위수
+            q75,                           # 75분위수
+            # 형태 특성
+            skewness,                      # 왜도
+            kurt,                          # 첨도
+            *diff_features
+        ], axis=-1)
+    
+    @staticmethod
+    def _moments(
+        windows: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        평균, 표준편차, 왜도, 첨도를 중심 모멘트 한 번 계산으로 산출 (마지막 축 기준)
+        
+        scipy.stats.skew/kurtosis(bias=True, fisher=True)와 동일하며,
+        분산이 0에 가까운 윈도우의 왜도/첨도는 scipy와 같이 NaN입니다.
+        """
+        # float64로 누적한 평균을 윈도우 dtype(float32)으로 반올림해 중심화
+        # (평균에 가까운 값끼리의 뺄셈은 오차가 없으므로 중심화 값은 정확하며,
+        # 반올림으로 남은 평균 오프셋 r은 모멘트 변환식으로 보정)
+        mean = windows.mean(axis=-1, dtype=np.float64, keepdims=True)
+        centered = windows - mean.astype(windows.dtype)
+        squared = centered * centered
+        
+        r = centered.mean(axis=-1, dtype=np.float64)
+        c2 = squared.mean(axis=-1, dtype=np.float64)
+        c3 = (squared * centered).mean(axis=-1, dtype=np.float64)
+        c4 = (squared * squared).mean(axis=-1, dtype=np.float64)
+        
+        m2 = np.maximum(c2 - r ** 2, 0.0)
+        m3 = c3 - 3 * r * c2 + 2 * r ** 3
+        m4 = c4 - 4 * r * c3 + 6 * r ** 2 * c2 - 3 * r ** 4
+        mean = mean[..., 0]
+        
+        with np.errstate(all="ignore"):
+            degenerate = m2 <= (np.finfo(m2.dtype).resolution * mean) ** 2
+            skewness = np.where(degenerate, np.nan, m3 / m2 ** 1.5)
+            kurt = np.where(degenerate, np.nan, m4 / m2 ** 2 - 3.0)
+        
+        return mean, np.sqrt(m2), skewness, kurt
+    
+    @staticmethod
+    def _design_band_weights(window_length: int, num_bands: int = 8) -> Optional[np.ndarray]:
+        """
+        양의 주파수 파워를 대역별로 합산하는 (양의 주파수 수, 대역 수) 가중치 행렬 생성
+        
+        대역은 0-0.1Hz, 0.1-0.2Hz, ..., 0.7-0.8Hz이며, 나이퀴스트가 더 낮으면 균등 분할합니다.
+        FFT를 계산하지 않는 짧은 윈도우(4 미만)는 None을 반환합니다.
+        """
+        if window_length < 4:
+            return None
+        
+        freqs = np.fft.rfftfreq(window_length, 1/settings.sensor_sampling_rate)
+        positive_freqs = freqs[1:(window_length - 1) // 2 + 1]
+        
+        max_freq = min(0.8, positive_freqs.max())
+        band_width = max_freq / num_bands
+        band_edges = np.arange(num_bands + 1) * band_width
+        band_masks = (
+            (positive_freqs >= band_edges[:-1, None]) & (positive_freqs < band_edges[1:, None])
+        )
+        return band_masks.T.astype(np.float32)
+    
+    def _extract_frequency_features(self, windows: np.ndarray) -> np.ndarray:
+        """주파수 도메인 특성 추출 (windows: (..., 윈도우 길이) -> (..., 8), NaN 처리는 호출 측에서 수행)"""
+        num_bands = 8
+        window_length = windows.shape[-1]
+        
+        if window_length < 4:  # FFT를 위한 최소 데이터 포인트
+            return np.zeros(windows.shape[:-1] + (num_bands,))  # 기본값 반환
+        
+        # 실수 입력이므로 rfft로 전체 윈도우를 한 번에 계산
+        # (scipy.fft는 float32 입력을 단정밀도 그대로 변환하고 FFT 계획을 캐시함)
+        num_transforms = int(np.prod(windows.shape[:-1]))
+        spectrum = fft.rfft(
+            windows, axis=-1, workers=max(1, min(num_transforms, self._fft_workers))
+        )
+        power_spectrum = spectrum.real ** 2 + spectrum.imag ** 2
+        
+        # 양의 주파수만 사용 (DC 및 짝수 길이의 나이퀴스트 성분 제외, 양측 FFT 기준과 동일)
+        positive_power = power_spectrum[..., 1:(window_length - 1) // 2 + 1]
+        
+        # 주파수 대역 특성
+        total_power = positive_power.sum(axis=-1, keepdims=True)
+        
+        # 대역별 파워 (설정된 윈도우 길이면 미리 계산한 가중치 사용)
+        if window_length == self._window_samples:
+            band_weights = self._band_weights
+        else:
+            band_weights = self._design_band_weights(window_length)
+        band_power = positive_power @ band_weights
+        
+        # 상대적 파워 비율
+        return np.divide(
+            band_power,
+            total_power,
+            out=np.zeros_like(band_power),
+            where=total_power > 0
+        )
     
     def _generate_feature_names(self) -> List[str]:
         """특성 이름 생성"""
@@ -315,23 +446,31 @@ class PreprocessorService:
         return names
     
     async def apply_filters(self, data: np.ndarray) -> np.ndarray:
-        """신호 필터링 적용"""
+        """신호 필터링 적용 (워커 스레드에서 실행)"""
+        return await asyncio.to_thread(self._apply_filters, data)
+    
+    @staticmethod
+    def _design_sos(cutoff_hz: float, btype: str) -> Optional[np.ndarray]:
+        """4차 버터워스 필터를 SOS 계수로 설계 (비활성 또는 나이퀴스트 이상이면 None)"""
+        if cutoff_hz <= 0:
+            return None
+        
+        normalized_cutoff = cutoff_hz / (settings.sensor_sampling_rate / 2)
+        if normalized_cutoff >= 1.0:
+            return None
+        
+        return signal.butter(4, normalized_cutoff, btype=btype, output='sos')
+    
+    def _apply_filters(self, data: np.ndarray) -> np.ndarray:
+        """신호 필터링 적용 (동기)"""
         try:
             # 저역통과 필터
-            if self.params.lowpass_freq > 0:
-                nyquist = settings.sensor_sampling_rate / 2
-                low_cutoff = self.params.lowpass_freq / nyquist
-                if low_cutoff < 1.0:
-                    b, a = signal.butter(4, low_cutoff, btype='low')
-                    data = signal.filtfilt(b, a, data, axis=0)
+            if self._sos_low is not None:
+                data = signal.sosfiltfilt(self._sos_low, data, axis=0)
             
             # 고역통과 필터
-            if self.params.highpass_freq > 0:
-                nyquist = settings.sensor_sampling_rate / 2
-                high_cutoff = self.params.highpass_freq / nyquist
-                if high_cutoff < 1.0:
-                    b, a = signal.butter(4, high_cutoff, btype='high')
-                    data = signal.filtfilt(b, a, data, axis=0)
+            if self._sos_high is not None:
+                data = signal.sosfiltfilt(self._sos_high, data, axis=0)
             
             return data
             
@@ -339,92 +478,96 @@ class PreprocessorService:
             logger.error(f"필터링 적용 중 오류: {str(e)}")
             return data  # 원본 데이터 반환
     
-    async def normalize_features(self, features: List[List[float]]) -> List[List[float]]:
-        """특성 정규화"""
+    async def normalize_features(
+        self, features: Union[List[List[float]], np.ndarray]
+    ) -> np.ndarray:
+        """특성 정규화 (2차원 배열 반환, 리스트가 필요하면 API 경계에서 변환)"""
         try:
-            if not features:
-                return features
+            # 복사본을 만들어 이후 연산은 모두 제자리(in-place)에서 수행
+            features_array = np.array(features, dtype=np.float64)
             
-            features_array = np.array(features)
+            if features_array.size == 0:
+                return features_array
             
             if self.params.normalization_method == "z-score":
-                # Z-score 정규화
-                mean = np.mean(features_array, axis=0)
-                std = np.std(features_array, axis=0)
+                # Z-score 정규화 (중심화된 배열을 표준편차 계산에 재사용)
+                mean = features_array.mean(axis=0)
+                np.subtract(features_array, mean, out=features_array)
+                std = np.sqrt(np.square(features_array).mean(axis=0))
                 
                 # 표준편차가 0인 경우 처리
                 std[std == 0] = 1.0
                 
-                normalized = (features_array - mean) / std
+                np.divide(features_array, std, out=features_array)
             
             elif self.params.normalization_method == "min-max":
                 # Min-Max 정규화
-                min_vals = np.min(features_array, axis=0)
-                max_vals = np.max(features_array, axis=0)
+                min_vals = features_array.min(axis=0)
+                range_vals = features_array.max(axis=0) - min_vals
                 
                 # 범위가 0인 경우 처리
-                range_vals = max_vals - min_vals
                 range_vals[range_vals == 0] = 1.0
                 
-                normalized = (features_array - min_vals) / range_vals
+                np.subtract(features_array, min_vals, out=features_array)
+                np.divide(features_array, range_vals, out=features_array)
             
-            else:
-                # 정규화 없음
-                normalized = features_array
-            
-            return normalized.tolist()
+            # 그 외에는 정규화 없음
+            return features_array
             
         except Exception as e:
             logger.error(f"특성 정규화 중 오류: {str(e)}")
-            return features  # 원본 특성 반환
+            return np.asarray(features)  # 원본 특성 반환
     
     def _extract_model_specific_features(
         self,
-        accel_features: List[List[float]],
-        audio_features: List[List[float]]
-    ) -> List[List[float]]:
-        """모델에 맞는 6개 특성 추출"""
+        accel_features: np.ndarray,
+        audio_features: np.ndarray
+    ) -> np.ndarray:
+        """
+        모델에 맞는 6개 특성 추출
+        
+        가속도계 특성의 앞 5개 컬럼(mean_acc_x, mean_acc_y, mean_acc_z, acc_std_total,
+        acc_energy_total 위치)과 오디오 특성의 audio_z 컬럼을 사용합니다.
+        process_sensor_data는 해당 특성이 나오는 입력 컬럼(가속도계 x, 오디오 freq_band_7)만
+        추출한 행렬을 전달합니다.
+        가속도계 윈도우 수를 기준으로 하며, 부족한 컬럼/윈도우는 0으로 채웁니다.
+        """
         try:
-            model_features = []
-            
-            for i in range(len(accel_features)):
-                # 가속도계 특성에서 필요한 것들 추출
-                accel_window = accel_features[i]
-                
-                # 가속도계 데이터가 충분히 있다고 가정하고 계산
-                # mean_acc_x, mean_acc_y, mean_acc_z (처음 3개 특성이 평균이라고 가정)
-                mean_acc_x = accel_window[0] if len(accel_window) > 0 else 0.0
-                mean_acc_y = accel_window[1] if len(accel_window) > 1 else 0.0  
-                mean_acc_z = accel_window[2] if len(accel_window) > 2 else 0.0
-                
-                # acc_std_total (전체 가속도 표준편차)
-                acc_std_total = accel_window[3] if len(accel_window) > 3 else 0.0
-                
-                # acc_energy_total (전체 가속도 에너지)
-                acc_energy_total = accel_window[4] if len(accel_window) > 4 else 0.0
-                
-                # audio_z (오디오 특성, 마지막 특성이라고 가정)
-                audio_z = 0.0
-                if i < len(audio_features) and len(audio_features[i]) > 0:
-                    audio_z = audio_features[i][-1]  # 마지막 오디오 특성
-                
-                # 6개 특성으로 구성
-                window_features = [
-                    mean_acc_x,
-                    mean_acc_y, 
-                    mean_acc_z,
-                    acc_std_total,
-                    acc_energy_total,
-                    audio_z
-                ]
-                
-                model_features.append(window_features)
-            
-            logger.debug(f"모델 특성 추출 완료: {len(model_features)}개 윈도우, 6개 특성")
+            n_windows = len(accel_features)
+            model_features = np.zeros((n_windows, 6), dtype=np.float32)
+            
+            # 가속도계 특성 (앞 5개 컬럼)
+            n_accel_cols = min(accel_features.shape[1], 5) if accel_features.ndim == 2 else 0
+            model_features[:, :n_accel_cols] = accel_features[:, :n_accel_cols]
+            
+            # audio_z (오디오 마지막 입력 컬럼의 마지막 특성, 위치는 초기화 시 계산)
+            if (
+                self._audio_z_col is not None
+                and audio_features.ndim == 2
+                and audio_features.shape[1] > self._audio_z_col
+            ):
+                n_audio = min(n_windows, len(audio_features))
+                model_features[:n_audio, 5] = audio_features[:n_audio, self._audio_z_col]
+            
+            logger.debug(f"모델 특성 추출 완료: {n_windows}개 윈도우, 6개 특성")
             return model_features
             
         except Exception as e:
             logger.error(f"모델 특성 추출 중 오류: {str(e)}")
             # 기본값 반환
-            return [[0.0, 0.0, 0.0, 0.0, 0.0, 0.0] for _ in range(len(accel_features))]
+            return np.zeros((len(accel_features), 6), dtype=np.float32)
+
+
+@lru_cache(maxsize=1)
+def _get_worker_preprocessor() -> PreprocessorService:
+    """프로세스 풀 워커 내부에서 사용할 전처리 서비스 (워커 프로세스당 1개)"""
+    return PreprocessorService()
+
 
+def _run_feature_extraction(
+    method_name: str,
+    sensor_arrays: SensorArrays,
+    columns: slice = slice(None)
+) -> np.ndarray:
+    """프로세스 풀 워커 진입점 (pickle 가능하도록 모듈 수준 함수로 정의)"""
+    return getattr(_get_worker_preprocessor(), method_name)(sensor_arrays, columns)
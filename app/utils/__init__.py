@@ -1,12 +1,16 @@
 """유틸리티 모듈"""
-from .validation_utils import validate_sensor_data, validate_user_data
-from .time_series_utils import check_data_quality
-from .sensor_utils import SensorProcessor, AudioProcessor, SignalProcessor
+from .validation_utils import validate_sensor_data, validate_sensor_data_sync, validate_user_data
+from .time_series_utils import check_data_quality, check_data_quality_sync
+from .sensor_utils import SensorArrays, chronological_order, SensorProcessor, AudioProcessor, SignalProcessor
 
 __all__ = [
     "validate_sensor_data",
+    "validate_sensor_data_sync",
     "validate_user_data", 
     "check_data_quality",
+    "check_data_quality_sync",
+    "SensorArrays",
+    "chronological_order",
     "SensorProcessor",
     "AudioProcessor",
     "SignalProcessor"
@@ -1,7 +1,9 @@
-from typing import List, Dict, Any, Tuple
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import List, Dict, Any, NamedTuple, Optional, Tuple, Union
 import numpy as np
-import pandas as pd
 from scipy import signal, fft
+from scipy.spatial import cKDTree
 from scipy.stats import entropy
 import structlog
 
@@ -9,22 +11,172 @@ from app.models.request_models import AccelerometerReading, AudioReading
 
 logger = structlog.get_logger()
 
+# 바이너리 센서 데이터 형식 (시각은 float64 경과 초, 측정값은 float32)
+BINARY_TIME_DTYPE = np.dtype("<f8")
+BINARY_VALUE_DTYPE = np.dtype("<f4")
+
+# 활동 수준 분류 경계 (평균 가속도 크기 기준)와 구간별 이름
+ACTIVITY_LEVEL_BOUNDS = [0.1, 0.3, 0.7, 1.5]
+ACTIVITY_LEVEL_LABELS = ["매우 낮음", "낮음", "중간", "높음", "매우 높음"]
+
+
+class SensorArrays(NamedTuple):
+    """
+    요청 센서 데이터의 열 단위 NumPy 표현 (요청당 1회 변환하여 검증/품질 평가에서 공유)
+    
+    모든 배열은 수신 순서를 유지하며 읽기 전용으로 취급합니다.
+    - accel_xyz: (N, 3) float32, C-연속 (열 순서 x, y, z)
+    - accel_seconds: (N,) float64, 기준 시각으로부터의 경과 초
+    - audio_amplitudes: (M,) float32
+    - audio_seconds: (M,) float64, 기준 시각으로부터의 경과 초
+    - audio_frequency_bands: (M, B) float32 (밴드 길이가 일정하지 않으면 None)
+    - reference_time: 경과 초의 기준 시각 (측정값이 없으면 None)
+    
+    JSON 요청의 기준 시각은 첫 가속도계 측정 시각(없으면 첫 오디오 측정 시각),
+    바이너리 요청의 기준 시각은 recording_start입니다.
+    """
+    accel_xyz: np.ndarray
+    accel_seconds: np.ndarray
+    audio_amplitudes: np.ndarray
+    audio_seconds: np.ndarray
+    audio_frequency_bands: Optional[np.ndarray]
+    reference_time: Optional[datetime] = None
+    
+    @classmethod
+    def from_readings(
+        cls,
+        accelerometer_data: List[AccelerometerReading],
+        audio_data: List[AudioReading]
+    ) -> "SensorArrays":
+        """센서 측정값 목록을 열 단위 배열로 변환"""
+        first_readings = accelerometer_data or audio_data
+        reference = first_readings[0].timestamp if first_readings else None
+        accel_count = len(accelerometer_data)
+        audio_count = len(audio_data)
+        
+        # 중간 리스트 없이 크기를 지정한 fromiter로 한 번에 변환
+        accel_xyz = np.fromiter(
+            (value for r in accelerometer_data for value in (r.x, r.y, r.z)),
+            dtype=np.float32,
+            count=accel_count * 3
+        ).reshape(-1, 3)
+        accel_seconds = np.fromiter(
+            ((r.timestamp - reference).total_seconds() for r in accelerometer_data),
+            dtype=np.float64,
+            count=accel_count
+        )
+        
+        audio_amplitudes = np.fromiter(
+            (r.amplitude for r in audio_data), dtype=np.float32, count=audio_count
+        )
+        audio_seconds = np.fromiter(
+            ((r.timestamp - reference).total_seconds() for r in audio_data),
+            dtype=np.float64,
+            count=audio_count
+        )
+        
+        try:
+            audio_frequency_bands = np.array(
+                [r.frequency_bands for r in audio_data], dtype=np.float32
+            )
+        except ValueError:
+            audio_frequency_bands = None
+        
+        return cls(
+            accel_xyz=accel_xyz,
+            accel_seconds=accel_seconds,
+            audio_amplitudes=audio_amplitudes,
+            audio_seconds=audio_seconds,
+            audio_frequency_bands=audio_frequency_bands,
+            reference_time=reference
+        )
+    
+    @classmethod
+    def from_binary(
+        cls,
+        body: bytes,
+        reference_time: datetime,
+        accel_count: int,
+        audio_count: int,
+        band_count: int
+    ) -> "SensorArrays":
+        """
+        바이너리 요청 본문을 열 단위 배열로 변환 (복사 없이 본문 버퍼를 그대로 참조)
+        
+        본문은 아래 블록을 순서대로 이어 붙인 little-endian 배열입니다.
+        1. accel_seconds: float64 × N
+        2. audio_seconds: float64 × M
+        3. accel_xyz: float32 × N × 3
+        4. audio_amplitudes: float32 × M
+        5. audio_frequency_bands: float32 × M × B
+        
+        경과 초는 reference_time 기준이며, 본문 길이가 맞지 않으면 ValueError를 발생시킵니다.
+        """
+        layout = [
+            ("accel_seconds", BINARY_TIME_DTYPE, (accel_count,)),
+            ("audio_seconds", BINARY_TIME_DTYPE, (audio_count,)),
+            ("accel_xyz", BINARY_VALUE_DTYPE, (accel_count, 3)),
+            ("audio_amplitudes", BINARY_VALUE_DTYPE, (audio_count,)),
+            ("audio_frequency_bands", BINARY_VALUE_DTYPE, (audio_count, band_count)),
+        ]
+        
+        expected_size = sum(
+            dtype.itemsize * int(np.prod(shape)) for _, dtype, shape in layout
+        )
+        if len(body) != expected_size:
+            raise ValueError(
+                f"바이너리 본문 크기가 올바르지 않습니다: {len(body)}바이트 (예상 {expected_size}바이트)"
+            )
+        
+        arrays = {}
+        offset = 0
+        for name, dtype, shape in layout:
+            count = int(np.prod(shape))
+            arrays[name] = np.frombuffer(
+                body, dtype=dtype, count=count, offset=offset
+            ).reshape(shape)
+            offset += dtype.itemsize * count
+        
+        return cls(reference_time=reference_time, **arrays)
+
+
+def chronological_order(seconds: np.ndarray) -> Union[slice, np.ndarray]:
+    """
+    경과 초 배열을 시간순으로 정렬하는 인덱서 반환
+    
+    센서 스트림은 대부분 이미 시간순이므로 단조 증가 여부를 먼저 확인하고,
+    정렬되어 있으면 복사 없는 slice(None)을, 아니면 안정 정렬 인덱스를 반환합니다.
+    """
+    if np.all(seconds[1:] >= seconds[:-1]):
+        return slice(None)
+    return np.argsort(seconds, kind="stable")
+
 
 class SensorProcessor:
     """센서 데이터 처리 유틸리티"""
     
+    @staticmethod
+    def _stack_xyz(accelerometer_data: List[AccelerometerReading]) -> np.ndarray:
+        """가속도계 측정값 목록을 (N, 3) float64 배열로 변환 (열 순서 x, y, z)"""
+        return np.fromiter(
+            (value for r in accelerometer_data for value in (r.x, r.y, r.z)),
+            dtype=np.float64,
+            count=len(accelerometer_data) * 3
+        ).reshape(-1, 3)
+    
+    @staticmethod
+    def _magnitudes(xyz: np.ndarray) -> np.ndarray:
+        """(N, 3) 배열의 행별 3축 벡터 크기"""
+        return np.sqrt(np.einsum('ij,ij->i', xyz, xyz))
+    
     @staticmethod
     async def calculate_magnitude(
         accelerometer_data: List[AccelerometerReading]
     ) -> List[float]:
         """가속도계 크기 계산 (3축 벡터의 크기)"""
         try:
-            magnitudes = []
-            for reading in accelerometer_data:
-                magnitude = np.sqrt(reading.x**2 + reading.y**2 + reading.z**2)
-                magnitudes.append(float(magnitude))
-            
-            return magnitudes
+            xyz = SensorProcessor._stack_xyz(accelerometer_data)
+            return SensorProcessor._magnitudes(xyz).tolist()
             
         except Exception as e:
             logger.error(f"가속도계 크기 계산 중 오류: {str(e)}")
@@ -36,28 +188,20 @@ class SensorProcessor:
     ) -> List[Dict[str, float]]:
         """기울기 각도 계산"""
         try:
-            angles = []
-            
-            for reading in accelerometer_data:
-                # 중력 벡터에 대한 기울기 각도 계산
-                magnitude = np.sqrt(reading.x**2 + reading.y**2 + reading.z**2)
-                
-                if magnitude > 0:
-                    # 각 축에 대한 기울기 각도 (라디안 -> 도)
-                    pitch = np.arcsin(reading.x / magnitude) * 180 / np.pi
-                    roll = np.arcsin(reading.y / magnitude) * 180 / np.pi
-                    
-                    angles.append({
-                        "pitch": float(pitch),
-                        "roll": float(roll),
-                        "magnitude": float(magnitude)
-                    })
-                else:
-                    angles.append({
-                        "pitch": 0.0,
-                        "roll": 0.0,
-                        "magnitude": 0.0
-                    })
+            # 중력 벡터에 대한 기울기 각도 계산 (전체 측정값을 한 번에)
+            xyz = SensorProcessor._stack_xyz(accelerometer_data)
+            magnitude = SensorProcessor._magnitudes(xyz)
+            valid = magnitude > 0
+            
+            # 각 축에 대한 기울기 각도 (라디안 -> 도), 크기가 0이면 0
+            with np.errstate(divide="ignore", invalid="ignore"):
+                tilt = np.arcsin(xyz[:, :2] / magnitude[:, None]) * 180 / np.pi
+            tilt[~valid] = 0.0
+            
+            angles = [
+                {"pitch": pitch, "roll": roll, "magnitude": mag}
+                for (pitch, roll), mag in zip(tilt.tolist(), magnitude.tolist())
+            ]
             
             return angles
             
@@ -74,48 +218,48 @@ class SensorProcessor:
         """움직임 이벤트 감지"""
         try:
             # 가속도계 크기 계산
-            magnitudes = await SensorProcessor.calculate_magnitude(accelerometer_data)
+            magnitudes = SensorProcessor._magnitudes(
+                SensorProcessor._stack_xyz(accelerometer_data)
+            )
             
-            if not magnitudes:
+            if not len(magnitudes):
                 return []
             
             # 움직임 감지 (임계값 초과)
-            movement_mask = np.array(magnitudes) > threshold
+            movement_mask = magnitudes > threshold
+            
+            # 연속된 움직임 구간 찾기 (마스크의 상승/하강 에지로 [시작, 끝) 인덱스 계산)
+            edges = np.diff(movement_mask.astype(np.int8), prepend=0, append=0)
+            starts = np.flatnonzero(edges == 1)
+            ends = np.flatnonzero(edges == -1)
+            durations = ends - starts
+            
+            # 최소 지속 시간 이상인 구간만 사용
+            keep = durations >= min_duration
+            starts, ends, durations = starts[keep], ends[keep], durations[keep]
             
-            # 연속된 움직임 구간 찾기
             events = []
-            in_movement = False
-            start_idx = 0
-            
-            for i, is_moving in enumerate(movement_mask):
-                if is_moving and not in_movement:
-                    # 움직임 시작
-                    in_movement = True
-                    start_idx = i
-                elif not is_moving and in_movement:
-                    # 움직임 종료
-                    duration = i - start_idx
-                    if duration >= min_duration:
-                        events.append({
-                            "start_time": accelerometer_data[start_idx].timestamp,
-                            "end_time": accelerometer_data[i-1].timestamp,
-                            "duration_seconds": duration,
-                            "max_magnitude": max(magnitudes[start_idx:i]),
-                            "mean_magnitude": np.mean(magnitudes[start_idx:i])
-                        })
-                    in_movement = False
-            
-            # 마지막 구간 처리
-            if in_movement:
-                duration = len(movement_mask) - start_idx
-                if duration >= min_duration:
-                    events.append({
-                        "start_time": accelerometer_data[start_idx].timestamp,
-                        "end_time": accelerometer_data[-1].timestamp,
+            if len(starts):
+                # 구간별 최댓값/평균 ([시작, 끝, 시작, 끝, ...] 경계의 짝수 번째 구간이 움직임 구간,
+                # 끝 인덱스가 배열 길이와 같을 수 있으므로 값 하나를 덧붙여 사용)
+                segment_bounds = np.column_stack([starts, ends]).ravel()
+                padded = np.append(magnitudes, 0.0)
+                max_magnitudes = np.maximum.reduceat(padded, segment_bounds)[::2]
+                mean_magnitudes = np.add.reduceat(padded, segment_bounds)[::2] / durations
+                
+                events = [
+                    {
+                        "start_time": accelerometer_data[start].timestamp,
+                        "end_time": accelerometer_data[end - 1].timestamp,
                         "duration_seconds": duration,
-                        "max_magnitude": max(magnitudes[start_idx:]),
-                        "mean_magnitude": np.mean(magnitudes[start_idx:])
-                    })
+                        "max_magnitude": max_magnitude,
+                        "mean_magnitude": mean_magnitude
+                    }
+                    for start, end, duration, max_magnitude, mean_magnitude in zip(
+                        starts.tolist(), ends.tolist(), durations.tolist(),
+                        max_magnitudes.tolist(), mean_magnitudes.tolist()
+                    )
+                ]
             
             logger.debug(f"움직임 이벤트 감지 완료: {len(events)}개 이벤트")
             return events
@@ -126,75 +270,95 @@ class SensorProcessor:
     
     @staticmethod
     async def calculate_activity_level(
-        accelerometer_data: List[AccelerometerReading],
-        window_minutes: int = 5
+        accelerometer_data: Optional[List[AccelerometerReading]],
+        window_minutes: int = 5,
+        sensor_arrays: Optional[SensorArrays] = None
     ) -> List[Dict[str, Any]]:
-        """활동 수준 계산 (시간 구간별)"""
+        """
+        활동 수준 계산 (시간 구간별)
+        
+        sensor_arrays가 주어지면 측정값 재변환 없이 해당 배열을 사용합니다
+        (이 경우 측정값 목록은 None일 수 있습니다).
+        """
         try:
-            if not accelerometer_data:
-                return []
-            
-            # DataFrame으로 변환
-            df = pd.DataFrame([
-                {
-                    'timestamp': reading.timestamp,
-                    'x': reading.x,
-                    'y': reading.y,
-                    'z': reading.z
-                }
-                for reading in accelerometer_data
-            ])
-            
-            df = df.sort_values('timestamp').reset_index(drop=True)
+            # 열 단위 배열로 변환 후 시간순 정렬
+            if sensor_arrays is not None:
+                if not len(sensor_arrays.accel_seconds):
+                    return []
+                reference = sensor_arrays.reference_time
+                seconds = sensor_arrays.accel_seconds
+                xyz = sensor_arrays.accel_xyz.astype(np.float64)
+            else:
+                if not accelerometer_data:
+                    return []
+                reference = accelerometer_data[0].timestamp
+                seconds = np.fromiter(
+                    ((r.timestamp - reference).total_seconds() for r in accelerometer_data),
+                    dtype=np.float64,
+                    count=len(accelerometer_data)
+                )
+                xyz = SensorProcessor._stack_xyz(accelerometer_data)
+            
+            order = chronological_order(seconds)
+            seconds = seconds[order]
             
             # 가속도계 크기 계산
-            df['magnitude'] = np.sqrt(df['x']**2 + df['y']**2 + df['z']**2)
+            magnitude = SensorProcessor._magnitudes(xyz[order])
             
-            # 시간 윈도우별로 활동 수준 계산
-            activity_levels = []
+            # 시간 윈도우별로 활동 수준 계산 (마지막 측정 시각 이전에 시작하는 윈도우까지)
             window_seconds = window_minutes * 60
-            start_time = df['timestamp'].iloc[0]
+            start_time = reference + timedelta(seconds=float(seconds[0]))
+            elapsed = seconds - seconds[0]
+            num_windows = int(np.ceil(elapsed[-1] / window_seconds))
             
-            while start_time < df['timestamp'].iloc[-1]:
-                end_time = start_time + pd.Timedelta(seconds=window_seconds)
-                
-                # 해당 시간 구간 데이터 추출
-                mask = (df['timestamp'] >= start_time) & (df['timestamp'] < end_time)
-                window_data = df[mask]
-                
-                if len(window_data) > 0:
-                    # 활동 지표 계산
-                    mean_magnitude = window_data['magnitude'].mean()
-                    std_magnitude = window_data['magnitude'].std()
-                    max_magnitude = window_data['magnitude'].max()
-                    
-                    # 움직임 변화량
-                    magnitude_diff = window_data['magnitude'].diff().abs().sum()
-                    
-                    # 활동 수준 분류
-                    if mean_magnitude < 0.1:
-                        activity_level = "매우 낮음"
-                    elif mean_magnitude < 0.3:
-                        activity_level = "낮음"
-                    elif mean_magnitude < 0.7:
-                        activity_level = "중간"
-                    elif mean_magnitude < 1.5:
-                        activity_level = "높음"
-                    else:
-                        activity_level = "매우 높음"
-                    
-                    activity_levels.append({
-                        "start_time": start_time,
-                        "end_time": end_time,
-                        "mean_magnitude": float(mean_magnitude),
-                        "std_magnitude": float(std_magnitude),
-                        "max_magnitude": float(max_magnitude),
-                        "total_movement": float(magnitude_diff),
-                        "activity_level": activity_level,
-                        "data_points": len(window_data)
-                    })
-                
-                start_time = end_time
+            if num_windows == 0:
+                return []
+            
+            # 정렬된 경과 시간에서 각 윈도우 경계의 위치 (데이터가 있는 윈도우만 사용)
+            bounds = np.searchsorted(
+                elapsed, np.arange(num_windows + 1) * window_seconds, side="left"
+            )
+            counts = np.diff(bounds)
+            windows = np.flatnonzero(counts)
+            starts = bounds[windows]
+            counts = counts[windows]
+            magnitude = magnitude[:bounds[-1]]
+            
+            # 활동 지표 계산 (모든 윈도우를 reduceat으로 한 번에 집계)
+            mean_magnitude = np.add.reduceat(magnitude, starts) / counts
+            max_magnitude = np.maximum.reduceat(magnitude, starts)
+            centered = magnitude - np.repeat(mean_magnitude, counts)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                # 표본 표준편차 (측정값이 1개인 윈도우는 NaN)
+                std_magnitude = np.sqrt(
+                    np.add.reduceat(centered * centered, starts) / (counts - 1)
+                )
+            
+            # 움직임 변화량 (윈도우 경계를 넘는 차분은 제외)
+            steps = np.zeros_like(magnitude)
+            steps[:-1] = np.abs(np.diff(magnitude))
+            steps[starts + counts - 1] = 0.0
+            total_movement = np.add.reduceat(steps, starts)
+            
+            # 활동 수준 분류
+            level_index = np.digitize(mean_magnitude, ACTIVITY_LEVEL_BOUNDS)
+            
+            activity_levels = []
+            for k, points, mean, std, peak, movement, level in zip(
+                windows.tolist(), counts.tolist(), mean_magnitude.tolist(),
+                std_magnitude.tolist(), max_magnitude.tolist(),
+                total_movement.tolist(), level_index.tolist()
+            ):
+                activity_levels.append({
+                    "start_time": start_time + timedelta(seconds=k * window_seconds),
+                    "end_time": start_time + timedelta(seconds=(k + 1) * window_seconds),
+                    "mean_magnitude": mean,
+                    "std_magnitude": std,
+                    "max_magnitude": peak,
+                    "total_movement": movement,
+                    "activity_level": ACTIVITY_LEVEL_LABELS[level],
+                    "data_points": points
+                })
             
             return activity_levels
             
@@ -208,44 +372,66 @@ class AudioProcessor:
     
     @staticmethod
     async def analyze_sound_events(
-        audio_data: List[AudioReading],
-        amplitude_threshold: float = 0.1
+        audio_data: Optional[List[AudioReading]],
+        amplitude_threshold: float = 0.1,
+        sensor_arrays: Optional[SensorArrays] = None
     ) -> List[Dict[str, Any]]:
-        """소리 이벤트 분석"""
+        """
+        소리 이벤트 분석
+        
+        sensor_arrays가 주어지면 측정값 재변환 없이 해당 배열을 사용합니다
+        (이 경우 측정값 목록은 None일 수 있습니다).
+        """
         try:
-            sound_events = []
+            # 진폭과 주파수 밴드를 열 단위 배열로 준비 (밴드 길이가 일정하지 않으면 None)
+            if sensor_arrays is not None:
+                amplitudes = sensor_arrays.audio_amplitudes
+                bands = sensor_arrays.audio_frequency_bands
+            else:
+                amplitudes = np.fromiter(
+                    (r.amplitude for r in audio_data), dtype=np.float64, count=len(audio_data)
+                )
+                try:
+                    bands = np.array([r.frequency_bands for r in audio_data], dtype=np.float64)
+                except ValueError:
+                    bands = None
             
-            in_sound = False
-            start_idx = 0
-            
-            for i, reading in enumerate(audio_data):
-                if reading.amplitude > amplitude_threshold and not in_sound:
-                    # 소리 시작
-                    in_sound = True
-                    start_idx = i
-                elif reading.amplitude <= amplitude_threshold and in_sound:
-                    # 소리 종료
-                    duration = i - start_idx
-                    if duration >= 3:  # 최소 3초
-                        event_data = audio_data[start_idx:i]
-                        
-                        # 이벤트 특성 계산
-                        max_amplitude = max(r.amplitude for r in event_data)
-                        mean_amplitude = np.mean([r.amplitude for r in event_data])
-                        
-                        # 주파수 대역 분석
-                        freq_analysis = await AudioProcessor._analyze_frequency_bands(event_data)
-                        
-                        sound_events.append({
-                            "start_time": audio_data[start_idx].timestamp,
-                            "end_time": audio_data[i-1].timestamp,
-                            "duration_seconds": duration,
-                            "max_amplitude": float(max_amplitude),
-                            "mean_amplitude": float(mean_amplitude),
-                            "frequency_analysis": freq_analysis
-                        })
-                    
-                    in_sound = False
+            # 소리 구간 찾기 (임계값 초과 구간의 [시작, 끝) 인덱스)
+            edges = np.diff(
+                (amplitudes > amplitude_threshold).astype(np.int8), prepend=0, append=0
+            )
+            starts = np.flatnonzero(edges == 1)
+            ends = np.flatnonzero(edges == -1)
+            
+            # 기록 끝까지 이어지는(종료되지 않은) 구간은 제외, 최소 3초 이상만 사용
+            keep = (ends < len(amplitudes)) & (ends - starts >= 3)
+            
+            sound_events = []
+            for start, end in zip(starts[keep].tolist(), ends[keep].tolist()):
+                if audio_data is not None:
+                    start_time = audio_data[start].timestamp
+                    end_time = audio_data[end - 1].timestamp
+                else:
+                    reference = sensor_arrays.reference_time
+                    start_time = reference + timedelta(seconds=float(sensor_arrays.audio_seconds[start]))
+                    end_time = reference + timedelta(seconds=float(sensor_arrays.audio_seconds[end - 1]))
+                
+                # 이벤트 특성 계산
+                event_amplitudes = amplitudes[start:end]
+                
+                # 주파수 대역 분석
+                freq_analysis = await AudioProcessor._analyze_frequency_bands(
+                    None if bands is None else bands[start:end]
+                )
+                
+                sound_events.append({
+                    "start_time": start_time,
+                    "end_time": end_time,
+                    "duration_seconds": end - start,
+                    "max_amplitude": float(event_amplitudes.max()),
+                    "mean_amplitude": float(event_amplitudes.mean(dtype=np.float64)),
+                    "frequency_analysis": freq_analysis
+                })
             
             return sound_events
             
@@ -255,31 +441,29 @@ class AudioProcessor:
     
     @staticmethod
     async def _analyze_frequency_bands(
-        audio_data: List[AudioReading]
+        bands_array: Optional[np.ndarray]
     ) -> Dict[str, float]:
-        """주파수 대역 분석"""
+        """주파수 대역 분석 (bands_array: (측정값 수, 밴드 수) 배열)"""
         try:
-            # 모든 주파수 밴드 데이터 수집
-            all_bands = []
-            for reading in audio_data:
-                all_bands.append(reading.frequency_bands)
+            if bands_array is None or bands_array.ndim != 2:
+                raise ValueError("주파수 밴드 길이가 일정하지 않습니다")
             
-            bands_array = np.array(all_bands)
+            # 각 밴드별 평균 에너지 (한 번의 축 reduction)
+            band_means = bands_array.mean(axis=0, dtype=np.float64)
             
-            # 각 밴드별 평균 에너지
             band_names = [
                 "매우_낮은_주파수", "낮은_주파수", "중간_낮은_주파수", "중간_주파수",
                 "중간_높은_주파수", "높은_주파수", "매우_높은_주파수", "초고주파수"
             ]
             
-            analysis = {}
-            for i, band_name in enumerate(band_names):
-                if i < bands_array.shape[1]:
-                    analysis[band_name] = float(np.mean(bands_array[:, i]))
+            analysis = {
+                band_name: float(band_mean)
+                for band_name, band_mean in zip(band_names, band_means.tolist())
+            }
             
             # 주파수 특성 분석
-            analysis["주요_주파수_대역"] = band_names[np.argmax(np.mean(bands_array, axis=0))]
-            analysis["주파수_다양성"] = float(entropy(np.mean(bands_array, axis=0)))
+            analysis["주요_주파수_대역"] = band_names[np.argmax(band_means)]
+            analysis["주파수_다양성"] = float(entropy(band_means))
             
             return analysis
             
@@ -297,22 +481,32 @@ class AudioProcessor:
                 return {"snoring_detected": False}
             
             # 진폭 데이터 추출
-            amplitudes = [reading.amplitude for reading in audio_data]
+            n = len(audio_data)
+            amplitudes = np.fromiter(
+                (reading.amplitude for reading in audio_data), dtype=np.float64, count=n
+            )
             
-            # 주기적 패턴 감지 (FFT 사용)
-            fft_result = fft.fft(amplitudes)
-            freqs = fft.fftfreq(len(amplitudes), 1.0)  # 1Hz 샘플링 가정
+            # 주기적 패턴 감지 (실수 입력이므로 rfft로 음이 아닌 주파수만 계산)
+            spectrum = np.abs(fft.rfft(amplitudes))
+            freqs = fft.rfftfreq(n, 1.0)  # 1Hz 샘플링 가정
             
             # 0.1-2Hz 범위에서 피크 찾기 (코골이 주파수 범위)
-            snoring_freq_mask = (freqs >= 0.1) & (freqs <= 2.0)
-            snoring_power = np.abs(fft_result[snoring_freq_mask])
+            # 짝수 길이의 나이퀴스트 성분은 양측 FFT에서 음의 주파수이므로 제외
+            positive = slice(0, (n - 1) // 2 + 1)
+            snoring_freq_mask = (freqs[positive] >= 0.1) & (freqs[positive] <= 2.0)
+            snoring_power = spectrum[positive][snoring_freq_mask]
             
             if len(snoring_power) > 0:
-                peak_freq = freqs[snoring_freq_mask][np.argmax(snoring_power)]
+                peak_freq = freqs[positive][snoring_freq_mask][np.argmax(snoring_power)]
                 peak_power = np.max(snoring_power)
                 
+                # 양측 스펙트럼 전체의 평균 크기 (DC/나이퀴스트 외 성분은 켤레 대칭으로 2번씩 포함)
+                two_sided_total = spectrum[0] + 2 * spectrum[1:(n - 1) // 2 + 1].sum()
+                if n % 2 == 0:
+                    two_sided_total += spectrum[n // 2]
+                
                 # 코골이 감지 기준
-                snoring_detected = peak_power > np.mean(np.abs(fft_result)) * 3
+                snoring_detected = peak_power > two_sided_total / n * 3
                 
                 return {
                     "snoring_detected": bool(snoring_detected),
@@ -329,6 +523,38 @@ class AudioProcessor:
             return {"snoring_detected": False, "error": str(e)}
 
 
+def _pattern_entropy(data: np.ndarray, m: int = 2, r: float = 0.2) -> float:
+    """
+    길이 m, m+1 패턴의 일치 비율로 엔트로피 계산 (phi(m) - phi(m+1))
+    
+    phi(k)는 각 패턴과 체비셰프 거리 r 이내인 패턴 비율(자기 자신 포함)의 로그 평균이며,
+    일치 개수는 KD-트리로 세어 O(N²) 쌍 비교를 피합니다.
+    패턴이 하나도 없는 길이는 NaN, 데이터가 그보다 짧으면 ValueError입니다.
+    """
+    phi = np.zeros(2)
+    for k, length in enumerate((m, m + 1)):
+        count = len(data) - length + 1
+        if count < 0:
+            raise ValueError(f"데이터가 너무 짧습니다: {len(data)}개")
+        if count == 0:
+            phi[k] = np.nan
+            continue
+        
+        patterns = np.lib.stride_tricks.sliding_window_view(data, length)
+        matches = cKDTree(patterns).query_ball_point(
+            patterns, r=r, p=np.inf, return_length=True
+        )
+        phi[k] = np.mean(np.log(matches / count))
+    
+    return phi[0] - phi[1]
+
+
+@lru_cache(maxsize=32)
+def _butter_sos(order: int, normal_cutoff: float, filter_type: str) -> np.ndarray:
+    """버터워스 필터 SOS 계수 (같은 설정의 반복 호출은 재설계 없이 캐시 사용)"""
+    return signal.butter(order, normal_cutoff, btype=filter_type, output='sos')
+
+
 class SignalProcessor:
     """일반적인 신호 처리 유틸리티"""
     
@@ -349,8 +575,8 @@ class SignalProcessor:
                 logger.warning(f"차단 주파수가 나이퀴스트 주파수보다 높습니다: {cutoff_freq}")
                 return data
             
-            b, a = signal.butter(order, normal_cutoff, btype=filter_type)
-            filtered_data = signal.filtfilt(b, a, data, axis=0)
+            sos = _butter_sos(order, normal_cutoff, filter_type)
+            filtered_data = signal.sosfiltfilt(sos, data, axis=0)
             
             return filtered_data
             
@@ -365,12 +591,14 @@ class SignalProcessor:
     ) -> Dict[str, float]:
         """스펙트럼 특성 계산"""
         try:
-            # FFT 계산
-            fft_result = fft.fft(data.flatten())
-            freqs = fft.fftfreq(len(data.flatten()), 1/sampling_rate)
-            
-            # 양의 주파수만 사용
-            positive_freqs_idx = freqs > 0
+            # FFT 계산 (실수 입력이므로 rfft로 음의 주파수 절반은 계산하지 않음)
+            data = data.ravel()
+            n = len(data)
+            fft_result = fft.rfft(data)
+            freqs = fft.rfftfreq(n, 1/sampling_rate)
+            
+            # 양의 주파수만 사용 (DC 및 짝수 길이의 나이퀴스트 성분 제외, 양측 FFT 기준과 동일)
+            positive_freqs_idx = slice(1, (n - 1) // 2 + 1)
             positive_freqs = freqs[positive_freqs_idx]
             power_spectrum = np.abs(fft_result[positive_freqs_idx]) ** 2
             
@@ -395,7 +623,7 @@ class SignalProcessor:
             if len(positive_freqs) > 1:
                 slope, _ = np.polyfit(positive_freqs, 10 * np.log10(power_spectrum + 1e-10), 1)
                 spectral_rolloff = positive_freqs[
-                    np.where(np.cumsum(power_spectrum) >= 0.85 * total_power)[0][0]
+                    np.searchsorted(np.cumsum(power_spectrum), 0.85 * total_power)
                 ]
             else:
                 slope = 0.0
@@ -418,62 +646,14 @@ class SignalProcessor:
     async def calculate_entropy_features(data: np.ndarray) -> Dict[str, float]:
         """엔트로피 기반 특성 계산"""
         try:
-            # 샘플 엔트로피
-            def _sample_entropy(data, m=2, r=0.2):
-                """샘플 엔트로피 계산"""
-                try:
-                    N = len(data)
-                    patterns = np.array([data[i:i+m] for i in range(N-m+1)])
-                    
-                    def _maxdist(xi, xj):
-                        return max([abs(ua - va) for ua, va in zip(xi, xj)])
-                    
-                    phi = np.zeros(2)
-                    for m_i in [m, m+1]:
-                        patterns_m = np.array([data[i:i+m_i] for i in range(N-m_i+1)])
-                        C = np.zeros(N-m_i+1)
-                        
-                        for i in range(N-m_i+1):
-                            template = patterns_m[i]
-                            for j in range(N-m_i+1):
-                                if _maxdist(template, patterns_m[j]) <= r:
-                                    C[i] += 1
-                        
-                        phi[m_i-m] = np.mean(np.log(C / (N-m_i+1)))
-                    
-                    return phi[0] - phi[1]
-                except:
-                    return 0.0
-            
-            sample_ent = _sample_entropy(data.flatten())
-            
-            # 근사 엔트로피
-            def _approximate_entropy(data, m=2, r=0.2):
-                """근사 엔트로피 계산"""
-                try:
-                    N = len(data)
-                    
-                    def _maxdist(xi, xj):
-                        return max([abs(ua - va) for ua, va in zip(xi, xj)])
-                    
-                    phi = np.zeros(2)
-                    for m_i in [m, m+1]:
-                        patterns = np.array([data[i:i+m_i] for i in range(N-m_i+1)])
-                        C = np.zeros(N-m_i+1)
-                        
-                        for i in range(N-m_i+1):
-                            template = patterns[i]
-                            for j in range(N-m_i+1):
-                                if _maxdist(template, patterns[j]) <= r:
-                                    C[i] += 1
-                        
-                        phi[m_i-m] = np.mean(np.log(C / (N-m_i+1)))
-                    
-                    return phi[0] - phi[1]
-                except:
-                    return 0.0
-            
-            approx_ent = _approximate_entropy(data.flatten())
+            data = data.flatten()
+            
+            # 샘플 엔트로피 / 근사 엔트로피
+            # (두 값 모두 자기 일치를 포함한 같은 정의로 계산하므로 한 번만 계산)
+            try:
+                sample_ent = approx_ent = _pattern_entropy(data)
+            except Exception:
+                sample_ent = approx_ent = 0.0
             
             return {
                 "sample_entropy": float(sample_ent),
@@ -1,49 +1,67 @@
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
-import pandas as pd
 from scipy import stats
 import structlog
 
 from app.models.request_models import AccelerometerReading, AudioReading
 from app.models.internal_models import DataQualityReport
 from app.config.settings import settings
+from app.utils.sensor_utils import SensorArrays
 
 logger = structlog.get_logger()
 
 
 async def check_data_quality(
-    accelerometer_data: List[AccelerometerReading],
-    audio_data: List[AudioReading]
+    accelerometer_data: Optional[List[AccelerometerReading]],
+    audio_data: Optional[List[AudioReading]],
+    sensor_arrays: Optional[SensorArrays] = None
 ) -> DataQualityReport:
-    """데이터 품질 평가"""
+    """
+    데이터 품질 평가
+    
+    sensor_arrays가 주어지면 측정값 재변환 없이 해당 배열을 사용합니다
+    (이 경우 측정값 목록은 None일 수 있습니다).
+    """
+    return check_data_quality_sync(accelerometer_data, audio_data, sensor_arrays)
+
+
+def check_data_quality_sync(
+    accelerometer_data: Optional[List[AccelerometerReading]],
+    audio_data: Optional[List[AudioReading]],
+    sensor_arrays: Optional[SensorArrays] = None
+) -> DataQualityReport:
+    """
+    데이터 품질 평가 (동기 버전)
+    
+    I/O 없이 CPU 연산만 수행하므로 asyncio.to_thread로 워커 스레드에서 호출할 수 있습니다.
+    """
     try:
         logger.info("데이터 품질 평가 시작")
         
+        if sensor_arrays is None:
+            sensor_arrays = SensorArrays.from_readings(accelerometer_data, audio_data)
+        
         # 가속도계 데이터 품질 평가
-        accel_quality = await _assess_accelerometer_quality(accelerometer_data)
+        accel_quality = _assess_accelerometer_quality(sensor_arrays)
         
         # 오디오 데이터 품질 평가
-        audio_quality = await _assess_audio_quality(audio_data)
+        audio_quality = _assess_audio_quality(sensor_arrays)
         
         # 전체 품질 점수 계산
         overall_score = (accel_quality["overall_score"] + audio_quality["overall_score"]) / 2
         
         # 누락 데이터 비율 계산
-        missing_data_percentage = await _calculate_missing_data_percentage(
-            accelerometer_data, audio_data
-        )
+        missing_data_percentage = _calculate_missing_data_percentage(sensor_arrays)
         
         # 이상값 비율 계산
-        outlier_percentage = await _calculate_outlier_percentage(
-            accelerometer_data, audio_data
-        )
+        outlier_percentage = _calculate_outlier_percentage(sensor_arrays)
         
         # 노이즈 수준 평가
-        noise_level = await _assess_noise_level(accelerometer_data, audio_data)
+        noise_level = _assess_noise_level(sensor_arrays)
         
         # 권장사항 생성
-        recommendations = await _generate_recommendations(
+        recommendations = _generate_recommendations(
             overall_score, accel_quality, audio_quality, 
             missing_data_percentage, outlier_percentage, noise_level
         )
@@ -75,49 +93,37 @@ async def check_data_quality(
         )
 
 
-async def _assess_accelerometer_quality(
-    accelerometer_data: List[AccelerometerReading]
+def _assess_accelerometer_quality(
+    sensor_arrays: SensorArrays
 ) -> Dict[str, float]:
     """가속도계 데이터 품질 평가"""
     try:
-        if not accelerometer_data:
+        accel_xyz = sensor_arrays.accel_xyz
+        if not len(accel_xyz):
             return {"overall_score": 0.0, "error": "데이터 없음"}
         
-        # DataFrame으로 변환
-        df = pd.DataFrame([
-            {
-                'timestamp': reading.timestamp,
-                'x': reading.x,
-                'y': reading.y,
-                'z': reading.z
-            }
-            for reading in accelerometer_data
-        ])
-        
         quality_scores = {}
         
         # 1. 데이터 완정성 (시간 간격 일관성)
-        time_consistency_score = await _calculate_time_consistency_score(df['timestamp'])
+        time_consistency_score = _calculate_time_consistency_score(
+            sensor_arrays.accel_seconds
+        )
         quality_scores['time_consistency'] = time_consistency_score
         
         # 2. 신호 품질 (적절한 변동성)
-        signal_quality_score = await _calculate_signal_quality_score(
-            df[['x', 'y', 'z']].values
-        )
+        signal_quality_score = _calculate_signal_quality_score(accel_xyz)
         quality_scores['signal_quality'] = signal_quality_score
         
         # 3. 포화 없음 (센서 한계 내 값들)
-        saturation_score = await _calculate_saturation_score(
-            df[['x', 'y', 'z']].values, threshold=18.0
-        )
+        saturation_score = _calculate_saturation_score(accel_xyz, threshold=18.0)
         quality_scores['no_saturation'] = saturation_score
         
         # 4. 노이즈 수준
-        noise_score = await _calculate_noise_score(df[['x', 'y', 'z']].values)
+        noise_score = _calculate_noise_score(accel_xyz)
         quality_scores['low_noise'] = noise_score
         
         # 5. 움직임 감지 (수면 중 예상되는 움직임 패턴)
-        movement_score = await _calculate_movement_score(df[['x', 'y', 'z']].values)
+        movement_score = _calculate_movement_score(accel_xyz)
         quality_scores['movement_pattern'] = movement_score
         
         # 전체 점수 계산 (가중 평균)
@@ -143,41 +149,40 @@ async def _assess_accelerometer_quality(
         return {"overall_score": 0.0, "error": str(e)}
 
 
-async def _assess_audio_quality(
-    audio_data: List[AudioReading]
+def _assess_audio_quality(
+    sensor_arrays: SensorArrays
 ) -> Dict[str, float]:
     """오디오 데이터 품질 평가"""
     try:
-        if not audio_data:
+        amplitudes = sensor_arrays.audio_amplitudes
+        if not len(amplitudes):
             return {"overall_score": 0.0, "error": "데이터 없음"}
         
-        # 기본 데이터 추출
-        amplitudes = [reading.amplitude for reading in audio_data]
-        freq_bands = [reading.frequency_bands for reading in audio_data]
-        timestamps = [reading.timestamp for reading in audio_data]
+        freq_bands = sensor_arrays.audio_frequency_bands
+        timestamps = sensor_arrays.audio_seconds
         
         quality_scores = {}
         
         # 1. 시간 일관성
-        time_consistency_score = await _calculate_time_consistency_score(timestamps)
+        time_consistency_score = _calculate_time_consistency_score(timestamps)
         quality_scores['time_consistency'] = time_consistency_score
         
         # 2. 신호 레벨 (적절한 음성 입력 레벨)
-        signal_level_score = await _calculate_audio_signal_level_score(amplitudes)
+        signal_level_score = _calculate_audio_signal_level_score(amplitudes)
         quality_scores['signal_level'] = signal_level_score
         
         # 3. 주파수 대역 품질
-        freq_quality_score = await _calculate_frequency_quality_score(freq_bands)
+        freq_quality_score = _calculate_frequency_quality_score(freq_bands)
         quality_scores['frequency_quality'] = freq_quality_score
         
         # 4. 포화 없음
-        saturation_score = await _calculate_saturation_score(
-            np.array(amplitudes).reshape(-1, 1), threshold=0.95
+        saturation_score = _calculate_saturation_score(
+            amplitudes.reshape(-1, 1), threshold=0.95
         )
         quality_scores['no_saturation'] = saturation_score
         
         # 5. 노이즈 수준
-        noise_score = await _calculate_audio_noise_score(amplitudes)
+        noise_score = _calculate_audio_noise_score(amplitudes)
         quality_scores['low_noise'] = noise_score
         
         # 전체 점수 계산
@@ -203,20 +208,14 @@ async def _assess_audio_quality(
         return {"overall_score": 0.0, "error": str(e)}
 
 
-async def _calculate_time_consistency_score(timestamps: List[datetime]) -> float:
-    """시간 일관성 점수 계산"""
+def _calculate_time_consistency_score(timestamps: np.ndarray) -> float:
+    """시간 일관성 점수 계산 (timestamps: 기준 시각으로부터의 경과 초)"""
     try:
         if len(timestamps) < 2:
             return 0.0
         
         # 시간 간격 계산
-        intervals = [
-            (timestamps[i] - timestamps[i-1]).total_seconds()
-            for i in range(1, len(timestamps))
-        ]
-        
-        if not intervals:
-            return 0.0
+        intervals = np.diff(timestamps)
         
         expected_interval = 1.0 / settings.sensor_sampling_rate
         
@@ -236,14 +235,14 @@ async def _calculate_time_consistency_score(timestamps: List[datetime]) -> float
         return 0.0
 
 
-async def _calculate_signal_quality_score(data: np.ndarray) -> float:
+def _calculate_signal_quality_score(data: np.ndarray) -> float:
     """신호 품질 점수 계산"""
     try:
         if data.size == 0:
             return 0.0
         
         # 신호의 동적 범위 계산
-        signal_range = np.max(data) - np.min(data)
+        signal_range = float(np.max(data)) - float(np.min(data))
         
         # 적절한 범위 (0.1g ~ 10g)
         ideal_min, ideal_max = 0.1, 10.0
@@ -261,7 +260,7 @@ async def _calculate_signal_quality_score(data: np.ndarray) -> float:
         return 0.0
 
 
-async def _calculate_saturation_score(data: np.ndarray, threshold: float) -> float:
+def _calculate_saturation_score(data: np.ndarray, threshold: float) -> float:
     """포화 점수 계산"""
     try:
         if data.size == 0:
@@ -278,7 +277,7 @@ async def _calculate_saturation_score(data: np.ndarray, threshold: float) -> flo
         return 0.0
 
 
-async def _calculate_noise_score(data: np.ndarray) -> float:
+def _calculate_noise_score(data: np.ndarray) -> float:
     """노이즈 점수 계산"""
     try:
         if data.size == 0:
@@ -287,7 +286,7 @@ async def _calculate_noise_score(data: np.ndarray) -> float:
         # 고주파 노이즈 추정 (연속 차분의 표준편차)
         if len(data) > 1:
             diff = np.diff(data.flatten())
-            noise_level = np.std(diff)
+            noise_level = np.std(diff, dtype=np.float64)
             
             # 적절한 노이즈 수준 (0.1g 이하)
             max_acceptable_noise = 0.1
@@ -303,7 +302,7 @@ async def _calculate_noise_score(data: np.ndarray) -> float:
         return 0.0
 
 
-async def _calculate_movement_score(data: np.ndarray) -> float:
+def _calculate_movement_score(data: np.ndarray) -> float:
     """움직임 패턴 점수 계산"""
     try:
         if data.size == 0:
@@ -311,7 +310,7 @@ async def _calculate_movement_score(data: np.ndarray) -> float:
         
         # 움직임의 변동성 계산
         magnitude = np.sqrt(np.sum(data**2, axis=1))
-        movement_variance = np.var(magnitude)
+        movement_variance = np.var(magnitude, dtype=np.float64)
         
         # 수면 중 예상되는 움직임 범위 (0.01 ~ 1.0)
         ideal_min, ideal_max = 0.01, 1.0
@@ -329,14 +328,14 @@ async def _calculate_movement_score(data: np.ndarray) -> float:
         return 0.0
 
 
-async def _calculate_audio_signal_level_score(amplitudes: List[float]) -> float:
+def _calculate_audio_signal_level_score(amplitudes: np.ndarray) -> float:
     """오디오 신호 레벨 점수 계산"""
     try:
-        if not amplitudes:
+        if not len(amplitudes):
             return 0.0
         
-        mean_amplitude = np.mean(amplitudes)
-        max_amplitude = np.max(amplitudes)
+        mean_amplitude = np.mean(amplitudes, dtype=np.float64)
+        max_amplitude = float(np.max(amplitudes))
         
         # 적절한 신호 레벨 (0.01 ~ 0.8)
         if 0.01 <= mean_amplitude <= 0.8 and max_amplitude < 0.95:
@@ -352,26 +351,25 @@ async def _calculate_audio_signal_level_score(amplitudes: List[float]) -> float:
         return 0.0
 
 
-async def _calculate_frequency_quality_score(freq_bands: List[List[float]]) -> float:
-    """주파수 대역 품질 점수 계산"""
+def _calculate_frequency_quality_score(freq_bands: Optional[np.ndarray]) -> float:
+    """주파수 대역 품질 점수 계산 (freq_bands: (M, B) 배열, 길이가 일정하지 않으면 None)"""
     try:
-        if not freq_bands:
+        if freq_bands is None or not len(freq_bands):
             return 0.0
         
-        freq_array = np.array(freq_bands)
+        freq_array = freq_bands
         
         # 각 밴드의 변동성 확인
-        band_variances = np.var(freq_array, axis=0)
+        band_variances = np.var(freq_array, axis=0, dtype=np.float64)
         
         # 적절한 변동성 (너무 일정하지도 않고 너무 변동적이지도 않음)
         ideal_variance = 0.1
         
-        scores = []
-        for variance in band_variances:
-            if variance <= ideal_variance:
-                scores.append(1.0)
-            else:
-                scores.append(max(0.0, 1.0 - (variance - ideal_variance) / ideal_variance))
+        scores = np.where(
+            band_variances <= ideal_variance,
+            1.0,
+            np.maximum(0.0, 1.0 - (band_variances - ideal_variance) / ideal_variance)
+        )
         
         return np.mean(scores)
         
@@ -379,7 +377,7 @@ async def _calculate_frequency_quality_score(freq_bands: List[List[float]]) -> f
         return 0.0
 
 
-async def _calculate_audio_noise_score(amplitudes: List[float]) -> float:
+def _calculate_audio_noise_score(amplitudes: np.ndarray) -> float:
     """오디오 노이즈 점수 계산"""
     try:
         if len(amplitudes) < 2:
@@ -387,7 +385,7 @@ async def _calculate_audio_noise_score(amplitudes: List[float]) -> float:
         
         # 급격한 변화 감지
         diffs = np.abs(np.diff(amplitudes))
-        mean_diff = np.mean(diffs)
+        mean_diff = np.mean(diffs, dtype=np.float64)
         
         # 적절한 변화 수준 (0.05 이하)
         max_acceptable_diff = 0.05
@@ -401,22 +399,18 @@ async def _calculate_audio_noise_score(amplitudes: List[float]) -> float:
         return 0.0
 
 
-async def _calculate_missing_data_percentage(
-    accelerometer_data: List[AccelerometerReading],
-    audio_data: List[AudioReading]
-) -> float:
+def _calculate_missing_data_percentage(sensor_arrays: SensorArrays) -> float:
     """누락 데이터 비율 계산"""
     try:
-        if not accelerometer_data or not audio_data:
+        accel_seconds = sensor_arrays.accel_seconds
+        if not len(accel_seconds) or not len(sensor_arrays.audio_seconds):
             return 100.0
         
         # 예상 데이터 포인트 수 계산
-        accel_start = min(r.timestamp for r in accelerometer_data)
-        accel_end = max(r.timestamp for r in accelerometer_data)
-        duration = (accel_end - accel_start).total_seconds()
+        duration = float(accel_seconds.max() - accel_seconds.min())
         
         expected_count = int(duration * settings.sensor_sampling_rate)
-        actual_count = len(accelerometer_data)
+        actual_count = len(accel_seconds)
         
         missing_percentage = max(0.0, (expected_count - actual_count) / expected_count * 100)
         
@@ -426,46 +420,39 @@ async def _calculate_missing_data_percentage(
         return 0.0
 
 
-async def _calculate_outlier_percentage(
-    accelerometer_data: List[AccelerometerReading],
-    audio_data: List[AudioReading]
-) -> float:
+def _calculate_outlier_percentage(sensor_arrays: SensorArrays) -> float:
     """이상값 비율 계산"""
     try:
         outlier_count = 0
         total_count = 0
         
         # 가속도계 이상값 검출
-        accel_values = []
-        for reading in accelerometer_data:
-            accel_values.extend([reading.x, reading.y, reading.z])
+        accel_values = sensor_arrays.accel_xyz.ravel()
         
-        if accel_values:
+        if accel_values.size:
             # IQR 방법으로 이상값 검출
             q1, q3 = np.percentile(accel_values, [25, 75])
             iqr = q3 - q1
             lower_bound = q1 - 1.5 * iqr
             upper_bound = q3 + 1.5 * iqr
             
-            outlier_count += sum(
-                1 for v in accel_values 
-                if v < lower_bound or v > upper_bound
-            )
+            outlier_count += int(np.count_nonzero(
+                (accel_values < lower_bound) | (accel_values > upper_bound)
+            ))
             total_count += len(accel_values)
         
         # 오디오 이상값 검출
-        audio_amplitudes = [reading.amplitude for reading in audio_data]
+        audio_amplitudes = sensor_arrays.audio_amplitudes
         
-        if audio_amplitudes:
+        if audio_amplitudes.size:
             q1, q3 = np.percentile(audio_amplitudes, [25, 75])
             iqr = q3 - q1
             lower_bound = q1 - 1.5 * iqr
             upper_bound = q3 + 1.5 * iqr
             
-            outlier_count += sum(
-                1 for v in audio_amplitudes 
-                if v < lower_bound or v > upper_bound
-            )
+            outlier_count += int(np.count_nonzero(
+                (audio_amplitudes < lower_bound) | (audio_amplitudes > upper_bound)
+            ))
             total_count += len(audio_amplitudes)
         
         if total_count == 0:
@@ -477,38 +464,29 @@ async def _calculate_outlier_percentage(
         return 0.0
 
 
-async def _assess_noise_level(
-    accelerometer_data: List[AccelerometerReading],
-    audio_data: List[AudioReading]
-) -> float:
+def _assess_noise_level(sensor_arrays: SensorArrays) -> float:
     """전체 노이즈 수준 평가"""
     try:
         noise_scores = []
         
         # 가속도계 노이즈
-        if len(accelerometer_data) > 1:
-            accel_changes = []
-            for i in range(1, len(accelerometer_data)):
-                prev = accelerometer_data[i-1]
-                curr = accelerometer_data[i]
-                change = abs(curr.x - prev.x) + abs(curr.y - prev.y) + abs(curr.z - prev.z)
-                accel_changes.append(change)
+        accel_xyz = sensor_arrays.accel_xyz
+        if len(accel_xyz) > 1:
+            accel_changes = np.abs(np.diff(accel_xyz, axis=0)).sum(axis=1)
             
-            if accel_changes:
-                avg_change = np.mean(accel_changes)
+            if accel_changes.size:
+                avg_change = float(np.mean(accel_changes, dtype=np.float64))
                 # 0.5g 이하 변화를 정상으로 간주
                 accel_noise_score = min(1.0, avg_change / 0.5)
                 noise_scores.append(accel_noise_score)
         
         # 오디오 노이즈
-        if len(audio_data) > 1:
-            amplitude_changes = [
-                abs(audio_data[i].amplitude - audio_data[i-1].amplitude)
-                for i in range(1, len(audio_data))
-            ]
+        audio_amplitudes = sensor_arrays.audio_amplitudes
+        if len(audio_amplitudes) > 1:
+            amplitude_changes = np.abs(np.diff(audio_amplitudes))
             
-            if amplitude_changes:
-                avg_change = np.mean(amplitude_changes)
+            if amplitude_changes.size:
+                avg_change = float(np.mean(amplitude_changes, dtype=np.float64))
                 # 0.1 이하 변화를 정상으로 간주
                 audio_noise_score = min(1.0, avg_change / 0.1)
                 noise_scores.append(audio_noise_score)
@@ -519,7 +497,7 @@ async def _assess_noise_level(
         return 0.5
 
 
-async def _generate_recommendations(
+def _generate_recommendations(
     overall_score: float,
     accel_quality: Dict[str, float],
     audio_quality: Dict[str, float],
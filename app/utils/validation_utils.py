@@ -1,31 +1,58 @@
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import numpy as np
 import structlog
 
 from app.models.request_models import AccelerometerReading, AudioReading
 from app.models.internal_models import SensorDataValidation
 from app.config.settings import settings
+from app.utils.sensor_utils import SensorArrays, chronological_order
 
 logger = structlog.get_logger()
 
 
 async def validate_sensor_data(
-    accelerometer_data: List[AccelerometerReading],
-    audio_data: List[AudioReading]
+    accelerometer_data: Optional[List[AccelerometerReading]],
+    audio_data: Optional[List[AudioReading]],
+    sensor_arrays: Optional[SensorArrays] = None
 ) -> SensorDataValidation:
-    """센서 데이터 유효성 검사"""
+    """
+    센서 데이터 유효성 검사
+    
+    sensor_arrays가 주어지면 측정값 재변환 없이 해당 배열을 사용합니다
+    (이 경우 측정값 목록은 None일 수 있습니다).
+    """
+    return validate_sensor_data_sync(accelerometer_data, audio_data, sensor_arrays)
+
+
+def validate_sensor_data_sync(
+    accelerometer_data: Optional[List[AccelerometerReading]],
+    audio_data: Optional[List[AudioReading]],
+    sensor_arrays: Optional[SensorArrays] = None
+) -> SensorDataValidation:
+    """
+    센서 데이터 유효성 검사 (동기 버전)
+    
+    I/O 없이 CPU 연산만 수행하므로 asyncio.to_thread로 워커 스레드에서 호출할 수 있습니다.
+    """
     try:
         validation_errors = []
         recommended_actions = []
         
+        if sensor_arrays is None:
+            sensor_arrays = SensorArrays.from_readings(accelerometer_data, audio_data)
+        
         # 기본 데이터 존재 확인
-        if not accelerometer_data:
+        has_accel = len(sensor_arrays.accel_seconds) > 0
+        has_audio = len(sensor_arrays.audio_seconds) > 0
+        
+        if not has_accel:
             validation_errors.append("가속도계 데이터가 없습니다")
         
-        if not audio_data:
+        if not has_audio:
             validation_errors.append("오디오 데이터가 없습니다")
         
-        if not accelerometer_data or not audio_data:
+        if not has_accel or not has_audio:
             return SensorDataValidation(
                 is_valid=False,
                 validation_errors=validation_errors,
@@ -37,19 +64,13 @@ async def validate_sensor_data(
             )
         
         # 시간 관련 검증
-        time_validation = await _validate_time_consistency(
-            accelerometer_data, audio_data
-        )
+        time_validation = _validate_time_consistency(sensor_arrays)
         
         # 센서 값 범위 검증
-        sensor_validation = await _validate_sensor_ranges(
-            accelerometer_data, audio_data
-        )
+        sensor_validation = _validate_sensor_ranges(sensor_arrays)
         
         # 데이터 품질 검증
-        quality_validation = await _validate_data_quality(
-            accelerometer_data, audio_data
-        )
+        quality_validation = _validate_data_quality(sensor_arrays)
         
         # 결과 통합
         all_errors = validation_errors + time_validation["errors"] + \
@@ -84,10 +105,7 @@ async def validate_sensor_data(
         )
 
 
-async def _validate_time_consistency(
-    accelerometer_data: List[AccelerometerReading],
-    audio_data: List[AudioReading]
-) -> Dict[str, Any]:
+def _validate_time_consistency(sensor_arrays: SensorArrays) -> Dict[str, Any]:
     """시간 일관성 검증"""
     errors = []
     actions = []
@@ -96,38 +114,35 @@ async def _validate_time_consistency(
     
     try:
         # 가속도계 데이터 시간 검증
-        accel_times = [reading.timestamp for reading in accelerometer_data]
-        accel_times.sort()
+        accel_times = sensor_arrays.accel_seconds[chronological_order(sensor_arrays.accel_seconds)]
         
         # 시간 간격 확인 (30초 간격이 정상)
         expected_interval = settings.stage_interval_seconds  # 30초
         tolerance = expected_interval * 0.2  # 20% 허용 오차 (6초)
         
-        for i in range(1, len(accel_times)):
-            interval = (accel_times[i] - accel_times[i-1]).total_seconds()
-            
-            # 30초 간격은 정상이므로 더 큰 간격만 체크
-            if interval > 120:  # 2분 이상인 경우만 오류
-                has_gaps = True
-                errors.append(f"가속도계 데이터에 큰 시간 간격이 있습니다: {interval:.1f}초")
-            
-            elif abs(interval - expected_interval) > expected_interval:  # 100% 허용 오차
-                irregular_sampling = True
+        accel_intervals = np.diff(accel_times)
+        
+        # 30초 간격은 정상이므로 더 큰 간격만 체크 (2분 이상인 경우만 오류)
+        accel_gaps = accel_intervals > 120
+        for interval in accel_intervals[accel_gaps].tolist():
+            errors.append(f"가속도계 데이터에 큰 시간 간격이 있습니다: {interval:.1f}초")
+        
+        # 100% 허용 오차를 벗어나는 간격은 불규칙 샘플링으로 판단
+        if np.any(~accel_gaps & (np.abs(accel_intervals - expected_interval) > expected_interval)):
+            irregular_sampling = True
         
         # 오디오 데이터 시간 검증
-        audio_times = [reading.timestamp for reading in audio_data]
-        audio_times.sort()
+        audio_times = sensor_arrays.audio_seconds[chronological_order(sensor_arrays.audio_seconds)]
+        audio_intervals = np.diff(audio_times)
         
-        for i in range(1, len(audio_times)):
-            interval = (audio_times[i] - audio_times[i-1]).total_seconds()
-            
-            # 30초 간격은 정상이므로 더 큰 간격만 체크
-            if interval > 120:  # 2분 이상인 경우만 오류
-                has_gaps = True
-                errors.append(f"오디오 데이터에 큰 시간 간격이 있습니다: {interval:.1f}초")
+        audio_gaps = audio_intervals > 120
+        for interval in audio_intervals[audio_gaps].tolist():
+            errors.append(f"오디오 데이터에 큰 시간 간격이 있습니다: {interval:.1f}초")
+        
+        has_gaps = bool(accel_gaps.any() or audio_gaps.any())
         
         # 전체 기록 시간 확인
-        total_duration = (accel_times[-1] - accel_times[0]).total_seconds()
+        total_duration = float(accel_times[-1] - accel_times[0])
         
         if total_duration < settings.min_recording_duration:
             errors.append(f"기록 시간이 너무 짧습니다: {total_duration/3600:.1f}시간")
@@ -141,7 +156,7 @@ async def _validate_time_consistency(
         accel_start, accel_end = accel_times[0], accel_times[-1]
         audio_start, audio_end = audio_times[0], audio_times[-1]
         
-        if abs((accel_start - audio_start).total_seconds()) > 60:
+        if abs(accel_start - audio_start) > 60:
             errors.append("가속도계와 오디오 데이터의 시작 시간이 다릅니다")
             actions.append("센서 동기화를 확인하세요")
         
@@ -162,10 +177,7 @@ async def _validate_time_consistency(
     }
 
 
-async def _validate_sensor_ranges(
-    accelerometer_data: List[AccelerometerReading],
-    audio_data: List[AudioReading]
-) -> Dict[str, Any]:
+def _validate_sensor_ranges(sensor_arrays: SensorArrays) -> Dict[str, Any]:
     """센서 값 범위 검증"""
     errors = []
     actions = []
@@ -173,19 +185,16 @@ async def _validate_sensor_ranges(
     
     try:
         # 가속도계 데이터 범위 확인
-        accel_values = []
-        for reading in accelerometer_data:
-            accel_values.extend([reading.x, reading.y, reading.z])
-        
-        if accel_values:
-            max_accel = max(abs(v) for v in accel_values)
-            min_accel = min(accel_values)
-            max_accel_pos = max(accel_values)
+        accel_values = sensor_arrays.accel_xyz
+        
+        if accel_values.size:
+            abs_accel = np.abs(accel_values)
+            max_accel = float(abs_accel.max())
             
             # 센서 포화 확인 (±20g 한계에 가까운 값들이 많은 경우)
             saturation_threshold = 18.0  # ±20g 중 90%
-            saturated_count = sum(1 for v in accel_values if abs(v) > saturation_threshold)
-            saturation_ratio = saturated_count / len(accel_values)
+            saturated_count = int(np.count_nonzero(abs_accel > saturation_threshold))
+            saturation_ratio = saturated_count / accel_values.size
             
             if saturation_ratio > 0.05:  # 5% 이상이 포화 근처
                 saturation = True
@@ -198,11 +207,10 @@ async def _validate_sensor_ranges(
                 actions.append("센서 교정을 확인하세요")
         
         # 오디오 데이터 범위 확인
-        audio_amplitudes = [reading.amplitude for reading in audio_data]
+        audio_amplitudes = sensor_arrays.audio_amplitudes
         
-        if audio_amplitudes:
-            max_amplitude = max(audio_amplitudes)
-            min_amplitude = min(audio_amplitudes)
+        if audio_amplitudes.size:
+            max_amplitude = float(audio_amplitudes.max())
             
             # 오디오 포화 확인
             if max_amplitude >= 0.99:
@@ -215,11 +223,15 @@ async def _validate_sensor_ranges(
                 errors.append("오디오 신호가 너무 약합니다")
                 actions.append("마이크 연결과 볼륨을 확인하세요")
         
-        # 주파수 밴드 확인
-        for i, reading in enumerate(audio_data[:10]):  # 샘플만 확인
-            if any(band < 0 or band > 1 for band in reading.frequency_bands):
-                errors.append(f"오디오 주파수 밴드 값이 범위를 벗어남: 인덱스 {i}")
-                break
+        # 주파수 밴드 확인 (샘플만 확인)
+        bands = sensor_arrays.audio_frequency_bands
+        if bands is not None and bands.ndim == 2:
+            sample_bands = bands[:10]
+            out_of_range = np.flatnonzero(
+                ((sample_bands < 0) | (sample_bands > 1)).any(axis=1)
+            )
+            if out_of_range.size:
+                errors.append(f"오디오 주파수 밴드 값이 범위를 벗어남: 인덱스 {out_of_range[0]}")
     
     except Exception as e:
         errors.append(f"센서 범위 검증 중 오류: {str(e)}")
@@ -231,10 +243,7 @@ async def _validate_sensor_ranges(
     }
 
 
-async def _validate_data_quality(
-    accelerometer_data: List[AccelerometerReading],
-    audio_data: List[AudioReading]
-) -> Dict[str, Any]:
+def _validate_data_quality(sensor_arrays: SensorArrays) -> Dict[str, Any]:
     """데이터 품질 검증"""
     errors = []
     actions = []
@@ -242,18 +251,13 @@ async def _validate_data_quality(
     
     try:
         # 가속도계 노이즈 확인
-        if len(accelerometer_data) > 10:
-            # 연속된 값들의 변화량 확인
-            accel_changes = []
-            for i in range(1, min(100, len(accelerometer_data))):
-                prev = accelerometer_data[i-1]
-                curr = accelerometer_data[i]
-                
-                change = abs(curr.x - prev.x) + abs(curr.y - prev.y) + abs(curr.z - prev.z)
-                accel_changes.append(change)
+        accel_xyz = sensor_arrays.accel_xyz
+        if len(accel_xyz) > 10:
+            # 연속된 값들의 변화량 확인 (앞부분 100개 샘플)
+            accel_changes = np.abs(np.diff(accel_xyz[:100], axis=0)).sum(axis=1)
             
-            if accel_changes:
-                avg_change = sum(accel_changes) / len(accel_changes)
+            if accel_changes.size:
+                avg_change = float(accel_changes.mean(dtype=np.float64))
                 
                 # 평균 변화량이 너무 큰 경우 (과도한 노이즈)
                 if avg_change > 5.0:
@@ -262,14 +266,12 @@ async def _validate_data_quality(
                     actions.append("센서를 안정적인 곳에 배치하세요")
         
         # 오디오 노이즈 확인
-        if len(audio_data) > 10:
-            amplitude_changes = []
-            for i in range(1, min(100, len(audio_data))):
-                change = abs(audio_data[i].amplitude - audio_data[i-1].amplitude)
-                amplitude_changes.append(change)
+        audio_amplitudes = sensor_arrays.audio_amplitudes
+        if len(audio_amplitudes) > 10:
+            amplitude_changes = np.abs(np.diff(audio_amplitudes[:100]))
             
-            if amplitude_changes:
-                avg_change = sum(amplitude_changes) / len(amplitude_changes)
+            if amplitude_changes.size:
+                avg_change = float(amplitude_changes.mean(dtype=np.float64))
                 
                 # 평균 변화량이 너무 큰 경우
                 if avg_change > 0.3:
@@ -278,7 +280,7 @@ async def _validate_data_quality(
                     actions.append("조용한 환경에서 녹음하세요")
         
         # 데이터 일관성 확인
-        if len(accelerometer_data) != len(audio_data):
+        if len(accel_xyz) != len(audio_amplitudes):
             errors.append("가속도계와 오디오 데이터 길이가 다릅니다")
             actions.append("센서 동기화를 확인하세요")
         
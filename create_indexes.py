@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+데이터베이스 인덱스 마이그레이션 스크립트
+조회 쿼리 조건에 맞춘 인덱스 생성
+"""
+
+from sqlalchemy import create_engine, Index
+from app.config.settings import settings
+from app.models.database_models import LLMFeedback, SleepAnalysis, SystemHealth, User
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 생성할 인덱스 목록 (PostgreSQL에서는 CONCURRENTLY로 생성하여 테이블 잠금 방지)
+INDEXES = [
+    # 피드백 기록 조회: user_id 필터 + created_at 내림차순 정렬
+    Index(
+        "ix_llmfeedback_user_created",
+        LLMFeedback.user_id,
+        LLMFeedback.created_at.desc(),
+        postgresql_concurrently=True
+    ),
+    # 피드백 상세 조회
+    Index(
+        "ix_llmfeedback_feedback_id",
+        LLMFeedback.feedback_id,
+        unique=True,
+        postgresql_concurrently=True
+    ),
+    # 수면 분석 이력 keyset 페이지네이션: user_id 필터 + (analysis_timestamp, analysis_id) 내림차순
+    # 이력 목록의 스칼라 컬럼을 INCLUDE하여 summary_statistics 외에는 힙 접근 없이 조회
+    Index(
+        "ix_sleepanalysis_user_ts_covering",
+        SleepAnalysis.user_id,
+        SleepAnalysis.analysis_timestamp.desc(),
+        SleepAnalysis.analysis_id.desc(),
+        postgresql_include=[
+            "recording_start",
+            "recording_end",
+            "status",
+            "data_quality_score",
+            "model_version"
+        ],
+        postgresql_concurrently=True
+    ),
+    # 분석 ID 기반 조회 (피드백-분석 조인 포함)
+    Index(
+        "ix_sleepanalysis_analysis_id",
+        SleepAnalysis.analysis_id,
+        unique=True,
+        postgresql_concurrently=True
+    ),
+    # 최근 시스템 메트릭스 조회
+    Index(
+        "ix_systemhealth_timestamp",
+        SystemHealth.timestamp.desc(),
+        postgresql_concurrently=True
+    ),
+    # 활성 사용자 수 집계 (부분 인덱스로 index-only scan 가능)
+    Index(
+        "ix_users_active",
+        User.id,
+        postgresql_where=(User.is_active == True),
+        postgresql_concurrently=True
+    ),
+]
+
+# 위 인덱스로 대체되어 쓰기 비용만 늘리는 인덱스 목록
+OBSOLETE_INDEXES = [
+    # INCLUDE 없는 이전 이력 조회 인덱스
+    Index(
+        "ix_sleepanalysis_user_ts_id",
+        SleepAnalysis.user_id,
+        postgresql_concurrently=True
+    ),
+    # user_id 단일 컬럼 인덱스 (복합 인덱스의 선두 컬럼으로 대체)
+    Index(
+        f"ix_{SleepAnalysis.__tablename__}_user_id",
+        SleepAnalysis.user_id,
+        postgresql_concurrently=True
+    ),
+]
+
+
+def create_indexes():
+    """인덱스 생성"""
+    try:
+        # CREATE INDEX CONCURRENTLY는 트랜잭션 밖에서 실행되어야 함
+        engine = create_engine(settings.database_url, isolation_level="AUTOCOMMIT")
+
+        with engine.connect() as conn:
+            for index in INDEXES:
+                logger.info(f"인덱스 생성 중: {index.name}")
+                index.create(bind=conn, checkfirst=True)
+
+            # 대체된 인덱스는 새 인덱스 생성 후 제거
+            for index in OBSOLETE_INDEXES:
+                logger.info(f"불필요한 인덱스 제거 중: {index.name}")
+                index.drop(bind=conn, checkfirst=True)
+
+        logger.info("✅ 인덱스 생성 완료!")
+
+    except Exception as e:
+        logger.error(f"❌ 인덱스 마이그레이션 실패: {str(e)}")
+        raise
+
+
+if __name__ == "__main__":
+    create_indexes()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+XGBoost 모델 변환 스크립트
+joblib 모델을 UBJSON으로 변환하고, 학습 데이터가 주어지면
+max_bin=64 히스토그램 설정으로 재학습한 모델을 저장
+"""
+
+import argparse
+import json
+import logging
+import os
+
+import joblib
+import pandas as pd
+import xgboost as xgb
+
+from app.config.settings import settings
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = "final_xgb_gpu_single"
+
+# 재학습 시 적용할 히스토그램 설정 (분할 후보를 64개 구간으로 제한)
+QUANTIZED_PARAMS = {"tree_method": "hist", "max_bin": 64, "device": "cpu"}
+
+
+def convert_to_ubjson():
+    """joblib 모델을 UBJSON 형식으로 변환"""
+    model_path = os.path.join(settings.model_path, f"{MODEL_NAME}.joblib")
+    ubj_path = os.path.join(settings.model_path, f"{MODEL_NAME}.ubj")
+
+    model = joblib.load(model_path)
+    model.get_booster().save_model(ubj_path)
+
+    logger.info(f"✅ UBJSON 모델 저장 완료: {ubj_path}")
+
+
+def refit_quantized(train_csv: str, label_column: str):
+    """학습 데이터로 max_bin=64 히스토그램 모델 재학습"""
+    model_path = os.path.join(settings.model_path, f"{MODEL_NAME}.joblib")
+    feature_meta_path = os.path.join(settings.model_path, "feature_meta_single.json")
+    quantized_path = os.path.join(settings.model_path, f"{MODEL_NAME}_int8.ubj")
+
+    with open(feature_meta_path, 'r', encoding='utf-8') as f:
+        feature_meta = json.load(f)
+
+    df = pd.read_csv(train_csv)
+    features = df[feature_meta["feat_cols"]]
+    labels = df[label_column]
+    if labels.dtype == object:
+        labels = labels.map(feature_meta["label_map"])
+
+    # 기존 모델의 하이퍼파라미터를 유지하고 히스토그램 설정만 변경
+    params = joblib.load(model_path).get_params()
+    params.update(QUANTIZED_PARAMS)
+
+    logger.info(f"재학습 중: {len(df)}개 샘플, 파라미터 {QUANTIZED_PARAMS}")
+    model = xgb.XGBClassifier(**params)
+    model.fit(features, labels)
+    model.get_booster().save_model(quantized_path)
+
+    logger.info(f"✅ 재학습 모델 저장 완료: {quantized_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="XGBoost 모델 UBJSON 변환 및 재학습")
+    parser.add_argument("--train-csv", help="재학습에 사용할 학습 데이터 CSV 경로")
+    parser.add_argument("--label-column", default="label", help="수면 단계 라벨 컬럼명")
+    args = parser.parse_args()
+
+    try:
+        convert_to_ubjson()
+        if args.train_csv:
+            refit_quantized(args.train_csv, args.label_column)
+    except Exception as e:
+        logger.error(f"❌ 모델 변환 실패: {str(e)}")
+        raise